@@ -0,0 +1,98 @@
+# async_http.py
+import asyncio
+import json
+import os
+from urllib.parse import urlsplit
+import aiohttp
+
+# One connection pool for the whole run; each host also gets its own concurrency cap so a
+# burst of uploads cannot starve the feeds (or trip Webflow's rate limiter)
+HTTP_MAX_CONNECTIONS = int(os.environ.get('HTTP_MAX_CONNECTIONS', '200'))
+HTTP_HOST_CONCURRENCY = int(os.environ.get('HTTP_HOST_CONCURRENCY', '16'))
+HOST_CONCURRENCY = {
+    'api.webflow.com': int(os.environ.get('WEBFLOW_CONCURRENCY', '4')),
+}
+
+class HttpError(Exception):
+    """Raised by get_json() for a non-2xx response"""
+
+    def __init__(self, status_code, url, text=''):
+        super().__init__(f"{status_code} error for {url}: {text[:200]}")
+        self.status_code = status_code
+
+class HttpResponse:
+    """Fully read response with the parts of the requests API the pipeline uses"""
+    __slots__ = ('status_code', 'content', 'headers')
+
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+def _client_timeout(timeout):
+    # Same convention as requests: a number is the total, a tuple is (connect, read)
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=timeout)
+
+class AsyncHttpClient:
+    """Shared aiohttp session with per-host semaphores. Use as an async context manager."""
+
+    def __init__(self, max_connections=HTTP_MAX_CONNECTIONS, host_concurrency=HTTP_HOST_CONCURRENCY):
+        self.max_connections = max_connections
+        self.host_concurrency = host_concurrency
+        self.session = None
+        self._host_slots = {}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+        self.session = None
+
+    def _host_slot(self, url):
+        host = urlsplit(url).hostname or ''
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(HOST_CONCURRENCY.get(host, self.host_concurrency))
+        return self._host_slots[host]
+
+    async def request(self, method, url, timeout=30, **kwargs):
+        """Send a request and read the whole body; kwargs go to aiohttp (json, data, headers...)"""
+        async with self._host_slot(url):
+            async with self.session.request(method, url, timeout=_client_timeout(timeout), **kwargs) as response:
+                content = await response.read()
+                return HttpResponse(response.status, content, response.headers)
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def get_json(self, url, **kwargs):
+        response = await self.get(url, **kwargs)
+        if not 200 <= response.status_code < 300:
+            raise HttpError(response.status_code, url, response.text)
+        return response.json()
+
+def run_sync(coroutine_function, *args, **kwargs):
+    """Call coroutine_function(http, *args, **kwargs) from synchronous code.
+
+    Opens a short-lived client on a fresh event loop, so it must not be called from
+    inside a running loop - async callers should await the function directly.
+    """
+    async def _run():
+        async with AsyncHttpClient() as http:
+            return await coroutine_function(http, *args, **kwargs)
+    return asyncio.run(_run())
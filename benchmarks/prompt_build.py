@@ -0,0 +1,104 @@
+# benchmarks/prompt_build.py
+"""Prompt assembly for a backfill: the compiled template vs the per-game f-string builder.
+
+Run from the repository root:
+    python -m benchmarks.prompt_build --games 1000
+"""
+import argparse
+import ast
+import contextlib
+import io
+import random
+import subprocess
+import time
+from datetime import datetime
+
+from blog_prompts import get_prompt_builder
+from mlb_data_fetcher import MLBDataFetcher
+from publish_targets import PublishTarget
+from webflow_items import game_date_for
+from benchmarks.synthetic_slate import slate_inputs
+
+# The old builder lived in main.py, so it is loaded from the commit before blog_prompts.py
+# was added rather than kept as a copy here
+LEGACY_NAMES = ('TEMPLATE_VARIANTS', 'get_blog_headers', 'get_mlb_blog_post_prompt')
+
+def legacy_revision():
+    added = subprocess.run(
+        ['git', 'log', '--diff-filter=A', '--format=%H', '--', 'blog_prompts.py'],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return f"{added[-1]}^"
+
+def load_legacy_prompt(revision):
+    """get_mlb_blog_post_prompt as it was at revision: the whole f-string rebuilt per game"""
+    source = subprocess.run(['git', 'show', f'{revision}:main.py'], capture_output=True, text=True, check=True).stdout
+    module = ast.parse(source)
+    module.body = [
+        node for node in module.body
+        if getattr(node, 'name', None) in LEGACY_NAMES
+        or (isinstance(node, ast.Assign) and any(getattr(t, 'id', None) in LEGACY_NAMES for t in node.targets))
+    ]
+    namespace = {'random': random, 'datetime': datetime, 'PRIMARY_TARGET': None}
+    exec(compile(module, f'{revision}:main.py', 'exec'), namespace)
+    return namespace['get_mlb_blog_post_prompt']
+
+def build_topics(games, games_per_day=15):
+    topics = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for day in range(-(-games // games_per_day)):
+            topics.extend(MLBDataFetcher().build_blog_topics(*slate_inputs(day, games_per_day)))
+    return topics[:games]
+
+def time_builds(builds, topics, repeat):
+    """[[seconds per repeat] per build] to cover every topic, run interleaved"""
+    timings = [[] for _ in builds]
+    for _ in range(repeat):
+        for i, build in enumerate(builds):
+            started = time.perf_counter()
+            for topic in topics:
+                build(topic)
+            timings[i].append(time.perf_counter() - started)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--targets', type=int, default=1, help='sites each game is written for')
+    parser.add_argument('--revision', help='git revision to load the old builder from (default: before blog_prompts.py)')
+    args = parser.parse_args()
+
+    legacy_prompt = load_legacy_prompt(args.revision or legacy_revision())
+    topics = build_topics(args.games)
+    targets = [PublishTarget(f'site{i}', 'site', 'collection', site_url=f'https://site{i}.example.com')
+               for i in range(args.targets)]
+
+    def legacy_build(topic):
+        for target in targets:
+            legacy_prompt(topic, target)
+
+    def compiled_build(topic):
+        game_data = topic.to_json()
+        for target in targets:
+            get_prompt_builder(target.template, target.site_url, game_date_for(topic)).build(topic, game_data)
+
+    # The game JSON is the same work either way, so report it separately
+    legacy_runs, compiled_runs, json_runs = time_builds((
+        legacy_build,
+        compiled_build,
+        lambda topic: topic.to_json()
+    ), topics, args.repeat)
+
+    legacy, compiled, game_json = min(legacy_runs), min(compiled_runs), min(json_runs)
+    # Per-repeat ratios, so run-to-run noise shows next to the best-of-repeat figure
+    ratios = [old / new for old, new in zip(legacy_runs, compiled_runs)]
+
+    print(f"🧮 {len(topics)} games x {len(targets)} site{'s' if len(targets) != 1 else ''}")
+    print(f"  Per-game f-string: {legacy * 1000:,.1f} ms ({legacy / len(topics) * 1e6:,.1f} µs/game)")
+    print(f"  Compiled template: {compiled * 1000:,.1f} ms ({compiled / len(topics) * 1e6:,.1f} µs/game)")
+    print(f"  Game JSON alone:   {game_json * 1000:,.1f} ms")
+    print(f"  Old / compiled:    {legacy / compiled:.2f}x best of {len(ratios)} ({min(ratios):.2f}x-{max(ratios):.2f}x per repeat)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/replay_slates.py
+"""Topic building over archived slates, replayed offline through the fetcher.
+
+Run from the repository root; --synthetic first writes an archive of generated days:
+    python -m benchmarks.replay_slates --archive .cache/slates.archive --synthetic 365
+"""
+import argparse
+import contextlib
+import io
+import time
+from datetime import date, timedelta
+
+from fixture_archive import SlateArchive, append_payloads
+from slate_replay import ReplayFetcher
+from benchmarks.synthetic_slate import generate_slate
+
+def write_synthetic_archive(path, days, games_per_day, start=date(2025, 4, 1)):
+    for day in range(days):
+        reports, umpires, betting_games = generate_slate(day, games_per_day)
+        append_payloads(path, start + timedelta(days=day), {
+            'mlb': {'reports': reports},
+            'umpire': umpires,
+            'betting': {'games': betting_games}
+        })
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--archive', default='.cache/slates.archive')
+    parser.add_argument('--synthetic', type=int, default=0, help='write this many synthetic days first')
+    parser.add_argument('--games', type=int, default=15)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        started = time.perf_counter()
+        write_synthetic_archive(args.archive, args.synthetic, args.games)
+        print(f"🗄️ Wrote {args.synthetic} synthetic days in {time.perf_counter() - started:.2f}s")
+
+    games = 0
+    with SlateArchive(args.archive) as archive:
+        dates = archive.dates()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for game_date in dates:
+                games += len(ReplayFetcher(archive, game_date).get_blog_topics())
+        elapsed = time.perf_counter() - started
+    print(f"🔁 Replayed {len(dates)} slates ({games} games) in {elapsed:.2f}s")
+    print(f"  {1000 * elapsed / max(len(dates), 1):.1f} ms/slate, {1e6 * elapsed / max(games, 1):.0f} µs/game")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/synthetic_slate.py
+"""Deterministic fake feed payloads shaped like the matchup, umpire and betting APIs"""
+import random
+from umpire_store import parse_umpire_feed
+
+TEAMS = [
+    ('ARI', 'Diamondbacks'), ('ATL', 'Braves'), ('BAL', 'Orioles'), ('BOS', 'Red Sox'),
+    ('CHC', 'Cubs'), ('CWS', 'White Sox'), ('CIN', 'Reds'), ('CLE', 'Guardians'),
+    ('COL', 'Rockies'), ('DET', 'Tigers'), ('HOU', 'Astros'), ('KC', 'Royals'),
+    ('LAA', 'Angels'), ('LAD', 'Dodgers'), ('MIA', 'Marlins'), ('MIL', 'Brewers'),
+    ('MIN', 'Twins'), ('NYM', 'Mets'), ('NYY', 'Yankees'), ('ATH', 'Athletics'),
+    ('PHI', 'Phillies'), ('PIT', 'Pirates'), ('SD', 'Padres'), ('SF', 'Giants'),
+    ('SEA', 'Mariners'), ('STL', 'Cardinals'), ('TB', 'Rays'), ('TEX', 'Rangers'),
+    ('TOR', 'Blue Jays'), ('WSH', 'Nationals'),
+]
+PITCHES = [
+    ('FF', 'Four-Seam Fastball', 95.0), ('SI', 'Sinker', 93.5), ('SL', 'Slider', 86.0),
+    ('CH', 'Changeup', 85.0), ('CU', 'Curveball', 79.0), ('FC', 'Cutter', 90.0), ('FS', 'Splitter', 85.5),
+]
+
+def _pitcher(rng, pitcher_id):
+    pitches = rng.sample(PITCHES, rng.randint(3, 6))
+    weights = [rng.random() for _ in pitches]
+    total = sum(weights)
+    return {
+        'id': pitcher_id,
+        'name': f"Pitcher{pitcher_id}, Sam",
+        'arsenal': {
+            code: {'name': name, 'usage_rate': w / total, 'avg_speed': round(speed + rng.uniform(-2, 2), 1)}
+            for (code, name, speed), w in zip(pitches, weights)
+        },
+    }
+
+def _matchups(rng, batter_base, pitcher_name):
+    matchups = []
+    for n in range(9):
+        season_avg = rng.uniform(0.200, 0.310)
+        season_k = rng.uniform(15.0, 32.0)
+        matchups.append({
+            'batter': f"Batter{batter_base + n}, Alex",
+            'vs_pitcher': pitcher_name,
+            'reliability': rng.choice(['LOW', 'MEDIUM', 'HIGH', 'HIGH']),
+            'baseline_stats': {'season_avg': season_avg, 'season_k_pct': season_k},
+            'weighted_est_ba': season_avg + rng.uniform(-0.060, 0.060),
+            'weighted_k_rate': season_k + rng.uniform(-8.0, 8.0),
+        })
+    return matchups
+
+def generate_slate(day_index, games_per_day=15, seed=2025):
+    """Return (mlb_reports, umpires, betting_games) for one synthetic day"""
+    rng = random.Random(seed * 100003 + day_index)
+    teams = rng.sample(TEAMS, games_per_day * 2)
+    reports, umpires, betting_games = [], [], []
+    for g in range(games_per_day):
+        (away, away_name), (home, home_name) = teams[2 * g], teams[2 * g + 1]
+        matchup = f"{away} @ {home}"
+        away_pitcher = _pitcher(rng, day_index * 100 + 2 * g)
+        home_pitcher = _pitcher(rng, day_index * 100 + 2 * g + 1)
+        reports.append({
+            'matchup': matchup,
+            'pitchers': {'away': away_pitcher, 'home': home_pitcher},
+            'key_matchups': _matchups(rng, g * 100, home_pitcher['name']) + _matchups(rng, g * 100 + 50, away_pitcher['name']),
+        })
+        umpires.append({
+            'matchup': matchup,
+            'umpire': f"Umpire {rng.randint(1, 90)}",
+            'k_boost': f"{rng.uniform(0.85, 1.15):.2f}x",
+            'bb_boost': f"{rng.uniform(0.85, 1.15):.2f}x",
+        })
+        hour = rng.choice([1, 4, 6, 7, 9, 10])
+        favorite_first = rng.random() < 0.5
+        betting_games.append({
+            'away_team': f"{away} {away_name}",
+            'home_team': f"{home} {home_name}",
+            'time': f"7/{day_index % 28 + 1}, {hour:02d}:{rng.choice(['05', '10', '40'])}PM",
+            'markets': {'Moneyline': [
+                {'team': f"{away} {away_name}", 'odds': '-130' if favorite_first else '+110', 'handle_pct': f"{rng.randint(20, 80)}%"},
+                {'team': f"{home} {home_name}", 'odds': '+110' if favorite_first else '-130', 'handle_pct': f"{rng.randint(20, 80)}%"},
+            ]},
+        })
+    return reports, umpires, betting_games
+
+def slate_inputs(day_index, games_per_day=15):
+    """generate_slate() as fetched: the build_blog_topics arguments, umpires parsed"""
+    reports, umpires, betting_games = generate_slate(day_index, games_per_day)
+    return reports, parse_umpire_feed(umpires), betting_games
+
+def offline_fetcher(fetcher, day_index, games_per_day=15):
+    """Point an MLBDataFetcher at one synthetic day instead of the live feeds"""
+    reports, umpires, betting_games = slate_inputs(day_index, games_per_day)
+    async def fetch_feeds_async(http):
+        return reports, umpires, betting_games
+    fetcher.fetch_feeds_async = fetch_feeds_async
+    return fetcher
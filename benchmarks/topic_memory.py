@@ -0,0 +1,53 @@
+# benchmarks/topic_memory.py
+"""Memory held by a multi-day backfill of game topics: slotted records vs the old nested dicts.
+
+Run from the repository root:
+    python -m benchmarks.topic_memory --days 180
+"""
+import argparse
+import contextlib
+import io
+import tracemalloc
+
+from mlb_data_fetcher import ARSENAL_STORE, MLBDataFetcher
+from benchmarks.synthetic_slate import slate_inputs
+
+def build_backfill(days, games_per_day):
+    topics = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for day in range(days):
+            topics.extend(MLBDataFetcher().build_blog_topics(*slate_inputs(day, games_per_day)))
+    return topics
+
+def legacy_shape(topic):
+    """The per-game dict get_blog_topics_from_games used to return"""
+    return {'topic': topic.topic, 'keywords': topic.keywords, 'game_data': topic.game_data()}
+
+def measure(build):
+    """Bytes still allocated by whatever build() returns (arsenal cache excluded)"""
+    ARSENAL_STORE.clear()
+    tracemalloc.start()
+    result = build()
+    ARSENAL_STORE.clear()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--games', type=int, default=15)
+    args = parser.parse_args()
+
+    topics, record_bytes = measure(lambda: build_backfill(args.days, args.games))
+    del topics
+    _, dict_bytes = measure(lambda: [legacy_shape(t) for t in build_backfill(args.days, args.games)])
+
+    games = args.days * args.games
+    print(f"🧮 {games} games over {args.days} days")
+    print(f"  Slotted records: {record_bytes / 1024:,.0f} KiB ({record_bytes / games:,.0f} B/game)")
+    print(f"  Nested dicts:    {dict_bytes / 1024:,.0f} KiB ({dict_bytes / games:,.0f} B/game)")
+    print(f"  Savings: {100 * (1 - record_bytes / dict_bytes):.0f}%")
+
+if __name__ == '__main__':
+    main()
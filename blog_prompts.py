@@ -0,0 +1,477 @@
+# blog_prompts.py
+import hashlib
+import json
+import random
+import re
+from functools import lru_cache
+from string import Formatter
+from mlb_data_fetcher import classify_umpire, evaluate_prop_alerts
+from mlb_records import format_average
+
+# Section header options, rotated to avoid scaled content detection
+BLOG_HEADER_CHOICES = {
+    "intro": (
+        "Brief Intro", 
+        "Game Overview", 
+        "Matchup Setup",
+        "Today's Setup",
+        "Game Preview"
+    ),
+    "pitchers": (
+        "Pitcher Breakdown", 
+        "Rotation Report", 
+        "Starting Pitching Analysis",
+        "Mound Matchup",
+        "Pitching Preview"
+    ),
+    "lineups": (
+        "Lineup Matchups", 
+        "Batting Edges vs Arsenal", 
+        "Offensive Breakdown",
+        "Lineup Advantage vs Arsenal",
+        "Hitting Matchups"
+    ),
+    "strikeouts": (
+        "Strikeout Trends", 
+        "K-Risk Analysis", 
+        "Whiff Outlook",
+        "Lineup Strikeout Trends vs Arsenal",
+        "Contact vs Strikeout Profile"
+    ),
+    "umpire": (
+        "Umpire Impact", 
+        "Behind the Plate", 
+        "Umpire Trends",
+        "Umpire Influence",
+        "Plate Umpire Analysis"
+    ),
+    "lean": (
+        "Final Lean & Takeaway", 
+        "Betting Breakdown", 
+        "Where the Edge Is",
+        "Betting Interpretation / Final Lean",
+        "Our Betting Take"
+    )
+}
+
+# Per-site prompt variants; each publish target picks one by name
+TEMPLATE_VARIANTS = {
+    'standard': {
+        'word_count': '500–800',
+        'cta': 'Want more of our best props and betting analysis? Click below and join insider bets!',
+        'cta_link': 'See all our best bets daily!'
+    },
+    'quick-hit': {
+        'word_count': '350–500',
+        'cta': 'Get every edge we find before first pitch, every day.',
+        'cta_link': 'Get the daily best bets'
+    }
+}
+
+class CompiledTemplate:
+    """A str.format-style template split once into literal segments and slot names.
+
+    bind() folds values that are fixed for a run into the literals, so rendering a game
+    only joins the remaining per-game slots.
+    """
+    __slots__ = ('literals', 'slots')
+
+    def __init__(self, literals, slots):
+        self.literals = tuple(literals)  # Always one more literal than slots
+        self.slots = tuple(slots)
+
+    @classmethod
+    def parse(cls, template):
+        literals, slots = [''], []
+        for literal, field_name, _spec, _conversion in Formatter().parse(template):
+            literals[-1] += literal
+            if field_name is not None:
+                slots.append(field_name)
+                literals.append('')
+        return cls(literals, slots)
+
+    def bind(self, **values):
+        literals, slots = [self.literals[0]], []
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            if slot in values:
+                literals[-1] += str(values[slot]) + literal
+            else:
+                slots.append(slot)
+                literals.append(literal)
+        return CompiledTemplate(literals, slots)
+
+    def render(self, values):
+        pieces = [self.literals[0]]
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            pieces.append(values[slot])
+            pieces.append(literal)
+        return ''.join(pieces)
+
+BLOG_PROMPT_TEMPLATE = """You're an expert MLB betting analyst and blog writer. You write sharp, stat-driven previews for baseball bettors.
+
+Based on the JSON game data below, write a {word_count} word blog post that follows this EXACT structure:
+
+# {seo_title}
+*Last updated: {last_updated}*
+
+**Game Time:** [time from game_time field]
+
+## {header_intro}
+Set up the game in 2-3 sentences using the matchup and key angles from the data. Include the betting line information from the betting_info field in this intro section.
+
+## {header_pitchers}
+**Pitching Matchup:** [Away Pitcher] vs [Home Pitcher]
+
+### [Away Pitcher Name] ([Away Team]):
+List ALL pitch types with EXACT usage percentages and velocities from away_pitcher.arsenal.
+Format: "Four-Seam Fastball (35% usage, 97.1 mph), Slider (18% usage, 87.0 mph), Splitter (14% usage, 84.7 mph)"
+Interpretation: What style of pitcher (velocity-heavy, pitch-mix artist, etc.)
+How their pitches match up: "The [Home Team] lineup averages .XXX this season with a projected xBA of .XXX vs [Away Pitcher]'s arsenal"
+
+If away_pitcher_chart_url exists in game_data, add: ![Away Pitcher Pitch Mix Chart](away_pitcher_chart_url)
+
+### [Home Pitcher Name] ([Home Team]):
+Same detailed structure: List ALL pitches with exact usage % and mph from home_pitcher.arsenal
+"The [Away Team] lineup averages .XXX this season with a projected xBA of .XXX vs [Home Pitcher]'s arsenal"
+
+If home_pitcher_chart_url exists in game_data, add: ![Home Pitcher Pitch Mix Chart](home_pitcher_chart_url)
+
+If pitch_mix_chart_url exists in game_data, add it once after both pitchers: ![Pitch Mix Comparison](pitch_mix_chart_url)
+
+## {header_lineups}
+**Lineup Matchups & Batting Edges**
+
+For Away Team vs Home Pitcher:
+Compare team averages: "The [Away Team] lineup averages .XXX this season but projects to .XXX vs [Home Pitcher]'s arsenal"
+From away_key_performers, show:
+The batter with the BIGGEST INCREASE in xBA (if any)
+The batter with the BIGGEST DECREASE in xBA (if any)
+Format: Name: Season BA .XXX → xBA vs arsenal .XXX (+/- XX points), Season K% XX.X% → Arsenal K% XX.X% (+/- X.X%)
+Skip batters with minimal changes (under 15 point differences)
+
+For Home Team vs Away Pitcher:
+Same detailed structure using home_key_performers.
+Focus on biggest increase and biggest decrease only.
+
+## {header_strikeouts}
+**Strikeout Risks & Rewards**
+For each team:
+Use away_arsenal_k_pct vs away_season_k_pct and home_arsenal_k_pct vs home_season_k_pct.
+Format: "The [Team]'s projected K-rate is [X]% vs [Pitcher] — up/down [Y]% from their [Z]% season average."
+Interpretation: Higher = potential K prop value, Lower = potential contact play
+
+## {header_umpire}
+**Behind the Plate:** [Umpire Name]
+If umpire field is NOT "TBA" and umpire data exists:
+Show exact umpire name from umpire field
+State the tendencies from umpire_profile exactly as given: "[k_change] strikeouts", "[bb_change] walks"
+Describe the umpire with umpire_profile.label (already classified - do not reclassify)
+IMPORTANT: Higher strikeouts = pitcher-friendly, Higher walks = hitter-friendly
+If umpire field is "TBA" or missing:
+"Umpire assignment has not been announced, which makes prop volatility a concern."
+
+## **What to Bet On**
+
+prop_alerts lists every lean in this game that meets our betting criteria, already checked against the data. Copy each alert line exactly as written, then add one sentence of supporting context from the data.
+
+If prop_alerts is empty: No significant statistical edges meet our betting threshold in this matchup.
+
+## 🔑 Key Takeaways
+Create 3-4 bullet points summarizing the main insights:
+- Key player advantages/disadvantages
+- Pitcher prop opportunities (or lack thereof)
+- Umpire impact assessment
+- Overall betting recommendation
+
+## 🧠 FAQs
+
+**Q: Who is the best betting prop for the [Away Team] vs [Home Team] game?**
+A: [The first entry in prop_alerts, or "No players meet our strict betting criteria" if prop_alerts is empty]
+
+**Q: Is [Umpire Name] a pitcher-friendly umpire?**
+A: [umpire_profile.label with its k_change strikeouts and bb_change walks, or "TBA" if unknown]
+
+**Q: What time is the [Away Team] vs [Home Team] game?**
+A: [Game time from game_time field]
+
+---
+
+**{cta}**
+
+[{cta_link}]({site_url}/betting/about)
+
+CRITICAL RULES:
+1. Use ONLY the JSON data provided below - NO external stats or guessing
+2. If data is missing, say "data not available" rather than inventing
+3. Use umpire_profile for umpire percentages and labels - do not convert the multipliers yourself
+4. Focus on the biggest statistical edges from the data
+5. Keep tone sharp and analytical, avoid generic phrases
+6. ALWAYS include exact pitch usage percentages and velocities from arsenal data
+7. Show exact season BA vs projected xBA for all lineup comparisons
+8. Only highlight batters with biggest increases AND biggest decreases (skip minimal changes)
+9. NEVER suggest a lean that is not in prop_alerts - those are the only ones that meet our criteria
+10. Remember: walks help hitters, strikeouts help pitchers
+11. OUTPUT MUST BE VALID MARKDOWN - USE # ## ### HEADERS, NOT HTML
+12. ALWAYS include the CTA and daily roundup link at the end
+13. If a stale_data field is present, treat the listed feeds as an earlier snapshot - say odds or umpire info is "as of the latest available update" and never present "unavailable" data as known
+
+Blog Title: {seo_title}
+Target Keywords: {keywords}
+
+Game Data (JSON):
+{game_data}
+"""
+
+# Parsed once at import
+BLOG_PROMPT = CompiledTemplate.parse(BLOG_PROMPT_TEMPLATE)
+
+# The post's ## sections in template order; None means the heading is a rotated header choice
+POST_SECTIONS = (
+    ('intro', None),
+    ('pitchers', None),
+    ('lineups', None),
+    ('strikeouts', None),
+    ('umpire', None),
+    ('bet', '**What to Bet On**'),
+    ('takeaways', '🔑 Key Takeaways'),
+    ('faqs', '🧠 FAQs')
+)
+
+# Section-by-section generation: each LLM section gets a small prompt with only the game
+# data it reads, and the deterministic parts of the post are rendered locally
+SECTION_PROMPT_TEMPLATE = """You're an expert MLB betting analyst and blog writer. You write sharp, stat-driven previews for baseball bettors.
+
+You are writing ONE section of a betting preview for {matchup}; the other sections are written separately. Write about {words} words of Markdown, starting with this exact heading line:
+
+## {heading}
+
+{instructions}
+
+RULES:
+1. Use ONLY the JSON data provided below - NO external stats or guessing
+2. If data is missing, say "data not available" rather than inventing
+3. Keep tone sharp and analytical, avoid generic phrases
+4. OUTPUT MUST BE VALID MARKDOWN - USE ## ### HEADERS, NOT HTML
+5. Output only this section: no post title, no other ## headings, no FAQs or call to action
+6. If a stale_data field is present, treat the listed feeds as an earlier snapshot - say odds or umpire info is "as of the latest available update" and never present "unavailable" data as known
+
+Section Data (JSON):
+{section_data}
+"""
+
+SECTION_INSTRUCTIONS = {
+    'intro': """Set up the game in 2-3 sentences using the matchup and key angles from the data. Include the betting line information from the betting_info field.""",
+    'pitchers': """**Pitching Matchup:** [Away Pitcher] vs [Home Pitcher]
+
+### [Away Pitcher Name] ([Away Team]):
+List ALL pitch types with EXACT usage percentages and velocities from away_pitcher.arsenal.
+Format: "Four-Seam Fastball (35% usage, 97.1 mph), Slider (18% usage, 87.0 mph), Splitter (14% usage, 84.7 mph)"
+Interpretation: What style of pitcher (velocity-heavy, pitch-mix artist, etc.)
+How their pitches match up: "The [Home Team] lineup averages .XXX this season with a projected xBA of .XXX vs [Away Pitcher]'s arsenal"
+
+If away_pitcher_chart_url exists, add: ![Away Pitcher Pitch Mix Chart](away_pitcher_chart_url)
+
+### [Home Pitcher Name] ([Home Team]):
+Same detailed structure: List ALL pitches with exact usage % and mph from home_pitcher.arsenal
+"The [Away Team] lineup averages .XXX this season with a projected xBA of .XXX vs [Home Pitcher]'s arsenal"
+
+If home_pitcher_chart_url exists, add: ![Home Pitcher Pitch Mix Chart](home_pitcher_chart_url)
+
+If pitch_mix_chart_url exists, add it once after both pitchers: ![Pitch Mix Comparison](pitch_mix_chart_url)""",
+    'lineups': """**Lineup Matchups & Batting Edges**
+
+For Away Team vs Home Pitcher:
+Compare team averages: "The [Away Team] lineup averages .XXX this season but projects to .XXX vs [Home Pitcher]'s arsenal"
+From away_key_performers, show:
+The batter with the BIGGEST INCREASE in xBA (if any)
+The batter with the BIGGEST DECREASE in xBA (if any)
+Format: Name: Season BA .XXX → xBA vs arsenal .XXX (+/- XX points), Season K% XX.X% → Arsenal K% XX.X% (+/- X.X%)
+Skip batters with minimal changes (under 15 point differences)
+
+For Home Team vs Away Pitcher:
+Same detailed structure using home_key_performers.
+Focus on biggest increase and biggest decrease only.""",
+    'strikeouts': """**Strikeout Risks & Rewards**
+For each team:
+Use away_arsenal_k_pct vs away_season_k_pct and home_arsenal_k_pct vs home_season_k_pct.
+Format: "The [Team]'s projected K-rate is [X]% vs [Pitcher] — up/down [Y]% from their [Z]% season average."
+Interpretation: Higher = potential K prop value, Lower = potential contact play""",
+    'umpire': """**Behind the Plate:** [Umpire Name]
+If umpire field is NOT "TBA" and umpire data exists:
+Show exact umpire name from umpire field
+State the tendencies from umpire_profile exactly as given: "[k_change] strikeouts", "[bb_change] walks"
+Describe the umpire with umpire_profile.label (already classified - do not reclassify)
+IMPORTANT: Higher strikeouts = pitcher-friendly, Higher walks = hitter-friendly
+If umpire field is "TBA" or missing:
+"Umpire assignment has not been announced, which makes prop volatility a concern.\"""",
+    'bet': """prop_alerts lists every lean in this game that meets our betting criteria, already checked against the data. Copy each alert line exactly as written, then add one sentence of supporting context from the data.
+
+If prop_alerts is empty: No significant statistical edges meet our betting threshold in this matchup.
+NEVER suggest a lean that is not in prop_alerts.""",
+    'takeaways': """Create 3-4 bullet points summarizing the main insights:
+- Key player advantages/disadvantages
+- Prop opportunities from prop_alerts (or lack thereof) - never suggest any other lean
+- Umpire impact assessment from umpire_profile
+- Overall betting recommendation"""
+}
+
+# Game data fields each generated section reads; everything else stays out of its prompt
+_TEAMS = ('matchup', 'away_team', 'home_team')
+_PITCHER_NAMES = ('away_pitcher_name', 'home_pitcher_name')
+_LINEUP_BA = ('away_season_ba', 'away_arsenal_ba', 'home_season_ba', 'home_arsenal_ba')
+_LINEUP_K = ('away_season_k_pct', 'away_arsenal_k_pct', 'home_season_k_pct', 'home_arsenal_k_pct')
+_PERFORMERS = ('away_key_performers', 'home_key_performers')
+_UMPIRE = ('umpire', 'umpire_profile')
+SECTION_DATA_KEYS = {
+    'intro': _TEAMS + ('game_time', 'betting_info') + _PITCHER_NAMES + ('stale_data',),
+    'pitchers': _TEAMS + ('away_pitcher', 'home_pitcher') + _LINEUP_BA
+                + ('away_pitcher_chart_url', 'home_pitcher_chart_url', 'pitch_mix_chart_url'),
+    'lineups': _TEAMS + _PITCHER_NAMES + _LINEUP_BA + _PERFORMERS,
+    'strikeouts': _TEAMS + _PITCHER_NAMES + _LINEUP_K,
+    'umpire': _TEAMS + _UMPIRE + ('stale_data',),
+    'bet': _TEAMS + _PITCHER_NAMES + _LINEUP_K + _PERFORMERS + ('prop_alerts',),
+    'takeaways': _TEAMS + ('betting_info',) + _PITCHER_NAMES + _LINEUP_BA + _LINEUP_K + _PERFORMERS + _UMPIRE + ('prop_alerts',)
+}
+# Share of the variant's word count each generated section is asked for
+SECTION_WORD_SHARES = {'intro': 0.1, 'pitchers': 0.3, 'lineups': 0.2, 'strikeouts': 0.1, 'umpire': 0.1, 'bet': 0.1, 'takeaways': 0.1}
+
+SECTION_PROMPTS = {
+    section: CompiledTemplate.parse(SECTION_PROMPT_TEMPLATE).bind(instructions=instructions)
+    for section, instructions in SECTION_INSTRUCTIONS.items()
+}
+
+def get_blog_headers(seed=None):
+    """Pick one header per section; the same seed always gives the same headers.
+
+    A seeded pick hashes the seed once and takes one byte per section, which is much
+    cheaper than seeding a random.Random per game.
+    """
+    if seed is None:
+        return {section: random.choice(choices) for section, choices in BLOG_HEADER_CHOICES.items()}
+    digest = hashlib.blake2b(seed.encode(), digest_size=len(BLOG_HEADER_CHOICES)).digest()
+    return {section: choices[byte % len(choices)] for (section, choices), byte in zip(BLOG_HEADER_CHOICES.items(), digest)}
+
+def format_seo_title(topic, game_date):
+    """Shorter, more SEO-friendly title for a game topic, dated by its game"""
+    if ' at ' in topic:
+        teams = topic.replace(' MLB Betting Preview', '').split(' at ')
+        return f"{teams[0]} vs {teams[1]}: Betting Preview & Props ({game_date:%b %d})"
+    return topic.replace('MLB Betting Preview', 'Odds, Props & Analysis')
+
+def faq_answers(game_topic):
+    """[(question, answer)] for the FAQ section, answered from the slate's betting rules"""
+    alerts = game_topic.prop_alerts if game_topic.prop_alerts is not None else evaluate_prop_alerts(game_topic)
+    umpire = game_topic.umpire_profile or classify_umpire(game_topic.umpire, game_topic.umpire_k_boost, game_topic.umpire_bb_boost)
+    batter_alerts = [alert for alert in alerts if alert.kind == 'batter']
+    if batter_alerts:
+        best = batter_alerts[0]
+        prop_answer = (f"{best.name} ({format_average(best.season)} → {format_average(best.projected)}, "
+                       f"+{best.change * 1000:.0f} points vs this arsenal) meets our betting lean criteria.")
+    else:
+        prop_answer = "No players meet our strict betting criteria in this matchup."
+    if umpire.announced:
+        umpire_answer = f"{umpire.label.capitalize()}, with {umpire.k_percent:+d}% strikeouts and {umpire.bb_percent:+d}% walks."
+    else:
+        umpire_answer = "TBA - the umpire assignment has not been announced yet."
+    return [
+        (f"Who is the best betting prop for the {game_topic.away_team} vs {game_topic.home_team} game?", prop_answer),
+        (f"Is {game_topic.umpire} a pitcher-friendly umpire?", umpire_answer),
+        (f"What time is the {game_topic.away_team} vs {game_topic.home_team} game?", game_topic.game_time)
+    ]
+
+class BlogPromptBuilder:
+    """Builds game prompts for one game date and template variant.
+
+    The variant text, site URL and dates are bound into the template once; headers are
+    seeded by game date, site and game, so rebuilding a prompt gives the same text.
+    """
+
+    def __init__(self, template, site_url, game_date):
+        self.game_date = game_date
+        self.site_url = site_url
+        variant = self.variant = TEMPLATE_VARIANTS[template]
+        self.max_words = max(int(number) for number in re.findall(r'\d+', variant['word_count']))
+        self.template = BLOG_PROMPT.bind(
+            word_count=variant['word_count'],
+            cta=variant['cta'],
+            cta_link=variant['cta_link'],
+            site_url=site_url,
+            last_updated=f"{self.game_date:%B %d, %Y}"
+        )
+
+    def header_seed(self, game_topic):
+        return f"{self.game_date.isoformat()}|{self.site_url}|{game_topic.topic}"
+
+    def headers_for(self, game_topic):
+        return get_blog_headers(self.header_seed(game_topic))
+
+    def section_headings(self, game_topic):
+        """[(section, '## heading')] the post for this game must contain, in order"""
+        headers = self.headers_for(game_topic)
+        return [(section, f"## {heading or headers[section]}") for section, heading in POST_SECTIONS]
+
+    def cta_url(self):
+        return f"{self.site_url}/betting/about"
+
+    def section_prompts(self, game_topic, game_data=None):
+        """[(section, prompt)] for the sections written by the LLM, each with only the data it needs.
+
+        game_data is the game_data() dict, when the caller already has it.
+        """
+        game_data = game_data if game_data is not None else game_topic.game_data()
+        game_data = dict(game_data, away_pitcher_name=game_topic.away_pitcher.name, home_pitcher_name=game_topic.home_pitcher.name)
+        headings = dict(self.section_headings(game_topic))
+        prompts = []
+        for section, template in SECTION_PROMPTS.items():
+            section_data = {key: game_data[key] for key in SECTION_DATA_KEYS[section] if key in game_data}
+            prompts.append((section, template.render({
+                'matchup': game_topic.matchup,
+                'words': str(max(40, int(round(self.max_words * SECTION_WORD_SHARES[section], -1)))),
+                'heading': headings[section][3:],
+                'section_data': json.dumps(section_data, ensure_ascii=False)
+            })))
+        return prompts
+
+    def local_sections(self, game_topic):
+        """Markdown for the parts of the post that need no LLM: the opening, FAQs and CTA"""
+        headings = dict(self.section_headings(game_topic))
+        preamble = (
+            f"# {format_seo_title(game_topic.topic, self.game_date)}\n"
+            f"*Last updated: {self.game_date:%B %d, %Y}*\n\n"
+            f"**Game Time:** {game_topic.game_time}"
+        )
+        faqs = f"{headings['faqs']}\n\n" + '\n\n'.join(f"**Q: {question}**\nA: {answer}" for question, answer in faq_answers(game_topic))
+        cta = f"---\n\n**{self.variant['cta']}**\n\n[{self.variant['cta_link']}]({self.cta_url()})"
+        return {'preamble': preamble, 'faqs': faqs + '\n\n' + cta}
+
+    def assemble(self, game_topic, generated_sections):
+        """Full post from the local sections and {section: generated text}, in template order"""
+        headings = dict(self.section_headings(game_topic))
+        local_sections = self.local_sections(game_topic)
+        parts = [local_sections['preamble']]
+        for section, _ in POST_SECTIONS:
+            text = (local_sections.get(section) or generated_sections.get(section) or '').strip()
+            if text and not text.startswith('#'):
+                text = f"{headings[section]}\n\n{text}"
+            if text:
+                parts.append(text)
+        return '\n\n'.join(parts) + '\n'
+
+    def build(self, game_topic, game_data=None):
+        """Prompt for one game; pass game_data to reuse JSON already rendered for another target"""
+        headers = self.headers_for(game_topic)
+        return self.template.render({
+            'seo_title': format_seo_title(game_topic.topic, self.game_date),
+            'header_intro': headers['intro'],
+            'header_pitchers': headers['pitchers'],
+            'header_lineups': headers['lineups'],
+            'header_strikeouts': headers['strikeouts'],
+            'header_umpire': headers['umpire'],
+            'keywords': str(game_topic.keywords),
+            'game_data': game_data if game_data is not None else game_topic.to_json()
+        })
+
+@lru_cache(maxsize=16)
+def get_prompt_builder(template, site_url, game_date):
+    """Shared builder per (variant, site, game date) so a run compiles each variant once per day"""
+    return BlogPromptBuilder(template, site_url, game_date)
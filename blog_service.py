@@ -0,0 +1,234 @@
+# blog_service.py
+import argparse
+import asyncio
+import hmac
+import os
+import signal
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta, timezone
+from aiohttp import web
+from async_http import AsyncHttpClient
+from generation import GenerationDispatcher
+from main import PUBLISH_TARGETS, open_openai_client, publish_coordinators, publish_slate_async, test_webflow_connection_async
+
+# The control endpoint listens locally by default, and every request must carry
+# SERVICE_TOKEN in the X-Service-Token header; the service will not start without one
+SERVICE_HOST = os.environ.get('SERVICE_HOST', '127.0.0.1')
+SERVICE_PORT = int(os.environ.get('SERVICE_PORT', '8787'))
+SERVICE_TOKEN = os.environ.get('SERVICE_TOKEN')
+TOKEN_HEADER = 'X-Service-Token'
+# Daily slate time in UTC (HH:MM) - the old cron ran at 11:00 UTC, 7 AM EDT. Empty disables it
+SERVICE_RUN_AT = os.environ.get('SERVICE_RUN_AT', '11:00')
+
+def parse_run_at(run_at):
+    """(hour, minute) from 'HH:MM', or None when the daily run is disabled"""
+    if not run_at:
+        return None
+    hour, minute = (int(part) for part in run_at.split(':'))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"SERVICE_RUN_AT must be HH:MM, got '{run_at}'")
+    return hour, minute
+
+class ServiceBusy(Exception):
+    """Raised when a run is requested while another one is still going"""
+
+class BlogService:
+    """Long-running replacement for the daily cron job.
+
+    The HTTP session, OpenAI client, publish rate windows, model latency history and
+    matplotlib/logo caches are created once and reused by every run, so a run started
+    from the control endpoint skips the cold start. Runs never overlap: the daily slate,
+    a manual slate and a single-game regeneration are refused while another is going.
+    """
+
+    def __init__(self, targets=PUBLISH_TARGETS, run_at=SERVICE_RUN_AT, token=SERVICE_TOKEN, clock=lambda: datetime.now(timezone.utc)):
+        self.targets = targets
+        self.token = token
+        self.run_at = parse_run_at(run_at)
+        self.clock = clock
+        self.http = None
+        self.generator = None
+        self.publishers = None
+        self._clients = AsyncExitStack()
+        self.current = None  # Description of the run in progress
+        self.history = []  # Finished runs, newest last
+        self.started_at = clock()
+
+    async def __aenter__(self):
+        self.http = await self._clients.enter_async_context(AsyncHttpClient())
+        openai_client = await self._clients.enter_async_context(open_openai_client())
+        self.generator = GenerationDispatcher(openai_client)
+        self.publishers = publish_coordinators(self.http, self.targets)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._clients.aclose()
+
+    async def check_connections(self):
+        """Open the Webflow connections up front and check every target is reachable"""
+        results = await asyncio.gather(*(test_webflow_connection_async(self.http, target) for target in self.targets))
+        return all(results)
+
+    def next_run(self, now=None):
+        """Next scheduled slate run (UTC), or None with the schedule disabled"""
+        if self.run_at is None:
+            return None
+        now = now or self.clock()
+        hour, minute = self.run_at
+        run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return run if run > now else run + timedelta(days=1)
+
+    def _claim(self, matchups, reason):
+        # Synchronous, so two requests arriving together cannot both start a run
+        if self.current is not None:
+            raise ServiceBusy(f"{self.current['kind']} run started {self.current['started_at']} is still going")
+        self.current = {
+            'kind': 'slate' if matchups is None else 'game',
+            'matchups': matchups,
+            'reason': reason,
+            'started_at': self.clock().isoformat()
+        }
+
+    async def _run_claimed(self, matchups):
+        run = self.current
+        started = time.monotonic()
+        print(f"🚀 Starting {run['kind']} run ({run['reason']}) at {datetime.now()}")
+        try:
+            run['posts'] = await publish_slate_async(self.http, self.generator, self.targets, matchups, self.publishers)
+            return run['posts']
+        except Exception as e:
+            print(f"❌ {run['kind'].capitalize()} run failed: {e}")
+            run['error'] = str(e)
+            raise
+        finally:
+            run['seconds'] = round(time.monotonic() - started, 1)
+            self.history = (self.history + [run])[-20:]
+            self.current = None
+
+    async def run(self, matchups=None, reason='manual'):
+        """Publish the slate (or just the given matchups) and return the number of posts
+        created; raises ServiceBusy if a run is already going"""
+        self._claim(matchups, reason)
+        return await self._run_claimed(matchups)
+
+    def start_run(self, matchups=None, reason='manual'):
+        """run() in the background; raises ServiceBusy right away if a run is already going"""
+        self._claim(matchups, reason)
+        task = asyncio.ensure_future(self._run_claimed(matchups))
+        # Failures are logged and kept in history; retrieving them here keeps asyncio quiet
+        task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return task
+
+    async def run_schedule(self):
+        """Run the slate every day at run_at, skipping a day when a run is already going"""
+        while True:
+            next_run = self.next_run()
+            if next_run is None:
+                return
+            print(f"⏰ Next slate run at {next_run.isoformat()}")
+            await asyncio.sleep((next_run - self.clock()).total_seconds())
+            try:
+                await self.run(reason='schedule')
+            except ServiceBusy as e:
+                print(f"⏭️ Skipping scheduled run: {e}")
+            except Exception:
+                pass  # Logged by run(); tomorrow's run goes ahead regardless
+
+    def status(self):
+        next_run = self.next_run()
+        return {
+            'started_at': self.started_at.isoformat(),
+            'targets': [target.name for target in self.targets],
+            'next_run': next_run.isoformat() if next_run else None,
+            'current': self.current,
+            'history': self.history
+        }
+
+    # Control endpoint
+    def app(self):
+        app = web.Application(middlewares=[self.check_token])
+        app.router.add_get('/status', self.handle_status)
+        app.router.add_post('/slate', self.handle_slate)
+        app.router.add_post('/game', self.handle_game)
+        return app
+
+    @web.middleware
+    async def check_token(self, request, handler):
+        """Refuse any request without the shared secret (constant-time compare)"""
+        supplied = request.headers.get(TOKEN_HEADER, '')
+        if not self.token or not hmac.compare_digest(supplied.encode(), self.token.encode()):
+            return web.json_response({'error': f"missing or wrong {TOKEN_HEADER} header"}, status=401)
+        return await handler(request)
+
+    async def handle_status(self, request):
+        return web.json_response(self.status())
+
+    async def handle_slate(self, request):
+        """Start the full slate in the background: 202, or 409 if a run is going"""
+        try:
+            self.start_run(reason='endpoint')
+        except ServiceBusy as e:
+            return web.json_response({'error': str(e)}, status=409)
+        return web.json_response({'started': True}, status=202)
+
+    async def handle_game(self, request):
+        """Regenerate and publish one game, e.g. POST /game?matchup=NYY @ BOS, and wait for it"""
+        matchup = request.query.get('matchup')
+        if matchup is None and request.can_read_body:
+            try:
+                matchup = (await request.json()).get('matchup')
+            except ValueError:
+                return web.json_response({'error': "body must be JSON like {\"matchup\": \"NYY @ BOS\"}"}, status=400)
+        if not matchup or ' @ ' not in matchup:
+            return web.json_response({'error': "matchup ('AWY @ HOM') is required"}, status=400)
+        try:
+            # Shielded, so a client hanging up does not abandon the run halfway through
+            posts = await asyncio.shield(self.start_run([matchup], reason='endpoint'))
+        except ServiceBusy as e:
+            return web.json_response({'error': str(e)}, status=409)
+        except Exception as e:
+            return web.json_response({'error': str(e)}, status=500)
+        # posts is 0 when the game is not on today's slate, has started or failed to generate
+        return web.json_response({'matchup': matchup, 'posts': posts})
+
+async def serve(host=SERVICE_HOST, port=SERVICE_PORT, run_at=SERVICE_RUN_AT, run_now=False, token=SERVICE_TOKEN):
+    """Run the service until SIGINT/SIGTERM"""
+    if not token:
+        print("❌ SERVICE_TOKEN is required - the control endpoint can trigger publishes")
+        return 1
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    async with BlogService(run_at=run_at, token=token) as service:
+        print("🔗 Testing Webflow API connection...")
+        if not await service.check_connections():
+            print("❌ Webflow connection failed - check the site IDs and API token")
+            return 1
+
+        runner = web.AppRunner(service.app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        print(f"🛰️ Blog service listening on http://{host}:{port} (GET /status, POST /slate, POST /game?matchup=AWY @ HOM; {TOKEN_HEADER} required)")
+
+        schedule = asyncio.ensure_future(service.run_schedule())
+        if run_now:
+            service.start_run(reason='startup')
+        try:
+            await stop.wait()
+        finally:
+            print("👋 Shutting down blog service...")
+            schedule.cancel()
+            await runner.cleanup()
+    return 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="MLB blog generator as a long-running service")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--run-at', default=SERVICE_RUN_AT, help="daily slate time, HH:MM UTC ('' to disable)")
+    parser.add_argument('--run-now', action='store_true', help="also run the slate once at startup")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(serve(args.host, args.port, args.run_at, args.run_now)))
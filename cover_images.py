@@ -0,0 +1,152 @@
+# cover_images.py
+import json
+import os
+from functools import lru_cache
+from io import BytesIO
+import matplotlib
+from PIL import Image, ImageDraw, ImageFont
+from team_logos import get_team_logo_image, resolve_team_code
+from webflow_items import game_date_for
+
+# Bump when the layout changes so cached renders and uploads are not reused
+COVER_TEMPLATE_VERSION = 1
+COVER_SIZE = (1200, 630)
+COVER_LOGO_SIZE = 300
+# JPEG encodes ~15x faster than an optimized PNG at the same size for this artwork
+COVER_JPEG_QUALITY = 88
+COVER_UPLOAD_INDEX = os.environ.get('COVER_UPLOAD_INDEX', os.path.join('.cache', 'covers.json'))
+
+BACKGROUND = (15, 23, 42)
+ACCENT = (76, 175, 80)
+TEXT = (255, 255, 255)
+MUTED = (148, 163, 184)
+
+@lru_cache(maxsize=8)
+def _font(size):
+    """Bold TrueType font shipped with matplotlib, so no system fonts are needed"""
+    path = os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf', 'DejaVuSans-Bold.ttf')
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+@lru_cache(maxsize=64)
+def _scaled_logo(team_name):
+    logo = get_team_logo_image(team_name)
+    if logo is None:
+        return None
+    logo = logo.copy()
+    logo.thumbnail((COVER_LOGO_SIZE, COVER_LOGO_SIZE), Image.LANCZOS)
+    return logo
+
+def _centered_text(draw, y, text, font, fill):
+    width = draw.textlength(text, font=font)
+    draw.text(((COVER_SIZE[0] - width) / 2, y), text, font=font, fill=fill)
+
+@lru_cache(maxsize=64)
+def _matchup_banner(away_team, home_team, template_version):
+    """Logos and matchup line for a pairing; reused for every game of a series"""
+    banner = Image.new('RGB', COVER_SIZE, BACKGROUND)
+    draw = ImageDraw.Draw(banner)
+    draw.rectangle([0, COVER_SIZE[1] - 150, COVER_SIZE[0], COVER_SIZE[1]], fill=(30, 41, 59))
+    draw.rectangle([0, COVER_SIZE[1] - 154, COVER_SIZE[0], COVER_SIZE[1] - 150], fill=ACCENT)
+
+    logo_top = 70
+    for team, center_x in ((away_team, COVER_SIZE[0] // 4), (home_team, 3 * COVER_SIZE[0] // 4)):
+        logo = _scaled_logo(team)
+        if logo is not None:
+            banner.paste(logo, (center_x - logo.width // 2, logo_top + (COVER_LOGO_SIZE - logo.height) // 2), logo)
+        else:
+            # No logo available - fall back to the team code in large type
+            font = _font(120)
+            width = draw.textlength(team, font=font)
+            draw.text((center_x - width / 2, logo_top + 90), team, font=font, fill=TEXT)
+
+    _centered_text(draw, logo_top + 110, '@', _font(90), MUTED)
+    _centered_text(draw, COVER_SIZE[1] - 135, f"{away_team} @ {home_team}", _font(56), TEXT)
+    return banner
+
+def render_matchup_cover(away_team, home_team, game_date, template_version=COVER_TEMPLATE_VERSION):
+    """Branded cover banner for a game as a JPEG buffer, rendered entirely in memory"""
+    cover = _matchup_banner(away_team, home_team, template_version).copy()
+    draw = ImageDraw.Draw(cover)
+    subtitle = f"MLB BETTING PREVIEW  •  {game_date:%B} {game_date.day}, {game_date.year}".upper()
+    _centered_text(draw, COVER_SIZE[1] - 62, subtitle, _font(30), ACCENT)
+
+    buffer = BytesIO()
+    cover.save(buffer, format='JPEG', quality=COVER_JPEG_QUALITY, optimize=True)
+    buffer.seek(0)
+    return buffer
+
+class CoverUploadIndex:
+    """Remembers uploaded cover URLs so doubleheaders and reruns reuse the same asset"""
+
+    def __init__(self, path=COVER_UPLOAD_INDEX):
+        self.path = path
+        try:
+            with open(path) as f:
+                self._urls = json.load(f)
+        except (OSError, ValueError):
+            self._urls = {}
+
+    @staticmethod
+    def key(away_team, home_team, game_date, template_version=COVER_TEMPLATE_VERSION):
+        away_code = resolve_team_code(away_team) or away_team
+        home_code = resolve_team_code(home_team) or home_team
+        return f"{away_code}@{home_code}/v{template_version}/{game_date:%Y-%m-%d}"
+
+    def get(self, key):
+        return self._urls.get(key)
+
+    def put(self, key, url):
+        self._urls[key] = url
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(self._urls, f, indent=1, sort_keys=True)
+        except OSError as e:
+            print(f"⚠️ Could not save cover index: {e}")
+
+def _prepare_cover(game_topic, index):
+    """(key, cached_url, upload_args) - upload_args is None when nothing needs uploading"""
+    # The slate's date, as the post's slug uses, so a TBD game is not keyed by the run date
+    game_date = game_date_for(game_topic)
+    key = index.key(game_topic.away_team, game_topic.home_team, game_date)
+    cached_url = index.get(key)
+    if cached_url:
+        print(f"  ♻️ Reusing cover image: {cached_url}")
+        return key, cached_url, None
+
+    try:
+        buffer = render_matchup_cover(game_topic.away_team, game_topic.home_team, game_date)
+    except Exception as e:
+        print(f"❌ Error rendering cover for {game_topic.matchup}: {e}")
+        return key, None, None
+
+    filename = f"{game_topic.away_team.lower()}-at-{game_topic.home_team.lower()}-{game_date:%Y%m%d}-cover-v{COVER_TEMPLATE_VERSION}.jpg"
+    return key, None, (buffer, filename, 'image/jpeg')
+
+def get_cover_image_url(game_topic, upload, index=None):
+    """Render (or reuse) the cover for a game and return its hosted URL, or None on failure.
+
+    upload(buffer, filename, content_type) must return the hosted URL, e.g. upload_image_to_webflow.
+    """
+    index = index or CoverUploadIndex()
+    key, cached_url, upload_args = _prepare_cover(game_topic, index)
+    if upload_args is None:
+        return cached_url
+    url = upload(*upload_args)
+    if url:
+        index.put(key, url)
+    return url
+
+async def get_cover_image_url_async(game_topic, upload, index=None):
+    """get_cover_image_url() with an async upload, e.g. upload_image_to_webflow_async bound to a client"""
+    index = index or CoverUploadIndex()
+    key, cached_url, upload_args = _prepare_cover(game_topic, index)
+    if upload_args is None:
+        return cached_url
+    url = await upload(*upload_args)
+    if url:
+        index.put(key, url)
+    return url
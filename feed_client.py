@@ -0,0 +1,145 @@
+# feed_client.py
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from async_http import run_sync
+
+# The feeds run on Render, which can take a while to wake a sleeping service. Connect
+# fast, and if the first request is slow, race a second one instead of waiting it out.
+FEED_CONNECT_TIMEOUT = float(os.environ.get('FEED_CONNECT_TIMEOUT', '5'))
+FEED_READ_TIMEOUT = float(os.environ.get('FEED_READ_TIMEOUT', '25'))
+FEED_HEDGE_DELAY = float(os.environ.get('FEED_HEDGE_DELAY', '4'))
+FEED_ATTEMPTS = int(os.environ.get('FEED_ATTEMPTS', '2'))
+FEED_RETRY_DELAY = float(os.environ.get('FEED_RETRY_DELAY', '2'))
+FEED_CACHE_DIR = os.environ.get('FEED_CACHE_DIR', os.path.join('.cache', 'feeds'))
+FEED_MAX_STALE_HOURS = float(os.environ.get('FEED_MAX_STALE_HOURS', '12'))
+
+class FeedUnavailable(Exception):
+    """Raised when a feed cannot be fetched and has no usable cached payload"""
+
+class CircuitBreaker:
+    """Per-feed health: opens after repeated failures so later fetches fail fast"""
+
+    def __init__(self, name, failure_threshold=2, reset_timeout=600, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return 'half-open'  # Let one request through to probe the feed
+        return 'open'
+
+    def allow_request(self):
+        return self.state != 'open'
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == 'half-open' or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+
+# One breaker per feed for the life of the process
+BREAKERS = {}
+
+def get_breaker(name):
+    if name not in BREAKERS:
+        BREAKERS[name] = CircuitBreaker(name)
+    return BREAKERS[name]
+
+def _get_json_task(http, url):
+    return asyncio.ensure_future(http.get_json(url, timeout=(FEED_CONNECT_TIMEOUT, FEED_READ_TIMEOUT)))
+
+async def hedged_get_json(http, url, hedge_delay=FEED_HEDGE_DELAY):
+    """GET url, firing a second identical request if the first is slow; first success wins"""
+    tasks = {_get_json_task(http, url)}
+    done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+    if not done:
+        print(f"  🐢 Slow response from {url}, sending hedged request...")
+        tasks.add(_get_json_task(http, url))
+    error = None
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()  # The slower request is no longer needed
+    raise error
+
+def _cache_path(name):
+    return os.path.join(FEED_CACHE_DIR, f"{name}.json")
+
+def save_cached_payload(name, payload):
+    """Keep the last good payload on disk so a later run can fall back to it"""
+    try:
+        os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+        tmp_path = _cache_path(name) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'fetched_at': datetime.now(timezone.utc).isoformat(), 'payload': payload}, f)
+        os.replace(tmp_path, _cache_path(name))
+    except OSError as e:
+        print(f"⚠️ Could not cache {name} feed: {e}")
+
+def load_cached_payload(name, max_age_hours=FEED_MAX_STALE_HOURS):
+    """Return (payload, fetched_at) for a recent cached payload, or (None, None)"""
+    try:
+        with open(_cache_path(name)) as f:
+            cached = json.load(f)
+        fetched_at = datetime.fromisoformat(cached['fetched_at'])
+    except (OSError, ValueError, KeyError):
+        return None, None
+    age_hours = (datetime.now(timezone.utc) - fetched_at).total_seconds() / 3600
+    if age_hours > max_age_hours:
+        return None, None
+    return cached['payload'], fetched_at
+
+async def fetch_feed_async(http, name, url):
+    """Fetch a feed through its circuit breaker.
+
+    Returns (payload, stale_since) where stale_since is None for live data or the
+    fetch time of the cached payload used instead. Raises FeedUnavailable when the
+    feed is down and nothing recent is cached.
+    """
+    breaker = get_breaker(name)
+    error = None
+    if breaker.allow_request():
+        for attempt in range(1, FEED_ATTEMPTS + 1):
+            try:
+                payload = await hedged_get_json(http, url)
+                breaker.record_success()
+                save_cached_payload(name, payload)
+                return payload, None
+            except Exception as e:
+                error = e
+                print(f"  ⚠️ {name} feed attempt {attempt}/{FEED_ATTEMPTS} failed: {e}")
+                if attempt < FEED_ATTEMPTS:
+                    await asyncio.sleep(FEED_RETRY_DELAY)
+        breaker.record_failure()
+    else:
+        error = f"circuit open after {breaker.consecutive_failures} failures"
+        print(f"  ⛔ Skipping {name} feed - {error}")
+
+    payload, fetched_at = load_cached_payload(name)
+    if payload is None:
+        raise FeedUnavailable(f"{name} feed unavailable ({error}) and no recent cached copy")
+    print(f"  🗄️ Using cached {name} data from {fetched_at:%Y-%m-%d %H:%M} UTC")
+    return payload, fetched_at
+
+def fetch_feed(name, url):
+    """Synchronous fetch_feed_async() for callers outside an event loop"""
+    return run_sync(fetch_feed_async, name, url)
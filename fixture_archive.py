@@ -0,0 +1,169 @@
+# fixture_archive.py
+import json
+import mmap
+import os
+import struct
+import zlib
+from datetime import date
+
+# Set to an archive path to record every live feed payload a run fetches
+FIXTURE_ARCHIVE_RECORD = os.environ.get('FIXTURE_ARCHIVE_RECORD')
+
+FEEDS = ('mlb', 'umpire', 'betting')
+MAGIC = b'MLBSLATES1'
+# Archive layout: zlib-compressed JSON payloads back to back, then a JSON index of
+# {date: {feed: [offset, length]}}, then the footer: index offset (uint64) + MAGIC
+FOOTER = struct.Struct('<Q')
+FOOTER_SIZE = FOOTER.size + len(MAGIC)
+
+# Appends leave the index they superseded behind; the file is rewritten once that much dead
+# space outgrows the live payloads
+COMPACT_RATIO = 1.0
+SCAN_CHUNK = 1 << 20
+
+def _index_at(read, end):
+    # The index whose footer ends at end, or None if there is no intact footer there
+    if end < FOOTER_SIZE:
+        return None
+    footer = read(end - FOOTER_SIZE, FOOTER_SIZE)
+    if footer[FOOTER.size:] != MAGIC:
+        return None
+    (index_offset,) = FOOTER.unpack_from(footer)
+    if index_offset > end - FOOTER_SIZE:
+        return None
+    try:
+        return index_offset, json.loads(read(index_offset, end - FOOTER_SIZE - index_offset))
+    except ValueError:
+        return None
+
+def _read_index(read, size, path):
+    """(index offset, index, end) given read(offset, length) over an archive of size bytes.
+
+    end is where the last intact footer finishes - normally size. An append cut short by
+    a crash leaves a torn tail, and then the last complete footer before it is used.
+    """
+    end = size
+    found = _index_at(read, end)
+    position = size
+    while found is None and position > 0:
+        # Scan back a chunk at a time; chunks overlap so a footer split across two is seen
+        start = max(0, position - SCAN_CHUNK)
+        chunk = read(start, min(size, position + len(MAGIC) - 1) - start)
+        limit = len(chunk)
+        while found is None:
+            at = chunk.rfind(MAGIC, 0, limit)
+            if at < 0:
+                break
+            end = start + at + len(MAGIC)
+            found = _index_at(read, end)
+            limit = at + len(MAGIC) - 1
+        position = start
+    if found is None:
+        raise ValueError(f"{path} is not a slate archive")
+    return found[0], found[1], end
+
+class SlateArchive:
+    """Recorded daily feed payloads in one memory-mapped file, indexed by date.
+
+    Opening reads only the index; a payload is decompressed from its slice of the map
+    when asked for, so replaying thousands of slates never loads the whole archive.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, self.index, _ = _read_index(lambda offset, length: self._map[offset:offset + length], len(self._map), path)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, game_date):
+        return game_date.isoformat() in self.index
+
+    def dates(self):
+        return [date.fromisoformat(day) for day in sorted(self.index)]
+
+    def payload(self, game_date, feed):
+        """The feed's payload as it was fetched that day, or None if it was not recorded"""
+        entry = self.index.get(game_date.isoformat(), {}).get(feed)
+        if entry is None:
+            return None
+        offset, length = entry
+        return json.loads(zlib.decompress(self._map[offset:offset + length]))
+
+def append_payloads(path, game_date, payloads):
+    """Add {feed: payload} for one date to the archive at path, creating it if needed.
+
+    The new payloads, index and footer go after the current footer and are synced before
+    anything else changes, so the archive stays readable through a crash or a full disk.
+    A feed already recorded for that date is replaced in the index (its old bytes stay
+    in the file until the next compaction). Not safe while a SlateArchive has the same
+    file open.
+    """
+    exists = os.path.exists(path)
+    if not exists:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'r+b' if exists else 'w+b') as f:
+        index, end = {}, 0
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            def read(offset, length):
+                f.seek(offset)
+                return f.read(length)
+            _, index, end = _read_index(read, size, path)
+        f.seek(end)
+        try:
+            day = index.setdefault(game_date.isoformat(), {})
+            for feed, payload in payloads.items():
+                blob = zlib.compress(json.dumps(payload, separators=(',', ':')).encode())
+                day[feed] = [f.tell(), len(blob)]
+                f.write(blob)
+            index_offset = f.tell()
+            f.write(json.dumps(index, sort_keys=True).encode())
+            f.write(FOOTER.pack(index_offset) + MAGIC)
+            f.truncate()  # Anything a crashed append left past the old footer
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.truncate(end)  # The old footer is the last one again
+            raise
+    live = sum(length for feeds in index.values() for _, length in feeds.values())
+    if index_offset - live > COMPACT_RATIO * live:
+        compact(path)
+
+def compact(path):
+    """Rewrite the archive with only the payloads its index points at, replacing it atomically"""
+    with SlateArchive(path) as archive:
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            index = {}
+            for day, feeds in sorted(archive.index.items()):
+                for feed, (offset, length) in sorted(feeds.items()):
+                    index.setdefault(day, {})[feed] = [f.tell(), length]
+                    f.write(archive._map[offset:offset + length])
+            index_offset = f.tell()
+            f.write(json.dumps(index, sort_keys=True).encode())
+            f.write(FOOTER.pack(index_offset) + MAGIC)
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def record_payload(name, payload, game_date, path=FIXTURE_ARCHIVE_RECORD):
+    """Archive one live feed payload when recording is switched on"""
+    if not path:
+        return
+    try:
+        append_payloads(path, game_date, {name: payload})
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not record {name} payload: {e}")
@@ -0,0 +1,154 @@
+# generation.py
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+# Models to try in order: the primary first, then cheaper/faster fallbacks
+GENERATION_MODELS = tuple(model.strip() for model in os.environ.get('GENERATION_MODELS', 'gpt-4o,gpt-4o-mini').split(',') if model.strip())
+# Hard ceiling for one post, across every attempt and fallback
+GENERATION_DEADLINE = float(os.environ.get('GENERATION_DEADLINE', '240'))
+# Share of the deadline the primary model gets before the next model is tried
+GENERATION_PRIMARY_SHARE = float(os.environ.get('GENERATION_PRIMARY_SHARE', '0.6'))
+# Hedge delay until enough completions have been timed to estimate a p95
+GENERATION_HEDGE_DELAY = float(os.environ.get('GENERATION_HEDGE_DELAY', '75'))
+GENERATION_HEDGE_PERCENTILE = 95
+GENERATION_LOG = os.environ.get('GENERATION_LOG', os.path.join('.cache', 'generations.jsonl'))
+
+class GenerationFailed(Exception):
+    """Raised when no model produced a completion within the deadline"""
+
+class LatencyTracker:
+    """Recent completion latencies per model, used to decide when to hedge"""
+
+    def __init__(self, window=50, min_samples=5):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+
+    def record(self, model, seconds):
+        if model not in self._samples:
+            self._samples[model] = deque(maxlen=self.window)
+        self._samples[model].append(seconds)
+
+    def percentile(self, model, percent):
+        """Nearest-rank percentile of recent latencies, or None with too few samples"""
+        samples = sorted(self._samples.get(model, ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = max(0, -(-percent * len(samples) // 100) - 1)
+        return samples[int(rank)]
+
+    def hedge_delay(self, model, default=GENERATION_HEDGE_DELAY):
+        return self.percentile(model, GENERATION_HEDGE_PERCENTILE) or default
+
+# Shared for the life of the process so later runs start from measured latencies
+LATENCIES = LatencyTracker()
+
+class GenerationResult:
+    """A completion plus which model produced it and how"""
+    __slots__ = ('text', 'model', 'latency', 'hedged', 'fallback')
+
+    def __init__(self, text, model, latency, hedged=False, fallback=False):
+        self.text = text
+        self.model = model
+        self.latency = latency
+        self.hedged = hedged
+        self.fallback = fallback
+
+    def describe(self):
+        notes = [note for note, flag in (('fallback', self.fallback), ('hedged', self.hedged)) if flag]
+        return f"{self.model} in {self.latency:.1f}s" + (f" ({', '.join(notes)})" if notes else '')
+
+class GenerationDispatcher:
+    """Chat completions with a deadline, p95-based hedging and model fallback.
+
+    Each model gets a slice of the remaining deadline. If its first request is slower
+    than that model's recent p95, an identical second request is raced against it; if
+    both fail or the slice runs out, the next model in the list is tried.
+    """
+
+    def __init__(self, openai_client, models=GENERATION_MODELS, deadline=GENERATION_DEADLINE,
+                 primary_share=GENERATION_PRIMARY_SHARE, latencies=LATENCIES, clock=time.monotonic):
+        # The dispatcher does its own retrying, so the client must not retry behind its back
+        self.client = openai_client.with_options(max_retries=0)
+        self.models = models
+        self.deadline = deadline
+        self.primary_share = primary_share
+        self.latencies = latencies
+        self.clock = clock
+
+    async def _complete(self, model, messages, timeout, params):
+        started = self.clock()
+        response = await self.client.chat.completions.create(model=model, messages=messages, timeout=timeout, **params)
+        text = response.choices[0].message.content
+        if not text:
+            raise ValueError(f"{model} returned an empty completion")
+        self.latencies.record(model, self.clock() - started)
+        return text
+
+    async def _hedged_complete(self, model, messages, budget, params):
+        """(text, hedged) from the first of up to two identical requests to finish within budget"""
+        started = self.clock()
+        tasks = {asyncio.ensure_future(self._complete(model, messages, budget, params))}
+        hedge_delay = self.latencies.hedge_delay(model)
+        hedged = False
+        done, _ = await asyncio.wait(tasks, timeout=min(hedge_delay, budget))
+        if not done and hedge_delay < budget:
+            print(f"  🐢 {model} slower than its p95 ({hedge_delay:.1f}s), sending hedged request...")
+            tasks.add(asyncio.ensure_future(self._complete(model, messages, budget - hedge_delay, params)))
+            hedged = True
+        error = None
+        try:
+            while tasks:
+                remaining = budget - (self.clock() - started)
+                done, tasks = await asyncio.wait(tasks, timeout=max(0.0, remaining), return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise TimeoutError(f"no completion within {budget:.0f}s")
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), hedged
+                    error = task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()  # The losing request is no longer needed
+        raise error
+
+    async def generate(self, messages, **params):
+        """GenerationResult from the first model to succeed; raises GenerationFailed"""
+        started = self.clock()
+        errors = []
+        for index, model in enumerate(self.models):
+            remaining = self.deadline - (self.clock() - started)
+            if remaining <= 1:
+                break
+            is_last = index == len(self.models) - 1
+            budget = remaining if is_last else remaining * (self.primary_share if index == 0 else 0.5)
+            try:
+                text, hedged = await self._hedged_complete(model, messages, budget, params)
+            except Exception as e:
+                errors.append(f"{model}: {e}")
+                print(f"  ⚠️ {model} failed: {e}" + ("" if is_last else " - falling back"))
+                continue
+            return GenerationResult(text, model, self.clock() - started, hedged, fallback=index > 0)
+        raise GenerationFailed('; '.join(errors) or f"deadline of {self.deadline:.0f}s used up")
+
+def log_generation(topic, target_name, result, path=GENERATION_LOG):
+    """Append which model wrote a post to the generation log (one JSON object per line)"""
+    entry = {
+        'at': datetime.now(timezone.utc).isoformat(),
+        'topic': topic,
+        'target': target_name,
+        'model': result.model,
+        'latency': round(result.latency, 2),
+        'hedged': result.hedged,
+        'fallback': result.fallback
+    }
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+    except OSError as e:
+        print(f"⚠️ Could not write generation log: {e}")
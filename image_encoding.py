@@ -0,0 +1,101 @@
+# image_encoding.py
+from io import SEEK_CUR, SEEK_END, SEEK_SET, BytesIO, RawIOBase
+from PIL import Image
+
+CONTENT_TYPES = {'PNG': 'image/png', 'WEBP': 'image/webp'}
+EXTENSIONS = {'PNG': 'png', 'WEBP': 'webp'}
+WEBP_QUALITY = 85
+
+class EncodedImage:
+    """Encoded image bytes ready for upload, plus how much the encoder saved"""
+    __slots__ = ('data', 'format', 'original_size')
+
+    def __init__(self, data, format, original_size):
+        self.data = data
+        self.format = format
+        self.original_size = original_size
+
+    @property
+    def content_type(self):
+        # An original kept as-is may be in any format Pillow reads (e.g. JPEG)
+        return CONTENT_TYPES.get(self.format) or Image.MIME.get(self.format, 'application/octet-stream')
+
+    @property
+    def extension(self):
+        return EXTENSIONS.get(self.format) or self.format.lower()
+
+    @property
+    def saved_bytes(self):
+        return self.original_size - len(self.data)
+
+    def describe(self):
+        percent = 100 * self.saved_bytes / self.original_size if self.original_size else 0
+        return f"{self.original_size // 1024} KB → {len(self.data) // 1024} KB {self.format} ({percent:.0f}% saved)"
+
+class _BufferReader(RawIOBase):
+    # Seekable read-only file over a buffer, so decoding reads the caller's bytes in place
+    # (BytesIO would copy a bytearray or memoryview before the first read)
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast('B')
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = max(0, min(len(buffer), len(self._view) - self._position))
+        buffer[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset, whence=SEEK_SET):
+        base = {SEEK_SET: 0, SEEK_CUR: self._position, SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+def _encode_png_palette(image, max_colors):
+    # Flat-colour charts survive palette reduction; antialiased edges are the only casualty
+    if image.mode == 'RGBA' and image.getextrema()[3][0] == 255:
+        image = image.convert('RGB')  # Fully opaque - drop the alpha channel first
+    paletted = image.quantize(colors=max_colors, method=Image.Quantize.FASTOCTREE)
+    buffer = BytesIO()
+    paletted.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+def _encode_webp(image):
+    buffer = BytesIO()
+    image.save(buffer, format='WEBP', quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+def optimize_image(data, formats=('PNG', 'WEBP'), max_colors=256):
+    """Re-encode rendered image bytes as the smallest of the allowed formats.
+
+    PNG output is palette-quantized, and re-encoding drops metadata chunks (e.g. the
+    matplotlib 'Software' text). Falls back to the original bytes if nothing is smaller
+    or the input cannot be decoded.
+    """
+    original_size = memoryview(data).nbytes
+    try:
+        with Image.open(_BufferReader(data)) as source:
+            original_format = source.format
+            image = source.convert('RGBA')
+        candidates = []
+        if 'PNG' in formats:
+            candidates.append(EncodedImage(_encode_png_palette(image, max_colors), 'PNG', original_size))
+        if 'WEBP' in formats:
+            candidates.append(EncodedImage(_encode_webp(image), 'WEBP', original_size))
+    except Exception as e:
+        print(f"⚠️ Image optimization skipped: {e}")
+        return EncodedImage(bytes(data), 'PNG', original_size)
+
+    best = min(candidates, key=lambda encoded: len(encoded.data), default=None)
+    if best is None or (len(best.data) >= original_size and original_format in formats):
+        return EncodedImage(bytes(data), original_format, original_size)
+    return best
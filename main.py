@@ -1,15 +1,26 @@
 import os
+import argparse
 import random
-import json
 import re
 import time
+import asyncio
 import hashlib
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import partial
 from io import BytesIO
-import requests
-from PIL import Image, ImageDraw, ImageFont
-from openai import OpenAI
+from openai import AsyncOpenAI
+from async_http import AsyncHttpClient, run_sync
+from blog_prompts import TEMPLATE_VARIANTS, get_prompt_builder
+from generation import GenerationDispatcher, GenerationResult, log_generation
+from post_validator import GameStats, PostContract, section_repair_request, splice_sections, validate_post
+from publish_targets import DEFAULT_SITE_URL, load_publish_targets
 from mlb_data_fetcher import MLBDataFetcher
+from post_scheduler import PostScheduler
+from team_logos import download_logos_async, warm_logo_cache
+from cover_images import CoverUploadIndex, get_cover_image_url_async
+from image_encoding import optimize_image
+from webflow_items import WEBFLOW_ITEMS, game_date_for, post_slug
+from stage_profiler import PROFILE_DIR, measure, profiled, profiling, stage
 import matplotlib
 matplotlib.use('Agg')  # Set backend for headless servers
 import matplotlib.pyplot as plt
@@ -17,23 +28,28 @@ import matplotlib.pyplot as plt
 # Configuration from environment variables
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
 WEBFLOW_API_TOKEN = os.environ.get('WEBFLOW_API_TOKEN')
-WEBFLOW_SITE_ID = os.environ.get('WEBFLOW_SITE_ID')
-WEBFLOW_COLLECTION_ID = os.environ.get('WEBFLOW_COLLECTION_ID')
 
 # Validate required environment variables
 required_vars = {
     'OPENAI_API_KEY': OPENAI_API_KEY,
-    'WEBFLOW_API_TOKEN': WEBFLOW_API_TOKEN,
-    'WEBFLOW_SITE_ID': WEBFLOW_SITE_ID,
-    'WEBFLOW_COLLECTION_ID': WEBFLOW_COLLECTION_ID
+    'WEBFLOW_API_TOKEN': WEBFLOW_API_TOKEN
 }
 
 for var_name, var_value in required_vars.items():
     if not var_value:
         raise ValueError(f"{var_name} environment variable is required")
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Every site that receives the day's posts; the first one also hosts the shared images
+PUBLISH_TARGETS = load_publish_targets()
+PRIMARY_TARGET = PUBLISH_TARGETS[0]
+
+for target in PUBLISH_TARGETS:
+    if not target.site_id or not target.collection_id:
+        raise ValueError(f"WEBFLOW_SITE_ID and WEBFLOW_COLLECTION_ID are required (target '{target.name}')")
+
+# OpenAI clients hold a connection pool tied to one event loop, so each run opens its own
+def open_openai_client():
+    return AsyncOpenAI(api_key=OPENAI_API_KEY)
 
 # Webflow API headers
 WEBFLOW_HEADERS = {
@@ -42,99 +58,6 @@ WEBFLOW_HEADERS = {
     'Content-Type': 'application/json'
 }
 
-# ==================== MLB TEAM LOGOS ====================
-TEAM_LOGOS = {
-    'NYY': 'nyy', 'Yankees': 'nyy',
-    'TOR': 'tor', 'Blue Jays': 'tor',
-    'BOS': 'bos', 'Red Sox': 'bos',
-    'LAD': 'lad', 'Dodgers': 'lad',
-    'SF': 'sf', 'Giants': 'sf',
-    'HOU': 'hou', 'Astros': 'hou',
-    'ATL': 'atl', 'Braves': 'atl',
-    'NYM': 'nym', 'Mets': 'nym',
-    'PHI': 'phi', 'Phillies': 'phi',
-    'WSN': 'wsh', 'WSH': 'wsh', 'Nationals': 'wsh',
-    'MIA': 'mia', 'Marlins': 'mia',
-    'CHC': 'chc', 'Cubs': 'chc',
-    'MIL': 'mil', 'Brewers': 'mil',
-    'STL': 'stl', 'Cardinals': 'stl',
-    'CIN': 'cin', 'Reds': 'cin',
-    'PIT': 'pit', 'Pirates': 'pit',
-    'LAA': 'laa', 'Angels': 'laa',
-    'SEA': 'sea', 'Mariners': 'sea',
-    'TEX': 'tex', 'Rangers': 'tex',
-    'OAK': 'oak', 'Athletics': 'oak',
-    'MIN': 'min', 'Twins': 'min',
-    'CWS': 'chw', 'White Sox': 'chw',
-    'CLE': 'cle', 'Guardians': 'cle',
-    'DET': 'det', 'Tigers': 'det',
-    'KC': 'kc', 'Royals': 'kc',
-    'TB': 'tb', 'Rays': 'tb',
-    'BAL': 'bal', 'Orioles': 'bal',
-    'COL': 'col', 'Rockies': 'col',
-    'ARI': 'ari', 'Diamondbacks': 'ari',
-    'SD': 'sd', 'Padres': 'sd'
-}
-
-def get_team_logo_url(team_name):
-    """Get official team logo URL from ESPN"""
-    team_clean = team_name.strip().upper()
-    
-    team_mappings = {
-        'YANKEES': 'nyy', 'NEW YORK YANKEES': 'nyy',
-        'BLUE JAYS': 'tor', 'TORONTO BLUE JAYS': 'tor', 'TORONTO': 'tor',
-        'RED SOX': 'bos', 'BOSTON RED SOX': 'bos', 'BOSTON': 'bos',
-        'DODGERS': 'lad', 'LOS ANGELES DODGERS': 'lad',
-        'GIANTS': 'sf', 'SAN FRANCISCO GIANTS': 'sf',
-        'ASTROS': 'hou', 'HOUSTON ASTROS': 'hou',
-        'BRAVES': 'atl', 'ATLANTA BRAVES': 'atl',
-        'METS': 'nym', 'NEW YORK METS': 'nym',
-        'PHILLIES': 'phi', 'PHILADELPHIA PHILLIES': 'phi',
-        'NATIONALS': 'wsh', 'WASHINGTON NATIONALS': 'wsh',
-        'MARLINS': 'mia', 'MIAMI MARLINS': 'mia',
-        'CUBS': 'chc', 'CHICAGO CUBS': 'chc',
-        'BREWERS': 'mil', 'MILWAUKEE BREWERS': 'mil',
-        'CARDINALS': 'stl', 'ST LOUIS CARDINALS': 'stl',
-        'REDS': 'cin', 'CINCINNATI REDS': 'cin',
-        'PIRATES': 'pit', 'PITTSBURGH PIRATES': 'pit',
-        'ANGELS': 'laa', 'LOS ANGELES ANGELS': 'laa',
-        'MARINERS': 'sea', 'SEATTLE MARINERS': 'sea',
-        'RANGERS': 'tex', 'TEXAS RANGERS': 'tex',
-        'ATHLETICS': 'oak', 'OAKLAND ATHLETICS': 'oak',
-        'TWINS': 'min', 'MINNESOTA TWINS': 'min',
-        'WHITE SOX': 'chw', 'CHICAGO WHITE SOX': 'chw',
-        'GUARDIANS': 'cle', 'CLEVELAND GUARDIANS': 'cle',
-        'TIGERS': 'det', 'DETROIT TIGERS': 'det',
-        'ROYALS': 'kc', 'KANSAS CITY ROYALS': 'kc',
-        'RAYS': 'tb', 'TAMPA BAY RAYS': 'tb',
-        'ORIOLES': 'bal', 'BALTIMORE ORIOLES': 'bal',
-        'ROCKIES': 'col', 'COLORADO ROCKIES': 'col',
-        'DIAMONDBACKS': 'ari', 'ARIZONA DIAMONDBACKS': 'ari',
-        'PADRES': 'sd', 'SAN DIEGO PADRES': 'sd'
-    }
-    
-    # Try exact match first
-    if team_clean in TEAM_LOGOS:
-        team_code = TEAM_LOGOS[team_clean]
-        return f"https://a.espncdn.com/i/teamlogos/mlb/500/{team_code}.png"
-    
-    # Try team name mappings
-    if team_clean in team_mappings:
-        team_code = team_mappings[team_clean]
-        return f"https://a.espncdn.com/i/teamlogos/mlb/500/{team_code}.png"
-    
-    # Try partial matches
-    for key, code in TEAM_LOGOS.items():
-        if key in team_clean or team_clean in key:
-            return f"https://a.espncdn.com/i/teamlogos/mlb/500/{code}.png"
-    
-    for name, code in team_mappings.items():
-        if name in team_clean or team_clean in name:
-            return f"https://a.espncdn.com/i/teamlogos/mlb/500/{code}.png"
-    
-    print(f"⚠️  No logo match found for: {team_name}")
-    return "https://a.espncdn.com/i/teamlogos/mlb/500/mlb.png"
-
 # ==================== AUTHOR ROTATION ====================
 AUTHORS = [
     {
@@ -155,14 +78,23 @@ AUTHORS = [
     }
 ]
 
+def authors_for(target):
+    """The target's author pool (every author when the target does not name any)"""
+    return [author for author in AUTHORS if not target.authors or author['name'] in target.authors]
+
+for target in PUBLISH_TARGETS:
+    unknown_authors = set(target.authors) - {author['name'] for author in AUTHORS}
+    if unknown_authors:
+        raise ValueError(f"Unknown authors for target '{target.name}': {', '.join(sorted(unknown_authors))}")
+
 # ==================== WEBFLOW INTEGRATION ====================
-def test_webflow_connection():
+async def test_webflow_connection_async(http, target=PRIMARY_TARGET):
     """Test Webflow API connection and site access"""
     try:
         # Test site access
-        print(f"  Testing Site ID: {WEBFLOW_SITE_ID}")
-        response = requests.get(
-            f'https://api.webflow.com/v2/sites/{WEBFLOW_SITE_ID}',
+        print(f"  Testing Site ID: {target.site_id}")
+        response = await http.get(
+            f'https://api.webflow.com/v2/sites/{target.site_id}',
             headers=WEBFLOW_HEADERS,
             timeout=30
         )
@@ -172,9 +104,9 @@ def test_webflow_connection():
             print(f"✅ Site access verified: {site_data.get('displayName', 'Unknown')}")
             
             # Test collection access
-            print(f"  Testing Collection ID: {WEBFLOW_COLLECTION_ID}")
-            collection_response = requests.get(
-                f'https://api.webflow.com/v2/collections/{WEBFLOW_COLLECTION_ID}',
+            print(f"  Testing Collection ID: {target.collection_id}")
+            collection_response = await http.get(
+                f'https://api.webflow.com/v2/collections/{target.collection_id}',
                 headers=WEBFLOW_HEADERS,
                 timeout=30
             )
@@ -186,7 +118,7 @@ def test_webflow_connection():
             else:
                 print(f"❌ Collection access failed: {collection_response.status_code}")
                 print(f"   Response: {collection_response.text}")
-                print(f"   Your Collection ID '{WEBFLOW_COLLECTION_ID}' may be incorrect")
+                print(f"   Your Collection ID '{target.collection_id}' may be incorrect")
                 return False
         else:
             print(f"❌ Site access failed: {response.status_code} - {response.text}")
@@ -196,18 +128,56 @@ def test_webflow_connection():
         print(f"❌ Error testing Webflow connection: {e}")
         return False
 
-def upload_image_to_webflow(image_buffer, filename):
-    """Upload image to Webflow assets using the two-step process"""
-    import hashlib
+def test_webflow_connection(target=PRIMARY_TARGET):
+    return run_sync(test_webflow_connection_async, target)
+
+class MultipartStream:
+    """multipart/form-data body that streams the file part straight from a memoryview.
+    
+    aiohttp sends async iterables in blocks, and with an explicit Content-Length header
+    (S3 rejects chunked uploads) the image bytes are never copied into a combined body.
+    """
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, fields, file_field, filename, content_type, file_view):
+        self.boundary = f"----mlbblog{os.urandom(12).hex()}"
+        preamble = ''.join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            for name, value in fields.items()
+        )
+        preamble += (
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        )
+        self._parts = [memoryview(preamble.encode()), file_view, memoryview(f'\r\n--{self.boundary}--\r\n'.encode())]
+        self._length = sum(part.nbytes for part in self._parts)
+    
+    @property
+    def content_type(self):
+        return f'multipart/form-data; boundary={self.boundary}'
+    
+    def __len__(self):
+        return self._length
+    
+    async def __aiter__(self):
+        for part in self._parts:
+            for start in range(0, part.nbytes, self.CHUNK_SIZE):
+                yield part[start:start + self.CHUNK_SIZE]
+
+@stage('upload')
+async def upload_image_to_webflow_async(http, image_buffer, filename, content_type='image/png', target=PRIMARY_TARGET):
+    """Upload image to Webflow assets using the two-step process.
     
+    image_buffer may be a BytesIO or any bytes-like object; it is hashed and uploaded
+    through a memoryview without copying.
+    """
     try:
         # Step 1: Calculate MD5 hash
-        image_buffer.seek(0)
-        file_content = image_buffer.read()
-        file_hash = hashlib.md5(file_content).hexdigest()
-        image_buffer.seek(0)
+        image_view = image_buffer.getbuffer() if isinstance(image_buffer, BytesIO) else memoryview(image_buffer)
+        file_hash = hashlib.md5(image_view).hexdigest()
         
-        print(f"  📊 File hash: {file_hash}, Size: {len(file_content)} bytes")
+        print(f"  📊 File hash: {file_hash}, Size: {image_view.nbytes} bytes")
         
         # Step 2: Create asset metadata to get upload URL
         metadata_payload = {
@@ -216,8 +186,8 @@ def upload_image_to_webflow(image_buffer, filename):
             "originUrl": None
         }
         
-        response = requests.post(
-            f'https://api.webflow.com/v2/sites/{WEBFLOW_SITE_ID}/assets',
+        response = await http.post(
+            f'https://api.webflow.com/v2/sites/{target.site_id}/assets',
             headers=WEBFLOW_HEADERS,
             json=metadata_payload,
             timeout=30
@@ -246,17 +216,14 @@ def upload_image_to_webflow(image_buffer, filename):
             return None
         
         # Step 3: Upload file to S3 using the provided URL and details
-        upload_headers = {}
-        files = {'file': (filename, image_buffer, 'image/png')}
-        
-        # Add any required fields from upload_details
-        upload_data = upload_details.copy() if upload_details else {}
+        # (policy fields from upload_details must come before the file part)
+        body = MultipartStream(upload_details or {}, 'file', filename, content_type, image_view)
+        upload_headers = {'Content-Type': body.content_type, 'Content-Length': str(len(body))}
         
-        s3_response = requests.post(
+        s3_response = await http.post(
             upload_url,
             headers=upload_headers,
-            files=files,
-            data=upload_data,
+            data=body,
             timeout=60
         )
         
@@ -273,6 +240,9 @@ def upload_image_to_webflow(image_buffer, filename):
         print(f"❌ Error uploading image to Webflow: {e}")
         return None
 
+def upload_image_to_webflow(image_buffer, filename, content_type='image/png', target=PRIMARY_TARGET):
+    return run_sync(upload_image_to_webflow_async, image_buffer, filename, content_type, target)
+
 def markdown_to_webflow_rich_text(markdown_content):
     """Convert markdown to Webflow-compatible HTML"""
     # Basic markdown to HTML conversion
@@ -308,12 +278,14 @@ def markdown_to_webflow_rich_text(markdown_content):
     
     return html
 
-def create_webflow_post(game_data, blog_content, cover_image_url):
-    """Create a new post in Webflow CMS"""
+@stage('post')
+async def create_webflow_post_async(http, game_topic, blog_content, cover_image_url, target=PRIMARY_TARGET, item_index=WEBFLOW_ITEMS):
+    """Create the game's post in the target's Webflow CMS collection, or update it in place
+    if the item index shows an earlier run already created it"""
     try:
         # Extract title from blog content
         lines = blog_content.strip().split('\n')
-        title = lines[0].replace('#', '').strip() if lines else f"{game_data['matchup']} Preview"
+        title = lines[0].replace('#', '').strip() if lines else f"{game_topic.matchup} Preview"
         
         # Create post summary (first paragraph, max 160 chars)
         summary = ""
@@ -323,14 +295,14 @@ def create_webflow_post(game_data, blog_content, cover_image_url):
                 break
         
         # Create SEO meta description with keywords
-        away_team = game_data.get('away_team', '')
-        home_team = game_data.get('home_team', '')
-        meta_desc = f"Expert {away_team} vs {home_team} betting preview with pitcher analysis, lineup matchups, and prop recommendations. {datetime.now().strftime('%B %d')} MLB betting insights."
+        away_team = game_topic.away_team
+        home_team = game_topic.home_team
+        meta_desc = f"Expert {away_team} vs {home_team} betting preview with pitcher analysis, lineup matchups, and prop recommendations. {game_date_for(game_topic):%B %d} MLB betting insights."
         if len(meta_desc) > 250:
             meta_desc = meta_desc[:247] + "..."
         
         # Add author rotation for EEAT
-        author = random.choice(AUTHORS)
+        author = random.choice(authors_for(target))
         author_block = f"""<p><strong>Written by:</strong> {author['name']}</p>
 <p>{author['bio']}</p><br>"""
         
@@ -356,30 +328,53 @@ def create_webflow_post(game_data, blog_content, cover_image_url):
                 "post-body": rich_text_content,
                 "post-summary": summary,
                 "main-image": cover_image_url,
-                "url": "https://www.thebettinginsider.com/betting/about",
+                "url": f"{target.site_url}/betting/about",
                 "meta-title": title,
-                "meta-description": meta_desc
+                "meta-description": meta_desc,
+                # Stable per game, so a rerun updates the same item instead of duplicating it
+                "slug": post_slug(game_topic)
             }
         }
+        slug = webflow_data["fieldData"]["slug"]
+        collection_id = target.collection_id
+        items_url = f'https://api.webflow.com/v2/collections/{collection_id}/items'
+        
+        # Lists the collection the first time only; afterwards the index is kept up to date locally
+        try:
+            await item_index.sync(http, collection_id, WEBFLOW_HEADERS)
+        except Exception as e:
+            print(f"  ⚠️ Could not index existing Webflow items ({e}) - relying on the slug to catch duplicates")
         
-        print(f"  📝 Creating post: {title}")
         print(f"  🖼️ Cover image: {cover_image_url}")
         print(f"  ✍️ Author: {author['name']}")
         
-        # Create the post
-        response = requests.post(
-            f'https://api.webflow.com/v2/collections/{WEBFLOW_COLLECTION_ID}/items',
-            headers=WEBFLOW_HEADERS,
-            json=webflow_data,
-            timeout=30
-        )
+        for resynced in (False, True):
+            item_id = item_index.item_id(collection_id, slug)
+            if item_id:
+                print(f"  📝 Updating post on {target.name}: {title}")
+                response = await http.request('PATCH', f'{items_url}/{item_id}', headers=WEBFLOW_HEADERS, json=webflow_data, timeout=30)
+                if response.status_code == 404:
+                    # Deleted in Webflow since it was indexed - create it afresh
+                    item_index.forget(collection_id, slug)
+                    continue
+                action = 'Updated'
+            else:
+                print(f"  📝 Creating post on {target.name}: {title}")
+                response = await http.post(items_url, headers=WEBFLOW_HEADERS, json=webflow_data, timeout=30)
+                if response.status_code in (400, 409) and 'slug' in response.text.lower() and not resynced:
+                    # Created by another process or by hand since the index was built
+                    await item_index.sync(http, collection_id, WEBFLOW_HEADERS, force=True)
+                    continue
+                action = 'Created'
+            break
         
-        if response.status_code == 202:  # Webflow returns 202 for successful creation
+        if response.status_code in (200, 202):  # 202 for a creation, 200 for an update
             post_data = response.json()
-            print(f"  ✅ Created Webflow post: {title}")
+            item_index.record(collection_id, slug, post_data.get('id', item_id), game_topic.matchup, game_date_for(game_topic))
+            print(f"  ✅ {action} Webflow post: {title}")
             return post_data
         else:
-            print(f"  ❌ Failed to create Webflow post: {response.status_code}")
+            print(f"  ❌ Failed to create or update Webflow post: {response.status_code}")
             print(f"     Response: {response.text}")
             return None
             
@@ -387,25 +382,26 @@ def create_webflow_post(game_data, blog_content, cover_image_url):
         print(f"❌ Error creating Webflow post: {e}")
         return None
 
-def publish_webflow_site():
-    """Publish the Webflow site to make posts live"""
+def create_webflow_post(game_topic, blog_content, cover_image_url, target=PRIMARY_TARGET, item_index=WEBFLOW_ITEMS):
+    return run_sync(create_webflow_post_async, game_topic, blog_content, cover_image_url, target, item_index)
+
+# Webflow allows one site publish per minute
+PUBLISH_MIN_INTERVAL = 60
+
+@stage('publish')
+async def publish_webflow_site_async(http, target=PRIMARY_TARGET):
+    """Publish the target's Webflow site to make posts live"""
     try:
-        print("  🌐 Publishing Webflow site...")
-        
-        # IMPORTANT: Webflow has a 1 publish per minute rate limit
-        time.sleep(3)  # Extra buffer for rate limiting
+        print(f"  🌐 Publishing Webflow site {target.name}...")
         
         # Correct API format per Webflow v2 documentation
         publish_payload = {
-            "customDomains": [
-                "67e2e299d35c6ac356b6d8d4",  # thebettinginsider.com
-                "67e2e299d35c6ac356b6d8ca"   # www.thebettinginsider.com
-            ],
+            "customDomains": list(target.custom_domains),
             "publishToWebflowSubdomain": True
         }
         
-        response = requests.post(
-            f'https://api.webflow.com/v2/sites/{WEBFLOW_SITE_ID}/publish',
+        response = await http.post(
+            f'https://api.webflow.com/v2/sites/{target.site_id}/publish',
             headers=WEBFLOW_HEADERS,
             json=publish_payload,
             timeout=90  # Longer timeout for publish
@@ -413,24 +409,26 @@ def publish_webflow_site():
         
         if response.status_code in [200, 202]:
             print("  ✅ Site published successfully!")
-            print("    • thebettinginsider.com")
-            print("    • www.thebettinginsider.com")
+            print(f"    • {len(target.custom_domains)} custom domain(s)")
             print("    • Webflow subdomain")
             return True
+        elif response.status_code == 429:
+            # Rate limited - a subdomain-only publish would be rejected too
+            print("  ⏳ Publish rate limit hit - will retry after the window")
+            return False
         else:
             print(f"  ❌ Publish failed: {response.status_code}")
             print(f"     Response: {response.text}")
             
             # If custom domains fail, try just the subdomain
             print("  🔄 Trying subdomain-only publish...")
-            time.sleep(3)  # Rate limit protection
             
             fallback_payload = {
                 "publishToWebflowSubdomain": True
             }
             
-            fallback_response = requests.post(
-                f'https://api.webflow.com/v2/sites/{WEBFLOW_SITE_ID}/publish',
+            fallback_response = await http.post(
+                f'https://api.webflow.com/v2/sites/{target.site_id}/publish',
                 headers=WEBFLOW_HEADERS,
                 json=fallback_payload,
                 timeout=90
@@ -449,103 +447,210 @@ def publish_webflow_site():
         print(f"❌ Error publishing site: {e}")
         return False
 
-def generate_pitch_mix_chart(pitcher_name, arsenal, save_path):
-    """Generate a pie chart showing pitcher's pitch mix"""
-    try:
-        if not arsenal:
-            print(f"⚠️ No arsenal data for {pitcher_name}")
-            return False
-        
-        # Parse arsenal data into pitch types and usage
-        pitch_data = []
-        labels = []
-        
-        # Arsenal is now a dictionary with pitch objects
-        if isinstance(arsenal, dict):
-            for pitch_type, pitch_info in arsenal.items():
-                try:
-                    # Extract usage rate and convert to percentage
-                    usage_rate = pitch_info.get('usage_rate', 0)
-                    usage_pct = usage_rate * 100  # Convert from decimal to percentage
-                    
-                    # Get pitch name and average speed
-                    pitch_name = pitch_info.get('name', pitch_type)
-                    avg_speed = pitch_info.get('avg_speed', 0)
-                    
-                    if usage_pct > 0:  # Only include pitches that are actually used
-                        pitch_data.append(usage_pct)
-                        labels.append(f"{pitch_name} ({usage_pct:.1f}%)")
-                        
-                except Exception as e:
-                    print(f"⚠️ Error parsing pitch {pitch_type}: {e}")
-                    continue
-        else:
-            # Fallback for string format (your original code)
-            if isinstance(arsenal, str):
-                # Split by semicolon and parse each pitch
-                pitches = [p.strip() for p in arsenal.split(';') if p.strip()]
-            else:
-                print(f"⚠️ Arsenal data for {pitcher_name} is not in expected format")
-                return False
-            
-            for pitch in pitches:
-                if '(' in pitch and '%' in pitch and 'usage' in pitch:
-                    try:
-                        # Extract pitch name and usage percentage
-                        pitch_name = pitch.split('(')[0].strip()
-                        
-                        # Find the usage percentage
-                        usage_match = re.search(r'(\d+(?:\.\d+)?)\s*%\s*usage', pitch)
-                        if usage_match:
-                            usage_pct = float(usage_match.group(1))
-                            
-                            pitch_data.append(usage_pct)
-                            labels.append(f"{pitch_name} ({usage_pct:.0f}%)")
-                    except Exception as e:
-                        print(f"⚠️ Error parsing pitch: {pitch} - {e}")
-                        continue
-        
-        if not pitch_data:
-            print(f"⚠️ Could not parse arsenal data for {pitcher_name}")
+def publish_webflow_site(target=PRIMARY_TARGET):
+    return run_sync(publish_webflow_site_async, target)
+
+class PublishCoordinator:
+    """Coalesces pending CMS changes into as few site publishes as the rate limit allows.
+    
+    Call mark_changed() after each new post and await maybe_publish() whenever convenient;
+    a publish happens as soon as the one-per-minute window is open. flush() waits out the
+    window so nothing is left unpublished at the end of a run. publish is an async callable,
+    e.g. partial(publish_webflow_site_async, http).
+    """
+    
+    def __init__(self, publish, min_interval=PUBLISH_MIN_INTERVAL, clock=time.monotonic, sleep=asyncio.sleep):
+        self.publish = publish
+        self.min_interval = min_interval
+        self.clock = clock
+        self.sleep = sleep
+        self.last_attempt_at = None
+        self.pending = 0
+        self.published = 0
+    
+    def mark_changed(self, count=1):
+        self.pending += count
+    
+    def seconds_until_allowed(self):
+        if self.last_attempt_at is None:
+            return 0.0
+        return max(0.0, self.min_interval - (self.clock() - self.last_attempt_at))
+    
+    async def maybe_publish(self):
+        """Publish pending changes if the rate window is open; never waits for the window"""
+        if not self.pending or self.seconds_until_allowed() > 0:
             return False
-        
+        return await self._publish()
+    
+    async def flush(self, max_attempts=2):
+        """Wait for the rate window and publish anything still pending"""
+        for _ in range(max_attempts):
+            if not self.pending:
+                return True
+            wait = self.seconds_until_allowed()
+            if wait > 0:
+                print(f"  ⏳ Waiting {wait:.0f}s for the publish rate window...")
+                await self.sleep(wait)
+            if await self._publish():
+                return True
+        return not self.pending
+    
+    async def _publish(self):
+        count = self.pending
+        print(f"\n🌊 Publishing {count} pending post{'s' if count != 1 else ''}...")
+        # Claim the window and the pending posts before awaiting, so posts finishing
+        # mid-publish wait for the next publish instead of starting a second one
+        self.last_attempt_at = self.clock()
+        self.pending -= count
+        if await self.publish():
+            self.last_attempt_at = self.clock()
+            self.published += count
+            return True
+        self.pending += count
+        return False
+
+# Chart output: 'separate' renders one pie per starter, 'combined' puts both on one sheet
+CHART_MODE = os.environ.get('CHART_MODE', 'separate')
+# 'auto' uploads whichever of palette PNG or WebP is smaller; 'png' or 'webp' forces one
+CHART_FORMAT = os.environ.get('CHART_FORMAT', 'auto')
+CHART_FORMATS = {'auto': ('PNG', 'WEBP'), 'png': ('PNG',), 'webp': ('WEBP',)}[CHART_FORMAT]
+# Combined sheets are re-rendered at lower resolution until the encoded sheet fits this many bytes
+CHART_MAX_BYTES = int(os.environ.get('CHART_MAX_BYTES', '250000'))
+CHART_SHEET_DPIS = (160, 120, 90)
+
+PITCH_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57', 
+                '#FF9F43', '#EE5A24', '#0ABDE3', '#10AC84', '#F79F1F']
+
+def draw_pitch_mix(ax, pitcher_name, arsenal):
+    """Draw one pitcher's pitch mix pie on ax. Returns the number of pitches drawn."""
+    if not arsenal:
+        print(f"⚠️ No arsenal data for {pitcher_name}")
+        return 0
+    
+    # Arsenal is already sorted by usage; only include pitches that are actually used
+    used = [i for i in range(len(arsenal)) if arsenal.usage[i] > 0]
+    pitch_data = [arsenal.usage[i] for i in used]
+    labels = [arsenal.names[i] for i in used]
+    usage_labels = iter([arsenal.usage_label(i) for i in used])
+    
+    if not pitch_data:
+        print(f"⚠️ Could not parse arsenal data for {pitcher_name}")
+        return 0
+    
+    wedges, texts, autotexts = ax.pie(
+        pitch_data,
+        labels=labels,
+        autopct=lambda pct: next(usage_labels),  # Same rounding as the blog prose
+        startangle=90,
+        colors=PITCH_COLORS[:len(pitch_data)]
+    )
+    
+    # Style the chart
+    ax.set_title(f'{pitcher_name} - Pitch Mix', fontsize=16, fontweight='bold', pad=20)
+    
+    # Make percentage text more readable
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+    
+    # Make labels more readable
+    for text in texts:
+        text.set_fontsize(10)
+    
+    return len(pitch_data)
+
+@stage('render')
+def generate_pitch_mix_chart(pitcher_name, arsenal):
+    """Render a pie chart of a pitcher's pitch mix into a PNG buffer (None if no arsenal)"""
+    try:
         # Create pie chart
         fig, ax = plt.subplots(figsize=(10, 8))
+        pitch_count = draw_pitch_mix(ax, pitcher_name, arsenal)
+        if not pitch_count:
+            plt.close(fig)
+            return None
         
-        # Color scheme
-        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57', 
-                 '#FF9F43', '#EE5A24', '#0ABDE3', '#10AC84', '#F79F1F']
-        
-        wedges, texts, autotexts = ax.pie(
-            pitch_data,
-            labels=labels,
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors[:len(pitch_data)]
-        )
-        
-        # Style the chart
-        ax.set_title(f'{pitcher_name} - Pitch Mix', fontsize=16, fontweight='bold', pad=20)
+        plt.tight_layout()
+        buffer = BytesIO()
+        plt.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
+        plt.close(fig)
         
-        # Make percentage text more readable
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
+        print(f"  ✅ Pitch mix chart rendered for {pitcher_name} ({pitch_count} pitches)")
+        return buffer
         
-        # Make labels more readable
-        for text in texts:
-            text.set_fontsize(10)
+    except Exception as e:
+        print(f"❌ Error creating pitch mix chart for {pitcher_name}: {e}")
+        plt.close('all')
+        return None
+
+@stage('render')
+def generate_pitch_mix_sheet(away_name, away_arsenal, home_name, home_arsenal, formats=CHART_FORMATS, max_bytes=CHART_MAX_BYTES):
+    """Render both starters' pitch mixes side by side within a size budget. Returns an EncodedImage or None."""
+    try:
+        fig, (away_ax, home_ax) = plt.subplots(1, 2, figsize=(14, 6))
+        drawn = draw_pitch_mix(away_ax, away_name, away_arsenal) + draw_pitch_mix(home_ax, home_name, home_arsenal)
+        if not drawn:
+            plt.close(fig)
+            return None
+        for ax in (away_ax, home_ax):
+            if not ax.patches:
+                ax.set_axis_off()
+        fig.tight_layout()
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        # Step down resolution until the encoded sheet fits the budget
+        for dpi in CHART_SHEET_DPIS:
+            buffer = BytesIO()
+            fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+            encoded = optimize_image(buffer.getbuffer(), formats)
+            if len(encoded.data) <= max_bytes:
+                break
+        plt.close(fig)
         
-        print(f"  ✅ Pitch mix chart saved: {save_path} ({len(pitch_data)} pitches)")
-        return True
+        budget_note = "" if len(encoded.data) <= max_bytes else f" - over {max_bytes // 1024} KB budget"
+        print(f"  ✅ Pitch mix sheet rendered at {dpi} dpi: {encoded.describe()}{budget_note}")
+        return encoded
         
     except Exception as e:
-        print(f"❌ Error creating pitch mix chart for {pitcher_name}: {e}")
-        return False
+        print(f"❌ Error creating pitch mix sheet for {away_name} vs {home_name}: {e}")
+        plt.close('all')
+        return None
+
+async def upload_pitch_mix_charts_async(http, mlb_fetcher, blog_topic):
+    """Render the starters' pitch mix charts, upload them and record the URLs on blog_topic"""
+    away_pitcher = blog_topic.away_pitcher
+    home_pitcher = blog_topic.home_pitcher
+    away_arsenal = mlb_fetcher.arsenal_store.get(away_pitcher.id)
+    home_arsenal = mlb_fetcher.arsenal_store.get(home_pitcher.id)
+    
+    timestamp = datetime.now().strftime('%Y%m%d-%H%M')
+    
+    if CHART_MODE == 'combined':
+        # One upload per game instead of two
+        encoded = generate_pitch_mix_sheet(away_pitcher.name, away_arsenal, home_pitcher.name, home_arsenal)
+        if encoded:
+            sheet_filename = f"{blog_topic.away_team.lower()}-at-{blog_topic.home_team.lower()}-pitch-mix-{timestamp}.{encoded.extension}"
+            blog_topic.pitch_mix_chart_url = await upload_image_to_webflow_async(http, encoded.data, sheet_filename, encoded.content_type)
+            if blog_topic.pitch_mix_chart_url:
+                print(f"  ✅ Uploaded pitch mix sheet: {blog_topic.pitch_mix_chart_url}")
+        return
+    
+    async def upload_chart(side, pitcher, encoded):
+        chart_filename = f"{pitcher.name.lower().replace(' ', '-')}-pitch-mix-{timestamp}.{encoded.extension}"
+        # Add chart URLs to the pitchers so they can be referenced in the blog
+        pitcher.chart_url = await upload_image_to_webflow_async(http, encoded.data, chart_filename, encoded.content_type)
+        if pitcher.chart_url:
+            print(f"  ✅ Uploaded {side} pitcher chart: {pitcher.chart_url}")
+    
+    # Render both charts first (pyplot is not thread-safe), then upload them together
+    uploads = []
+    for side, pitcher, arsenal in (('away', away_pitcher, away_arsenal), ('home', home_pitcher, home_arsenal)):
+        chart_buffer = generate_pitch_mix_chart(pitcher.name, arsenal)
+        if chart_buffer:
+            with measure('render'):
+                encoded = optimize_image(chart_buffer.getbuffer(), CHART_FORMATS)
+            print(f"  🗜️ Optimized {side} chart: {encoded.describe()}")
+            uploads.append(upload_chart(side, pitcher, encoded))
+    await asyncio.gather(*uploads)
 
 # ==================== INTERLINKING LOGIC ====================
 INTERLINK_MAP = {
@@ -580,7 +685,8 @@ INTERLINK_MAP = {
     "betting recommendation": "https://www.thebettinginsider.com/betting/about"
 }
 
-def auto_link_blog_content(blog_text, max_links=5):
+@stage('link')
+def auto_link_blog_content(blog_text, max_links=5, site_url=DEFAULT_SITE_URL):
     """Automatically insert internal links into blog content, but skip the title"""
     if not blog_text or max_links <= 0:
         return blog_text
@@ -613,7 +719,7 @@ def auto_link_blog_content(blog_text, max_links=5):
         if links_inserted >= max_links:
             break
             
-        url = INTERLINK_MAP[phrase]
+        url = INTERLINK_MAP[phrase].replace(DEFAULT_SITE_URL, site_url, 1)
         
         # Create regex pattern for whole word/phrase matching (case-insensitive)
         pattern = r'\b' + re.escape(phrase) + r'\b'
@@ -651,346 +757,346 @@ def auto_link_blog_content(blog_text, max_links=5):
         return modified_content
 
 # ==================== BLOG PROMPTS ====================
-def get_blog_headers():
-    """Generate randomized headers to avoid scaled content detection"""
-    return {
-        "intro": random.choice([
-            "Brief Intro", 
-            "Game Overview", 
-            "Matchup Setup",
-            "Today's Setup",
-            "Game Preview"
-        ]),
-        "pitchers": random.choice([
-            "Pitcher Breakdown", 
-            "Rotation Report", 
-            "Starting Pitching Analysis",
-            "Mound Matchup",
-            "Pitching Preview"
-        ]),
-        "lineups": random.choice([
-            "Lineup Matchups", 
-            "Batting Edges vs Arsenal", 
-            "Offensive Breakdown",
-            "Lineup Advantage vs Arsenal",
-            "Hitting Matchups"
-        ]),
-        "strikeouts": random.choice([
-            "Strikeout Trends", 
-            "K-Risk Analysis", 
-            "Whiff Outlook",
-            "Lineup Strikeout Trends vs Arsenal",
-            "Contact vs Strikeout Profile"
-        ]),
-        "umpire": random.choice([
-            "Umpire Impact", 
-            "Behind the Plate", 
-            "Umpire Trends",
-            "Umpire Influence",
-            "Plate Umpire Analysis"
-        ]),
-        "lean": random.choice([
-            "Final Lean & Takeaway", 
-            "Betting Breakdown", 
-            "Where the Edge Is",
-            "Betting Interpretation / Final Lean",
-            "Our Betting Take"
-        ])
-    }
-
-def get_mlb_blog_post_prompt(topic, keywords, game_data):
-    """Generate MLB blog prompt with randomized headers and SEO enhancements"""
-    
-    headers = get_blog_headers()
-    
-    # Create shorter, more SEO-friendly title
-    if ' at ' in topic:
-        teams = topic.replace(' MLB Betting Preview', '').split(' at ')
-        seo_title = f"{teams[0]} vs {teams[1]}: Betting Preview & Props ({datetime.now().strftime('%b %d')})"
-    else:
-        seo_title = topic.replace('MLB Betting Preview', 'Odds, Props & Analysis')
-    
-    prompt = f"""You're an expert MLB betting analyst and blog writer. You write sharp, stat-driven previews for baseball bettors.
-
-Based on the JSON game data below, write a 500–800 word blog post that follows this EXACT structure:
-
-# {seo_title}
-*Last updated: {datetime.now().strftime('%B %d, %Y')}*
-
-**Game Time:** [time from game_time field]
-
-## {headers['intro']}
-Set up the game in 2-3 sentences using the matchup and key angles from the data. Include the betting line information from the betting_info field in this intro section.
+for target in PUBLISH_TARGETS:
+    if target.template not in TEMPLATE_VARIANTS:
+        raise ValueError(f"Unknown template '{target.template}' for target '{target.name}'")
 
-## {headers['pitchers']}
-**Pitching Matchup:** [Away Pitcher] vs [Home Pitcher]
+def prompt_builder_for(game_topic, target=PRIMARY_TARGET):
+    """The target's prompt builder for the game's date, so a TBD game or a rerun after midnight keeps its title"""
+    return get_prompt_builder(target.template, target.site_url, game_date_for(game_topic))
 
-### [Away Pitcher Name] ([Away Team]):
-List ALL pitch types with EXACT usage percentages and velocities from away_pitcher.arsenal.
-Format: "Four-Seam Fastball (35% usage, 97.1 mph), Slider (18% usage, 87.0 mph), Splitter (14% usage, 84.7 mph)"
-Interpretation: What style of pitcher (velocity-heavy, pitch-mix artist, etc.)
-How their pitches match up: "The [Home Team] lineup averages .XXX this season with a projected xBA of .XXX vs [Away Pitcher]'s arsenal"
+def get_mlb_blog_post_prompt(game_topic, target=PRIMARY_TARGET, game_data=None):
+    """Generate MLB blog prompt with seeded headers and SEO enhancements"""
+    return prompt_builder_for(game_topic, target).build(game_topic, game_data)
 
-If away_pitcher_chart_url exists in game_data, add: ![Away Pitcher Pitch Mix Chart](away_pitcher_chart_url)
+@stage('prompt')
+def get_post_contract(game_topic, target=PRIMARY_TARGET, stats=None):
+    """Sections, CTA link and stat values the generated post is validated against"""
+    builder = prompt_builder_for(game_topic, target)
+    return PostContract(builder.section_headings(game_topic), builder.cta_url(), stats or GameStats.from_game_data(game_topic.game_data()))
 
-### [Home Pitcher Name] ([Home Team]):
-Same detailed structure: List ALL pitches with exact usage % and mph from home_pitcher.arsenal
-"The [Away Team] lineup averages .XXX this season with a projected xBA of .XXX vs [Home Pitcher]'s arsenal"
-
-If home_pitcher_chart_url exists in game_data, add: ![Home Pitcher Pitch Mix Chart](home_pitcher_chart_url)
-
-## {headers['lineups']}
-**Lineup Matchups & Batting Edges**
-
-For Away Team vs Home Pitcher:
-Compare team averages: "The [Away Team] lineup averages .XXX this season but projects to .XXX vs [Home Pitcher]'s arsenal"
-From away_key_performers, show:
-The batter with the BIGGEST INCREASE in xBA (if any)
-The batter with the BIGGEST DECREASE in xBA (if any)
-Format: Name: Season BA .XXX → xBA vs arsenal .XXX (+/- XX points), Season K% XX.X% → Arsenal K% XX.X% (+/- X.X%)
-Skip batters with minimal changes (under 15 point differences)
-
-For Home Team vs Away Pitcher:
-Same detailed structure using home_key_performers.
-Focus on biggest increase and biggest decrease only.
-
-## {headers['strikeouts']}
-**Strikeout Risks & Rewards**
-For each team:
-Use away_arsenal_k_pct vs away_season_k_pct and home_arsenal_k_pct vs home_season_k_pct.
-Format: "The [Team]'s projected K-rate is [X]% vs [Pitcher] — up/down [Y]% from their [Z]% season average."
-Interpretation: Higher = potential K prop value, Lower = potential contact play
-
-## {headers['umpire']}
-**Behind the Plate:** [Umpire Name]
-If umpire field is NOT "TBA" and umpire data exists:
-Show exact umpire name from umpire field
-Convert umpire_k_boost from multiplier to percentage: 1.11x = "+11% strikeouts"
-Convert umpire_bb_boost from multiplier to percentage: 1.03x = "+3% walks"
-IMPORTANT: Higher strikeouts = pitcher-friendly, Higher walks = hitter-friendly
-Classify correctly: If K% up and BB% up = "mixed tendencies", if K% up and BB% down = "pitcher-friendly", if K% down and BB% up = "hitter-friendly"
-If umpire field is "TBA" or missing:
-"Umpire assignment has not been announced, which makes prop volatility a concern."
-
-## **What to Bet On**
-
-Check ALL individual batters for prop opportunities. Go through every batter in away_key_performers and home_key_performers. BATTING LEAN CRITERIA: arsenal_ba > 0.300 AND (arsenal_ba - season_ba) > 0.020. If ANY batter meets BOTH criteria, create a prop alert like this:
-📢 **Prop Alert**: [Player Name] (.XXX → .XXX, +XX points) meets betting lean criteria!
+# ==================== BLOG GENERATION ====================
+BLOG_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a professional MLB betting analyst and blog writer who specializes in pitcher-batter matchups and umpire analysis. Write engaging, data-driven content for baseball fans and bettors. Always output in clean Markdown format with SEO enhancements."
+}
 
-Check team strikeout rates for pitcher props. Check away_arsenal_k_pct vs away_season_k_pct: If arsenal K% > 25% AND increase > 4%, lean OVER. Check home_arsenal_k_pct vs home_season_k_pct: If arsenal K% > 25% AND increase > 4%, lean OVER. If criteria met, create strikeout alert:
-⚡ **K Prop Alert**: [Pitcher Name] strikeout OVER - [Team]'s K-rate jumps to XX.X% vs this arsenal!
+@stage('prompt')
+def get_mlb_blog_post_messages(game_topic, target=PRIMARY_TARGET, game_data=None):
+    return [
+        BLOG_SYSTEM_MESSAGE,
+        {
+            "role": "user",
+            "content": get_mlb_blog_post_prompt(game_topic, target, game_data)
+        }
+    ]
 
-If NO criteria met: No significant statistical edges meet our betting threshold in this matchup.
+@stage('generate')
+async def generate_mlb_blog_post_async(generator, game_topic, target=PRIMARY_TARGET, game_data=None):
+    """Generate MLB-specific blog post using game data, in the target's template variant.
+    
+    generator is a GenerationDispatcher; returns its GenerationResult (text plus the model used).
+    """
+    return await generator.generate(
+        messages=get_mlb_blog_post_messages(game_topic, target, game_data),
+        max_tokens=4096,
+        temperature=0.7
+    )
 
-## 🔑 Key Takeaways
-Create 3-4 bullet points summarizing the main insights:
-- Key player advantages/disadvantages
-- Pitcher prop opportunities (or lack thereof)
-- Umpire impact assessment
-- Overall betting recommendation
+# 'single' writes each post in one completion; 'sections' writes its sections concurrently
+# from small prompts and renders the opening, FAQs and CTA locally
+GENERATION_MODE = os.environ.get('GENERATION_MODE', 'single')
+if GENERATION_MODE not in ('single', 'sections'):
+    raise ValueError(f"Unknown GENERATION_MODE '{GENERATION_MODE}' (expected 'single' or 'sections')")
 
-## 🧠 FAQs
+@stage('generate')
+async def generate_mlb_blog_post_sections_async(generator, game_topic, target=PRIMARY_TARGET):
+    """Generate the post section by section, all sections at once, and stitch them in template order.
+    
+    Returns one GenerationResult for the whole post: latency is the wall time for all
+    sections, and hedged/fallback are set if any section needed them.
+    """
+    builder = prompt_builder_for(game_topic, target)
+    with measure('prompt'):
+        section_prompts = builder.section_prompts(game_topic)
+    started = time.monotonic()
+    results = await asyncio.gather(*(
+        generator.generate(
+            messages=[BLOG_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            max_tokens=1024,
+            temperature=0.7
+        )
+        for _, prompt in section_prompts
+    ))
+    blog_post = builder.assemble(game_topic, {section: result.text for (section, _), result in zip(section_prompts, results)})
+    models = sorted({result.model for result in results}, key=[result.model for result in results].index)
+    return GenerationResult(
+        blog_post, '+'.join(models), time.monotonic() - started,
+        hedged=any(result.hedged for result in results),
+        fallback=any(result.fallback for result in results)
+    )
 
-**Q: Who is the best betting prop for the [Away Team] vs [Home Team] game?**
-A: [Answer based on your analysis - mention specific player if criteria met, or "No players meet our strict betting criteria" if none qualify]
+# Follow-up rounds that rewrite only the sections that failed validation
+MAX_SECTION_REPAIRS = int(os.environ.get('MAX_SECTION_REPAIRS', '2'))
 
-**Q: Is [Umpire Name] a pitcher-friendly umpire?**
-A: [Answer based on umpire data - "Slightly pitcher-friendly with +X% strikeouts" or "Mixed tendencies" or "TBA" if unknown]
+@stage('generate')
+async def repair_blog_post_async(generator, game_topic, target, game_data, blog_post, contract, validation):
+    """Regenerate only the failing sections of a post until it validates.
+    
+    Each round asks for every failing section at once, as follow-ups to the original
+    prompt and post, and splices the rewrites in. Returns (post, validation).
+    """
+    messages = get_mlb_blog_post_messages(game_topic, target, game_data)
+    for round_number in range(1, MAX_SECTION_REPAIRS + 1):
+        sections = validation.failing_sections()
+        print(f"  🩹 Repairing {', '.join(sections)} (round {round_number}): {validation.summary()}")
+        results = await asyncio.gather(*(
+            generator.generate(
+                messages=messages + [
+                    {"role": "assistant", "content": blog_post},
+                    {"role": "user", "content": section_repair_request(contract, validation, section)}
+                ],
+                max_tokens=1500,
+                temperature=0.4
+            )
+            for section in sections
+        ))
+        blog_post = splice_sections(blog_post, validation, contract, {section: result.text for section, result in zip(sections, results)})
+        validation = validate_post(blog_post, contract)
+        if validation.ok:
+            break
+    return blog_post, validation
 
-**Q: What time is the [Away Team] vs [Home Team] game?**
-A: [Game time from game_time field]
+def generate_mlb_blog_post(game_topic, target=PRIMARY_TARGET):
+    async def generate():
+        async with open_openai_client() as openai_client:
+            return (await generate_mlb_blog_post_async(GenerationDispatcher(openai_client), game_topic, target)).text
+    return asyncio.run(generate())
 
----
+# ==================== MAIN BLOG GENERATION LOGIC ====================
+# Posts should be live this long before first pitch; earlier deadlines are generated first
+PUBLISH_LEAD_MINUTES = int(os.environ.get('PUBLISH_LEAD_MINUTES', '90'))
+MAX_POST_ATTEMPTS = int(os.environ.get('MAX_POST_ATTEMPTS', '2'))
+# Games in flight at once; every network call is awaited on the one event loop
+POST_CONCURRENCY = int(os.environ.get('POST_CONCURRENCY', '4'))
+# Shared cover used when a matchup cover cannot be rendered or uploaded
+DEFAULT_COVER_IMAGE_URL = "https://cdn.prod.website-files.com/670bfa1fd9c3c20a149fa6a7/686db7197585374b9a2b81a7_test.png"
 
-**Want more of our best props and betting analysis? Click below and join insider bets!**
-
-[See all our best bets daily!](https://www.thebettinginsider.com/betting/about)
-
-CRITICAL RULES:
-1. Use ONLY the JSON data provided below - NO external stats or guessing
-2. If data is missing, say "data not available" rather than inventing
-3. Convert all multipliers (1.15x) to percentages (+15%)
-4. Focus on the biggest statistical edges from the data
-5. Keep tone sharp and analytical, avoid generic phrases
-6. ALWAYS include exact pitch usage percentages and velocities from arsenal data
-7. Show exact season BA vs projected xBA for all lineup comparisons
-8. Only highlight batters with biggest increases AND biggest decreases (skip minimal changes)
-9. Apply strict betting criteria - don't suggest weak leans
-10. Remember: walks help hitters, strikeouts help pitchers
-11. NEVER suggest a batter lean unless xBA > 0.300 AND boost > +20 points
-12. NEVER suggest a strikeout prop unless K% > 25% AND increase > 4%
-13. Use the prop alert boxes (>) for any qualifying recommendations
-14. OUTPUT MUST BE VALID MARKDOWN - USE # ## ### HEADERS, NOT HTML
-15. ALWAYS include the CTA and daily roundup link at the end
-
-Blog Title: {seo_title}
-Target Keywords: {keywords}
-
-Game Data (JSON):
-{game_data}
-"""
+async def publish_to_target_async(http, generator, blog_topic, cover_image_url, target, game_data=None, stats=None):
+    """Write, validate and create one target's post from the shared game data and images"""
+    # Generate blog post with SEO enhancements
+    print(f"  🤖 Generating {target.name} blog post...")
+    if GENERATION_MODE == 'sections':
+        generation = await generate_mlb_blog_post_sections_async(generator, blog_topic, target)
+    else:
+        generation = await generate_mlb_blog_post_async(generator, blog_topic, target, game_data)
+    blog_post = generation.text
+    print(f"  ✅ Generated {target.name} blog post ({len(blog_post)} characters) with {generation.describe()}")
+    log_generation(blog_topic.topic, target.name, generation)
+    
+    # Check structure and stats locally; a bad post is fixed section by section. One that
+    # still fails after MAX_SECTION_REPAIRS rounds is published anyway, with a warning, so
+    # the game is not left without a post
+    contract = get_post_contract(blog_topic, target, stats)
+    validation = validate_post(blog_post, contract)
+    if not validation.ok:
+        blog_post, validation = await repair_blog_post_async(generator, blog_topic, target, game_data, blog_post, contract, validation)
+        if validation.ok:
+            print(f"  ✅ Repaired {target.name} blog post")
+        else:
+            print(f"  ⚠️ {target.name} post still fails validation after {MAX_SECTION_REPAIRS} repair rounds, publishing it anyway: {validation.summary()}")
+    
+    # Add internal links
+    blog_post_with_links = auto_link_blog_content(blog_post, site_url=target.site_url)
+    
+    # Create Webflow CMS post (cover image is required)
+    print(f"  📤 Creating Webflow CMS post on {target.name}...")
+    webflow_post = await create_webflow_post_async(http, blog_topic, blog_post_with_links, cover_image_url, target)
     
-    return prompt
+    if webflow_post:
+        print(f"  ✅ Successfully created Webflow post on {target.name}")
+    else:
+        print(f"  ❌ Failed to create Webflow post on {target.name}")
+    
+    return webflow_post is not None
 
-# ==================== BLOG GENERATION ====================
-def generate_mlb_blog_post(topic, keywords, game_data):
-    """Generate MLB-specific blog post using game data"""
-    prompt = get_mlb_blog_post_prompt(topic, keywords, game_data)
-    
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a professional MLB betting analyst and blog writer who specializes in pitcher-batter matchups and umpire analysis. Write engaging, data-driven content for baseball fans and bettors. Always output in clean Markdown format with SEO enhancements."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        max_tokens=4096,
-        temperature=0.7
-    )
+async def process_blog_topic_async(http, generator, mlb_fetcher, blog_topic, cover_index=None, targets=PUBLISH_TARGETS):
+    """Chart, cover and create the game's post on every target. Returns the targets that got it.
+    
+    Charts and the cover are rendered and uploaded once, to the primary site, and every
+    target's post links to the same hosted images.
+    """
+    topic = blog_topic.topic
+    
+    try:
+        # Charts come first so their URLs are in the game data the post is written from
+        # (a retry keeps the charts uploaded on the first attempt)
+        if not (blog_topic.away_pitcher.chart_url or blog_topic.home_pitcher.chart_url or blog_topic.pitch_mix_chart_url):
+            print("  📊 Generating and uploading pitch mix charts...")
+            await upload_pitch_mix_charts_async(http, mlb_fetcher, blog_topic)
+        
+        # Per-game matchup cover, falling back to the shared custom image (Webflow requires one)
+        print("  🖼️ Building matchup cover image...")
+        cover_image_url = await profiled('render', get_cover_image_url_async(blog_topic, partial(upload_image_to_webflow_async, http), cover_index))
+        if cover_image_url:
+            print(f"  ✅ Using matchup cover: {cover_image_url}")
+        else:
+            cover_image_url = DEFAULT_COVER_IMAGE_URL
+            print(f"  ✅ Using custom image: {cover_image_url}")
+    except Exception as e:
+        print(f"  ❌ Error processing {topic}: {e}")
+        return []
     
-    return response.choices[0].message.content
+    # Game JSON is the bulk of prompt assembly; every target's prompt embeds the same copy
+    game_data = blog_topic.to_json()
+    stats = GameStats.from_game_data(game_data)
+    results = await asyncio.gather(
+        *(publish_to_target_async(http, generator, blog_topic, cover_image_url, target, game_data, stats) for target in targets),
+        return_exceptions=True
+    )
+    published = []
+    for target, result in zip(targets, results):
+        if isinstance(result, Exception):
+            print(f"  ❌ Error processing {topic} for {target.name}: {result}")
+        elif result:
+            published.append(target)
+    return published
 
-# ==================== MAIN BLOG GENERATION LOGIC ====================
-def generate_and_publish_daily_blogs():
-    """Generate all blogs for today and publish to Webflow"""
-    print(f"🚀 Starting daily blog generation and Webflow publishing at {datetime.now()}")
+def process_blog_topic(mlb_fetcher, blog_topic, cover_index=None, targets=PUBLISH_TARGETS):
+    async def process(http):
+        async with open_openai_client() as openai_client:
+            return await process_blog_topic_async(http, GenerationDispatcher(openai_client), mlb_fetcher, blog_topic, cover_index, targets)
+    return run_sync(process)
+
+def publish_coordinators(http, targets=PUBLISH_TARGETS):
+    return {target.name: PublishCoordinator(partial(publish_webflow_site_async, http, target)) for target in targets}
+
+async def publish_slate_async(http, generator, targets=PUBLISH_TARGETS, matchups=None, publishers=None, mlb_fetcher=None, publish=True):
+    """Generate all blogs for today, most urgent first, and publish to every target as posts complete.
     
-    mlb_fetcher = MLBDataFetcher()
-    blog_topics = mlb_fetcher.get_blog_topics_from_games()
+    The feeds are fetched and the images rendered once per run however many sites are
+    published to; only the post text is written per target. matchups ('AWY @ HOM')
+    limits the run to those games. publishers ({target name: PublishCoordinator}) carries
+    the publish rate windows over from earlier runs in the same process. mlb_fetcher
+    replaces the live fetcher (e.g. a shard worker's replay of the coordinator's feeds),
+    and publish=False only creates the posts, leaving the site publish to the caller.
+    Returns the number of posts created.
+    """
+    mlb_fetcher = mlb_fetcher or MLBDataFetcher()
+    blog_topics = await mlb_fetcher.get_blog_topics_from_games_async(http)
+    if matchups is not None:
+        wanted = {matchup.upper() for matchup in matchups}
+        blog_topics = [blog_topic for blog_topic in blog_topics if blog_topic.matchup.upper() in wanted]
     
     if not blog_topics:
         print("❌ No games available for blog generation")
-        return
+        return 0
     
     print(f"🔄 Found {len(blog_topics)} games for today")
     
+    scheduler = PostScheduler(
+        lead_time=timedelta(minutes=PUBLISH_LEAD_MINUTES),
+        max_attempts=MAX_POST_ATTEMPTS
+    )
+    for blog_topic in blog_topics:
+        scheduler.add(blog_topic)
+    
+    # Publish rate limits are per site, so each target gets its own coordinator
+    if publishers is None:
+        publishers = publish_coordinators(http, targets)
+    # Targets each game still needs a post on; a retry only revisits the ones that failed.
+    # Keyed per game, as a doubleheader's two games share a matchup and topic
+    remaining_targets = {(blog_topic.matchup, blog_topic.game_number): list(targets) for blog_topic in blog_topics}
+    cover_index = CoverUploadIndex()
+    team_names = [team for t in blog_topics for team in (t.away_team, t.home_team)]
+    await download_logos_async(http, team_names)
+    warm_logo_cache(team_names)
     successful_posts = 0
+    processed = 0
     
-    for i, blog_topic in enumerate(blog_topics, 1):
-        topic = blog_topic['topic']
-        keywords = blog_topic['keywords']
-        game_data = blog_topic['game_data']
-        
-        print(f"\n📝 Processing game {i}/{len(blog_topics)}: {game_data['matchup']}")
-        
-        try:
-            # Generate blog post with SEO enhancements
-            print("  🤖 Generating blog post with GPT-4...")
-            blog_post = generate_mlb_blog_post(topic, keywords, game_data)
-            print(f"  ✅ Generated blog post ({len(blog_post)} characters)")
-            
-            # Add internal links
-            print("  🔗 Adding internal links...")
-            blog_post_with_links = auto_link_blog_content(blog_post)
-            print("  ✅ Internal links added")
-            
-            # Use the custom image for all posts since cover images aren't showing up
-            print("  🖼️ Using custom cover image...")
-            cover_image_url = "https://cdn.prod.website-files.com/670bfa1fd9c3c20a149fa6a7/686db7197585374b9a2b81a7_test.png"
-            print(f"  ✅ Using custom image: {cover_image_url}")
-            
-            # Generate pitch mix charts and upload them to Webflow
-            print("  📊 Generating and uploading pitch mix charts...")
-            away_pitcher = game_data.get('away_pitcher', {})
-            home_pitcher = game_data.get('home_pitcher', {})
-            
-            # Save charts to game directory
-            game_directory = f"temp_charts_{i}"
-            if not os.path.exists(game_directory):
-                os.makedirs(game_directory)
-            
-            away_chart_path = os.path.join(game_directory, "pitch_mix_away.png")
-            home_chart_path = os.path.join(game_directory, "pitch_mix_home.png")
-            
-            away_chart_url = None
-            home_chart_url = None
+    async def post_worker():
+        nonlocal successful_posts, processed
+        # Each worker takes the most urgent game left, so deadline order is kept
+        while scheduler:
+            blog_topic, attempt = scheduler.pop()
+            processed += 1
             
-            # Generate and upload away pitcher chart
-            if generate_pitch_mix_chart(
-                away_pitcher.get('name', 'Away Pitcher'), 
-                away_pitcher.get('arsenal', ''), 
-                away_chart_path
-            ):
-                with open(away_chart_path, 'rb') as f:
-                    chart_buffer = BytesIO(f.read())
-                away_chart_filename = f"{away_pitcher.get('name', 'away').lower().replace(' ', '-')}-pitch-mix-{datetime.now().strftime('%Y%m%d-%H%M')}.png"
-                away_chart_url = upload_image_to_webflow(chart_buffer, away_chart_filename)
-                if away_chart_url:
-                    print(f"  ✅ Uploaded away pitcher chart: {away_chart_url}")
-            
-            # Generate and upload home pitcher chart
-            if generate_pitch_mix_chart(
-                home_pitcher.get('name', 'Home Pitcher'), 
-                home_pitcher.get('arsenal', ''), 
-                home_chart_path
-            ):
-                with open(home_chart_path, 'rb') as f:
-                    chart_buffer = BytesIO(f.read())
-                home_chart_filename = f"{home_pitcher.get('name', 'home').lower().replace(' ', '-')}-pitch-mix-{datetime.now().strftime('%Y%m%d-%H%M')}.png"
-                home_chart_url = upload_image_to_webflow(chart_buffer, home_chart_filename)
-                if home_chart_url:
-                    print(f"  ✅ Uploaded home pitcher chart: {home_chart_url}")
-            
-            # Add chart URLs to game_data so they can be referenced in the blog
-            game_data['away_pitcher_chart_url'] = away_chart_url
-            game_data['home_pitcher_chart_url'] = home_chart_url
-            
-            # Webflow requires a cover image, so we must have one
-            if not cover_image_url:
-                print("  ❌ No cover image available - skipping this post")
+            if scheduler.has_started(blog_topic):
+                print(f"\n⏭️ Skipping {blog_topic.matchup} - game already started ({blog_topic.game_time})")
                 continue
             
-            # Create Webflow CMS post (cover image is required)
-            print("  📤 Creating Webflow CMS post...")
-            webflow_post = create_webflow_post(game_data, blog_post_with_links, cover_image_url)
+            deadline = scheduler.deadline_for(blog_topic)
+            deadline_note = f"due {deadline.strftime('%I:%M %p %Z')}" if deadline else "no start time"
+            attempt_note = f", retry {attempt - 1}" if attempt > 1 else ""
+            print(f"\n📝 Processing game {processed}: {blog_topic.matchup} ({deadline_note}{attempt_note})")
             
-            if webflow_post:
+            pending_targets = remaining_targets[blog_topic.matchup, blog_topic.game_number]
+            for target in await process_blog_topic_async(http, generator, mlb_fetcher, blog_topic, cover_index, pending_targets):
+                pending_targets.remove(target)
                 successful_posts += 1
-                print(f"  ✅ Successfully published to Webflow")
-            else:
-                print(f"  ❌ Failed to create Webflow post")
+                publishers[target.name].mark_changed()
             
-            # Clean up temp directory
-            try:
-                import shutil
-                shutil.rmtree(game_directory)
-            except:
-                pass
+            if pending_targets and scheduler.retry(blog_topic, attempt):
+                print(f"  🔁 Re-queued {blog_topic.matchup} ahead of later games")
+            elif pending_targets:
+                print(f"  ❌ Giving up on {blog_topic.matchup} after {attempt} attempts")
             
-            # Small delay between posts to avoid rate limits
-            time.sleep(1)
+            # Publish as soon as the rate window allows so early games go live in waves
+            if publish:
+                await asyncio.gather(*(publisher.maybe_publish() for publisher in publishers.values()))
             
-        except Exception as e:
-            print(f"  ❌ Error processing {topic}: {e}")
-            continue
-    
-    # Publish the site to make all posts live
-    if successful_posts > 0:
-        print(f"\n🌐 Publishing Webflow site with {successful_posts} new posts...")
-        if publish_webflow_site():
-            print(f"🎉 Successfully published {successful_posts} blog posts to Webflow!")
-        else:
-            print(f"⚠️ Posts created but site publish failed - check Webflow dashboard")
-            print("   You may need to manually publish the site in Webflow")
-    else:
+            # Small delay between posts to avoid rate limits
+            await asyncio.sleep(1)
+    
+    await asyncio.gather(*(post_worker() for _ in range(max(1, min(POST_CONCURRENCY, len(scheduler))))))
+    
+    # Publish whatever is still pending to make all posts live
+    if successful_posts == 0:
         print("❌ No posts were successfully created")
+        return 0
+    if not publish:
+        print(f"✅ Created {successful_posts} blog posts (site publish left to the caller)")
+        return successful_posts
+    flushed = await asyncio.gather(*(publisher.flush() for publisher in publishers.values()))
+    if all(flushed):
+        print(f"🎉 Successfully published {successful_posts} blog posts to Webflow!")
+    else:
+        for name, publisher in publishers.items():
+            if publisher.pending:
+                print(f"⚠️ {publisher.pending} posts created on {name} but site publish failed - check Webflow dashboard")
+        print("   You may need to manually publish the site in Webflow")
+    return successful_posts
+
+async def generate_and_publish_daily_blogs_async(targets=PUBLISH_TARGETS):
+    """One cold run: open the HTTP and OpenAI clients, publish today's slate and close them"""
+    print(f"🚀 Starting daily blog generation and Webflow publishing at {datetime.now()}")
+    print(f"🎯 Publishing to {len(targets)} site{'s' if len(targets) != 1 else ''}: {', '.join(t.name for t in targets)}")
+    
+    async with AsyncHttpClient() as http, open_openai_client() as openai_client:
+        return await publish_slate_async(http, GenerationDispatcher(openai_client), targets)
+
+def generate_and_publish_daily_blogs(profile_dir=PROFILE_DIR):
+    """Run the day's pipeline; with profile_dir, each stage's CPU and memory profile is written there"""
+    with profiling(profile_dir):
+        asyncio.run(generate_and_publish_daily_blogs_async())
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="MLB Blog Generator - Webflow Edition")
+    parser.add_argument('--profile', nargs='?', const=os.path.join('.cache', 'profiles'), default=PROFILE_DIR, metavar='DIR',
+                        help="profile every pipeline stage and write the reports under DIR (default .cache/profiles)")
+    args = parser.parse_args()
+    
     print("🏟️ MLB Blog Generator - Webflow Edition")
     
     # Test Webflow connection first
     print("🔗 Testing Webflow API connection...")
-    if not test_webflow_connection():
-        print("❌ Webflow connection failed. Check your Site ID and API token.")
-        print(f"   Site ID: {WEBFLOW_SITE_ID}")
-        print(f"   Token starts with: {WEBFLOW_API_TOKEN[:20]}...")
-        exit(1)
+    for target in PUBLISH_TARGETS:
+        if not test_webflow_connection(target):
+            print(f"❌ Webflow connection failed for {target.name}. Check your Site ID and API token.")
+            print(f"   Site ID: {target.site_id}")
+            print(f"   Token starts with: {WEBFLOW_API_TOKEN[:20]}...")
+            exit(1)
     
     print("🔄 Generating and publishing blogs...")
-    generate_and_publish_daily_blogs()
+    generate_and_publish_daily_blogs(args.profile)
     print("✅ Blog generation complete!")
@@ -0,0 +1,235 @@
+# matchup_store.py
+import json
+import math
+import os
+from datetime import date
+import numpy as np
+
+MATCHUP_STORE_DIR = os.environ.get('MATCHUP_STORE_DIR', os.path.join('.cache', 'matchups'))
+
+# One flat file per column, appended a day at a time and memory-mapped for queries
+COLUMNS = {
+    'day': np.int32,          # date.toordinal()
+    'batter': np.int32,       # Index into the batter names
+    'pitcher': np.int32,      # Index into the pitcher names
+    'reliability': np.int8,   # RELIABILITY code
+    'season_ba': np.float32,
+    'arsenal_ba': np.float32,
+    'season_k': np.float32,
+    'arsenal_k': np.float32,
+}
+RELIABILITY = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2}
+UNKNOWN_RELIABILITY = -1
+
+class MatchupRows:
+    """Query result: one numpy array per column, plus name lookups for the id columns"""
+    __slots__ = ('columns', 'batter_names', 'pitcher_names')
+
+    def __init__(self, columns, batter_names, pitcher_names):
+        self.columns = columns
+        self.batter_names = batter_names
+        self.pitcher_names = pitcher_names
+
+    def __len__(self):
+        return len(self.columns['day'])
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    @property
+    def ba_diff(self):
+        return self.columns['arsenal_ba'] - self.columns['season_ba']
+
+    @property
+    def k_diff(self):
+        return self.columns['arsenal_k'] - self.columns['season_k']
+
+    def dates(self):
+        return [date.fromordinal(int(day)) for day in self.columns['day']]
+
+    def to_dicts(self):
+        """Rows as dicts, for printing or JSON"""
+        rows = []
+        for i in range(len(self)):
+            rows.append({
+                'date': date.fromordinal(int(self.columns['day'][i])).isoformat(),
+                'batter': self.batter_names[self.columns['batter'][i]],
+                'pitcher': self.pitcher_names[self.columns['pitcher'][i]],
+                'season_ba': float(self.columns['season_ba'][i]),
+                'arsenal_ba': float(self.columns['arsenal_ba'][i]),
+                'season_k': float(self.columns['season_k'][i]),
+                'arsenal_k': float(self.columns['arsenal_k'][i]),
+            })
+        return rows
+
+class MatchupStore:
+    """Every day's key_matchups rows in a columnar store, appended a day at a time.
+
+    Rows are kept in date order, so a date range is a binary search on the day column;
+    batter and pitcher lookups go through a sorted row index built on first use.
+    Names are stored as given by the feed ("Last, First"). A backfilled day is spliced in
+    by writing the columns out as a new generation of files, which index.json switches
+    to in one atomic replace, so a crash never leaves the index and columns out of step.
+    """
+
+    def __init__(self, path=MATCHUP_STORE_DIR):
+        self.path = path
+        try:
+            with open(self._index_path()) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {'rows': 0, 'days': {}, 'batters': [], 'pitchers': []}
+        self.generation = index.get('generation', 0)  # Suffix of the column files in use
+        self.rows = index['rows']
+        self.days = index['days']  # ISO date -> [first row, end row)
+        self.batter_names = index['batters']
+        self.pitcher_names = index['pitchers']
+        self._batter_ids = {name: i for i, name in enumerate(self.batter_names)}
+        self._pitcher_ids = {name: i for i, name in enumerate(self.pitcher_names)}
+        self._columns = None
+        self._postings = {}
+
+    def _index_path(self):
+        return os.path.join(self.path, 'index.json')
+
+    def _column_path(self, column, generation=None):
+        generation = self.generation if generation is None else generation
+        return os.path.join(self.path, f"{column}.bin" if not generation else f"{column}.{generation}.bin")
+
+    def _save_index(self):
+        tmp_path = self._index_path() + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'rows': self.rows, 'days': self.days, 'batters': self.batter_names, 'pitchers': self.pitcher_names,
+                'generation': self.generation
+            }, f)
+        os.replace(tmp_path, self._index_path())
+
+    def _id(self, ids, names, name):
+        if name not in ids:
+            ids[name] = len(names)
+            names.append(name)
+        return ids[name]
+
+    def append_day(self, game_date, mlb_reports):
+        """Add a day's key_matchups rows; returns the number of rows written.
+
+        Appending a stored day again replaces it (a rerun picks up late lineup changes).
+        A day older than the latest (a backfill) is spliced in at its place in date
+        order, which rewrites the rows of every later day.
+        """
+        day = game_date.isoformat()
+        if day in self.days:
+            first_row, tail_row = self.days[day]
+        else:
+            # Rows of the days after this one start where it goes
+            first_row = tail_row = min((start for other, (start, _) in self.days.items() if other > day), default=self.rows)
+
+        values = {column: [] for column in COLUMNS}
+        for report in mlb_reports:
+            for matchup in report.get('key_matchups', []):
+                baseline = matchup.get('baseline_stats') or {}
+                values['batter'].append(self._id(self._batter_ids, self.batter_names, matchup.get('batter', 'Unknown')))
+                values['pitcher'].append(self._id(self._pitcher_ids, self.pitcher_names, matchup.get('vs_pitcher', 'Unknown')))
+                values['reliability'].append(RELIABILITY.get(str(matchup.get('reliability', '')).upper(), UNKNOWN_RELIABILITY))
+                values['season_ba'].append(baseline.get('season_avg', math.nan))
+                values['arsenal_ba'].append(matchup.get('weighted_est_ba', math.nan))
+                values['season_k'].append(baseline.get('season_k_pct', math.nan))
+                values['arsenal_k'].append(matchup.get('weighted_k_rate', math.nan))
+        count = len(values['batter'])
+        values['day'] = [game_date.toordinal()] * count
+
+        os.makedirs(self.path, exist_ok=True)
+        self._columns = None  # Drop the memory maps before the files change under them
+        splice = tail_row < self.rows  # Later days follow, so their rows have to move
+        if splice:
+            self._splice(first_row, tail_row, values)
+        else:
+            for column, dtype in COLUMNS.items():
+                with open(self._column_path(column), 'ab') as f:
+                    # Drop a replaced day, or anything a crashed append left past the indexed rows
+                    f.truncate(first_row * np.dtype(dtype).itemsize)
+                    f.write(np.asarray(values[column], dtype=dtype).tobytes())
+        shift = count - (tail_row - first_row)
+        for other, (start, end) in self.days.items():
+            if other > day:
+                self.days[other] = [start + shift, end + shift]
+        self.rows += shift
+        self.days[day] = [first_row, first_row + count]
+        if splice:
+            self.generation += 1
+        self._save_index()
+        if splice:
+            for column in COLUMNS:
+                os.remove(self._column_path(column, self.generation - 1))
+        self._postings = {}
+        return count
+
+    def _splice(self, first_row, tail_row, values):
+        # Rows [first_row, tail_row) give way to values in the next generation's files; the
+        # current files stay untouched until the index has switched over
+        generation = self.generation + 1
+        for column, dtype in COLUMNS.items():
+            stored = np.fromfile(self._column_path(column), dtype=dtype, count=self.rows)
+            with open(self._column_path(column, generation), 'wb') as f:
+                f.write(stored[:first_row].tobytes())
+                f.write(np.asarray(values[column], dtype=dtype).tobytes())
+                f.write(stored[tail_row:].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+    def columns(self):
+        """Memory-mapped column arrays (read-only)"""
+        if self._columns is None:
+            self._columns = {}
+            for column, dtype in COLUMNS.items():
+                if self.rows:
+                    self._columns[column] = np.memmap(self._column_path(column), dtype=dtype, mode='r', shape=(self.rows,))
+                else:
+                    self._columns[column] = np.empty(0, dtype=dtype)
+        return self._columns
+
+    def _rows_for(self, column, value):
+        """Row numbers with column == value, ascending (and so in date order)"""
+        if column not in self._postings:
+            values = self.columns()[column]
+            order = np.argsort(values, kind='stable')
+            self._postings[column] = (order, values[order])
+        order, sorted_values = self._postings[column]
+        start, end = np.searchsorted(sorted_values, [value, value + 1])
+        return order[start:end]
+
+    def query(self, batter=None, pitcher=None, since=None, until=None, reliable_only=False):
+        """MatchupRows for a batter and/or pitcher (feed names) between two dates, inclusive"""
+        columns = self.columns()
+        start, end = np.searchsorted(columns['day'], [
+            since.toordinal() if since else np.iinfo(np.int32).min,
+            (until.toordinal() if until else np.iinfo(np.int32).max - 1) + 1
+        ])
+        rows = np.arange(start, end)
+        for column, name, ids in (('batter', batter, self._batter_ids), ('pitcher', pitcher, self._pitcher_ids)):
+            if name is None:
+                continue
+            if name not in ids:
+                rows = rows[:0]
+                break
+            rows = np.intersect1d(rows, self._rows_for(column, ids[name]), assume_unique=True)
+        if reliable_only:
+            rows = rows[columns['reliability'][rows] >= RELIABILITY['MEDIUM']]
+        return MatchupRows({column: np.asarray(values[rows]) for column, values in columns.items()}, self.batter_names, self.pitcher_names)
+
+    def repeated_edges(self, since=None, until=None, min_boost=0.020, min_games=3):
+        """[(batter, edge_games, games, mean_ba_diff)] for batters whose xBA beat their season
+        BA by more than min_boost in at least min_games reliable matchups, most edges first"""
+        result = self.query(since=since, until=until, reliable_only=True)
+        if not len(result):
+            return []
+        batters = result['batter']
+        ba_diff = result.ba_diff
+        size = len(self.batter_names)
+        games = np.bincount(batters, minlength=size)
+        edges = np.bincount(batters, weights=ba_diff > min_boost, minlength=size)
+        diff_sums = np.bincount(batters, weights=np.nan_to_num(ba_diff), minlength=size)
+        candidates = np.nonzero(edges >= min_games)[0]
+        ranked = sorted(candidates, key=lambda i: (-edges[i], -diff_sums[i] / games[i]))
+        return [(self.batter_names[i], int(edges[i]), int(games[i]), float(diff_sums[i] / games[i])) for i in ranked]
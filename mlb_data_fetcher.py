@@ -1,156 +1,401 @@
 # mlb_data_fetcher.py
-import requests
+import asyncio
 import json
-from datetime import datetime
+import re
+from array import array
+from datetime import date, datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from async_http import run_sync
+from feed_client import FeedUnavailable, fetch_feed_async
+from fixture_archive import record_payload
+from mlb_records import GameTopic, LineupEdge, Performer, PitcherSummary, PropAlert, UmpireProfile
+from umpire_store import UmpireIndex, UmpireStore, parse_umpire_feed
+from matchup_store import MatchupStore
+from stage_profiler import stage
+
+class PitcherArsenal:
+    """Compact pitch mix for one pitcher, sorted by usage once when built"""
+    __slots__ = ('pitcher_key', 'signature', 'names', 'usage', 'speeds', 'text')
+
+    def __init__(self, pitcher_key, arsenal):
+        sorted_pitches = sorted(arsenal.items(), key=lambda x: x[1].get('usage_rate', 0), reverse=True)
+        self.pitcher_key = pitcher_key
+        self.signature = self.signature_for(arsenal)
+        self.names = tuple(pitch_data.get('name', pitch_type) for pitch_type, pitch_data in sorted_pitches)
+        self.usage = array('d', (pitch_data.get('usage_rate', 0) * 100 for _, pitch_data in sorted_pitches))
+        self.speeds = array('d', (pitch_data.get('avg_speed', 0) for _, pitch_data in sorted_pitches))
+        self.text = "; ".join(
+            f"{name} ({self.usage_label(i)} usage, {self.speeds[i]:.1f} mph)"
+            for i, name in enumerate(self.names)
+        )
+
+    @staticmethod
+    def signature_for(arsenal):
+        """Cheap fingerprint used to detect a changed arsenal for a cached pitcher"""
+        return frozenset(
+            (pitch_type, pitch_data.get('usage_rate'), pitch_data.get('avg_speed'))
+            for pitch_type, pitch_data in arsenal.items()
+        )
+
+    def usage_label(self, index):
+        """Usage percentage rounded the same way everywhere (prose and charts)"""
+        return f"{self.usage[index]:.0f}%"
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return zip(self.names, self.usage, self.speeds)
+
+class PitcherArsenalStore:
+    """Process-wide cache of PitcherArsenal records keyed by pitcher id"""
+
+    def __init__(self):
+        self._arsenals = {}
+
+    def get(self, pitcher_key):
+        return self._arsenals.get(pitcher_key)
+
+    def load(self, pitcher_key, arsenal):
+        """Return the cached arsenal for a pitcher, rebuilding it only if the data changed"""
+        cached = self._arsenals.get(pitcher_key)
+        if cached is not None and cached.signature == PitcherArsenal.signature_for(arsenal):
+            return cached
+        record = PitcherArsenal(pitcher_key, arsenal)
+        self._arsenals[pitcher_key] = record
+        return record
+
+    def clear(self):
+        self._arsenals.clear()
+
+# Shared across games and across runs within the same process
+ARSENAL_STORE = PitcherArsenalStore()
+
+def get_pitcher_key(pitcher_data):
+    """Stable lookup key for a pitcher (id when the feed provides one, else name)"""
+    return pitcher_data.get('id') or pitcher_data.get('name', 'Unknown')
+
+# DraftKings lists first pitch in US Eastern time, e.g. "7/8, 06:40PM" or "06:40PM"
+GAME_TIME_ZONE = ZoneInfo('America/New_York')
+GAME_TIME_PATTERN = re.compile(r'^\s*(?:(\d{1,2})/(\d{1,2}),?\s*)?(\d{1,2}):(\d{2})\s*([AP])M\s*$', re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def _parse_game_time(time_str, reference_date):
+    match = GAME_TIME_PATTERN.match(time_str)
+    if not match:
+        print(f"⚠️ Could not parse game time '{time_str}'")
+        return None
+    month, day, hour, minute, meridiem = match.groups()
+    hour = int(hour) % 12 + (12 if meridiem.upper() == 'P' else 0)
+    try:
+        game_date = date(reference_date.year, int(month), int(day)) if month else reference_date
+        return datetime(game_date.year, game_date.month, game_date.day, hour, int(minute), tzinfo=GAME_TIME_ZONE)
+    except ValueError as e:
+        print(f"⚠️ Invalid game time '{time_str}': {e}")
+        return None
+
+def parse_game_time(time_str, reference_date=None):
+    """Parse a feed game time into an aware datetime (None for TBD or unparseable).
+
+    Results are cached per distinct string, so re-sorting or rescheduling a slate is free.
+    Times without a date fall on reference_date (today in Eastern time by default).
+    """
+    if not time_str or time_str == 'TBD':
+        return None
+    if reference_date is None:
+        reference_date = datetime.now(GAME_TIME_ZONE).date()
+    return _parse_game_time(time_str, reference_date)
+
+def game_time_sort_key(game_start):
+    """Chronological sort key that puts TBD games (None) last"""
+    return (game_start is None, game_start.timestamp() if game_start else 0.0)
+
+def format_game_time(game_start):
+    """Human-readable first pitch, e.g. "July 8, 6:40 PM ET" """
+    return f"{game_start:%B} {game_start.day}, {game_start.hour % 12 or 12}:{game_start:%M} {game_start:%p} ET"
+
+# MLB API code -> DraftKings team name patterns
+BETTING_TEAM_NAMES = {
+    'LAA': ['LA Angels', 'LAA Angels', 'Angels'],
+    'LAD': ['LA Dodgers', 'LAD Dodgers', 'Dodgers'],
+    'NYM': ['NY Mets', 'NYM Mets', 'Mets'],
+    'NYY': ['NY Yankees', 'NYY Yankees', 'Yankees'],
+    'CWS': ['CHI White Sox', 'CWS White Sox', 'White Sox'],
+    'CHC': ['CHI Cubs', 'CHC Cubs', 'Cubs'],
+    'TB': ['TB Rays', 'Rays'],
+    'SF': ['SF Giants', 'Giants'],
+    'SD': ['SD Padres', 'Padres'],
+    'KC': ['KC Royals', 'Royals'],
+    'WSH': ['WAS Mystics', 'WSH Nationals', 'Nationals'],  # Handle both
+    'ARI': ['ARI Diamondbacks', 'AZ Diamondbacks', 'Diamondbacks'],
+    'AZ': ['ARI Diamondbacks', 'AZ Diamondbacks', 'Diamondbacks'],
+    'MIA': ['MIA Marlins', 'Marlins'],
+    'CIN': ['CIN Reds', 'Reds'],
+    'COL': ['COL Rockies', 'Rockies'],
+    'BOS': ['BOS Red Sox', 'Red Sox'],
+    'MIL': ['MIL Brewers', 'Brewers'],
+    'PIT': ['PIT Pirates', 'Pirates'],
+    'HOU': ['HOU Astros', 'Astros'],
+    'CLE': ['CLE Guardians', 'Guardians'],
+    'TEX': ['TEX Rangers', 'Rangers'],
+    'DET': ['DET Tigers', 'Tigers'],
+    'MIN': ['MIN Twins', 'Twins'],
+    'TOR': ['TOR Blue Jays', 'Blue Jays'],
+    'ATL': ['ATL Braves', 'Braves'],
+    'BAL': ['BAL Orioles', 'Orioles'],
+    'PHI': ['PHI Phillies', 'Phillies'],
+    'SEA': ['SEA Mariners', 'Mariners'],
+    'STL': ['STL Cardinals', 'Cardinals'],
+    'ATH': ['Athletics'],
+}
+
+def get_team_matches(team_code):
+    """Team name patterns for a team code (the code itself when it is not in the table)"""
+    return BETTING_TEAM_NAMES.get(team_code, [team_code])
+
+class BettingGameIndex:
+    """A slate's betting games keyed by (away code, home code), resolved once per slate.
+
+    Each game's team names are matched against the team table when the index is built,
+    so looking up a matchup is a dict hit instead of a pattern scan over every game. A
+    doubleheader lists the same pairing twice, so each pair keeps its games in start order.
+    """
+
+    def __init__(self, betting_games, reference_date=None):
+        self.betting_games = list(betting_games)
+        self.reference_date = reference_date
+        self._by_codes = {}
+        for game in sorted(self.betting_games, key=self._start_key):
+            away_codes = self._codes_in(game.get('away_team', ''))
+            home_codes = self._codes_in(game.get('home_team', ''))
+            for away_code in away_codes:
+                for home_code in home_codes:
+                    self._by_codes.setdefault((away_code, home_code), []).append(game)
+
+    def _start_key(self, game):
+        return game_time_sort_key(parse_game_time(game.get('time'), self.reference_date))
+
+    @staticmethod
+    def _codes_in(team_name):
+        return [code for code, patterns in BETTING_TEAM_NAMES.items() if any(pattern in team_name for pattern in patterns)]
+
+    def find(self, away_team, home_team, game_number=1):
+        """The game_number-th game between the teams in start order, or None when the
+        feed lists fewer (a doubleheader's second game never borrows the first's odds)"""
+        if away_team in BETTING_TEAM_NAMES and home_team in BETTING_TEAM_NAMES:
+            games = self._by_codes.get((away_team, home_team), [])
+        else:
+            # Codes missing from the table can only be matched by scanning for the code itself
+            away_matches, home_matches = get_team_matches(away_team), get_team_matches(home_team)
+            games = [
+                game for game in sorted(self.betting_games, key=self._start_key)
+                if any(match in game.get('away_team', '') for match in away_matches)
+                and any(match in game.get('home_team', '') for match in home_matches)
+            ]
+        return games[game_number - 1] if game_number <= len(games) else None
+
+# ==================== BETTING RULES ====================
+# A batter lean needs xBA above .300 and a boost of more than 20 points over the season BA
+LEAN_MIN_XBA = 0.300
+LEAN_MIN_BA_BOOST = 0.020
+# A strikeout OVER needs the lineup's K% vs the arsenal above 25% and more than 4 points up
+K_PROP_MIN_RATE = 25.0
+K_PROP_MIN_INCREASE = 4.0
+
+def classify_umpire(umpire, k_boost, bb_boost):
+    """UmpireProfile from the boost multipliers: strikeouts help pitchers, walks help hitters"""
+    if not umpire or umpire == 'TBA':
+        return UmpireProfile(umpire or 'TBA')
+    k_percent = round((k_boost - 1) * 100)
+    bb_percent = round((bb_boost - 1) * 100)
+    if k_percent > 0 and bb_percent > 0:
+        label = 'mixed tendencies'
+    elif k_percent > 0:
+        label = 'pitcher-friendly'
+    elif bb_percent > 0:
+        label = 'hitter-friendly'
+    else:
+        label = 'neutral'
+    return UmpireProfile(umpire, k_percent, bb_percent, label)
+
+def evaluate_prop_alerts(game_topic):
+    """Batter leans (biggest boost first), then strikeout OVERs, for one game"""
+    batter_alerts = []
+    strikeout_alerts = []
+    # Each lineup faces the other side's starter
+    sides = ((game_topic.away_team, game_topic.away_lineup, game_topic.home_pitcher),
+             (game_topic.home_team, game_topic.home_lineup, game_topic.away_pitcher))
+    for team, lineup, opposing_pitcher in sides:
+        for performer in lineup.top_performers:
+            if performer.arsenal_ba > LEAN_MIN_XBA and performer.ba_diff > LEAN_MIN_BA_BOOST:
+                batter_alerts.append(PropAlert('batter', performer.name, team, performer.season_ba, performer.arsenal_ba, performer.ba_diff))
+        k_increase = lineup.arsenal_k_pct - lineup.season_k_pct
+        if lineup.arsenal_k_pct > K_PROP_MIN_RATE and k_increase > K_PROP_MIN_INCREASE:
+            strikeout_alerts.append(PropAlert('strikeout', opposing_pitcher.name, team, lineup.season_k_pct, lineup.arsenal_k_pct, k_increase))
+    batter_alerts.sort(key=lambda alert: alert.change, reverse=True)
+    return tuple(batter_alerts + strikeout_alerts)
 
 class MLBDataFetcher:
     def __init__(self):
+        self.arsenal_store = ARSENAL_STORE
         self.mlb_api_url = "https://mlb-matchup-api-savant.onrender.com/latest"
         self.umpire_api_url = "https://umpire-json-api.onrender.com"
         self.betting_api_url = "https://draftkings-splits-scraper-webservice.onrender.com/mlb"
+        # Feed name -> fetch time of the cached payload in use (None if no data at all)
+        self.stale_feeds = {}
+        self._umpire_store = None
+        self._matchup_store = None
+        self.game_date = None  # Date of the slate being built; None means today in Eastern time
     
-    def get_mlb_data(self):
+    def slate_date(self):
+        return self.game_date or datetime.now(GAME_TIME_ZONE).date()
+    
+    async def _fetch_feed(self, http, name, url):
+        """Fetch one feed, recording whether live or cached (stale) data was used"""
+        try:
+            payload, stale_since = await fetch_feed_async(http, name, url)
+        except FeedUnavailable:
+            self.stale_feeds[name] = None
+            raise
+        if stale_since:
+            self.stale_feeds[name] = stale_since
+        else:
+            self.stale_feeds.pop(name, None)
+            record_payload(name, payload, self.slate_date())
+        return payload
+
+    async def get_mlb_data_async(self, http):
         """Fetch MLB matchup data"""
         try:
             print("🌐 Fetching MLB data...")
-            response = requests.get(self.mlb_api_url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._fetch_feed(http, 'mlb', self.mlb_api_url)
             print(f"✅ Got {len(data.get('reports', []))} games")
             return data.get('reports', [])
         except Exception as e:
             print(f"❌ Error fetching MLB data: {e}")
             return []
 
-    def get_umpire_data(self):
-        """Fetch umpire data"""
+    @property
+    def umpire_store(self):
+        """The persistent umpire table, opened on first use"""
+        if self._umpire_store is None:
+            self._umpire_store = UmpireStore()
+        return self._umpire_store
+
+    @property
+    def matchup_store(self):
+        """The columnar history of every day's key_matchups, opened on first use"""
+        if self._matchup_store is None:
+            self._matchup_store = MatchupStore()
+        return self._matchup_store
+
+    def record_matchups(self, mlb_reports, game_date=None):
+        """Append today's key_matchups to the matchup store (live data only)"""
+        if not mlb_reports or 'mlb' in self.stale_feeds:
+            return 0
+        game_date = game_date or self.slate_date()
         try:
+            count = self.matchup_store.append_day(game_date, mlb_reports)
+        except OSError as e:
+            print(f"⚠️ Could not record matchups: {e}")
+            return 0
+        print(f"🗃️ Recorded {count} batter-vs-arsenal matchups for {game_date}")
+        return count
+
+    async def get_umpire_data_async(self, http):
+        """The slate's UmpireAssignments, from the umpire table if it was refreshed recently, else the feed"""
+        game_date = self.slate_date()
+        try:
+            if self.umpire_store.is_fresh(game_date):
+                assignments = self.umpire_store.assignments(game_date)
+                print(f"♻️ Reusing stored umpire data for {len(assignments)} games")
+                return assignments
             print("🌐 Fetching umpire data...")
-            response = requests.get(self.umpire_api_url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            print(f"✅ Got umpire data for {len(data)} umpires")
-            return data
+            assignments = parse_umpire_feed(await self._fetch_feed(http, 'umpire', self.umpire_api_url))
+            if 'umpire' in self.stale_feeds:
+                print(f"✅ Got cached umpire data for {len(assignments)} umpires")
+            else:
+                changed = self.umpire_store.refresh(game_date, assignments)
+                print(f"✅ Got umpire data for {len(assignments)} umpires ({changed} new or changed)")
+            return assignments
         except Exception as e:
             print(f"❌ Error fetching umpire data: {e}")
             return []
 
-    def get_betting_data(self):
+    async def get_betting_data_async(self, http):
         """Fetch betting odds and splits data"""
         try:
             print("🌐 Fetching betting data...")
-            response = requests.get(self.betting_api_url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._fetch_feed(http, 'betting', self.betting_api_url)
             print(f"✅ Got betting data for {len(data.get('games', []))} games")
             return data.get('games', [])
         except Exception as e:
             print(f"❌ Error fetching betting data: {e}")
             return []
 
+    @stage('fetch')
+    async def fetch_feeds_async(self, http):
+        """Fetch all three feeds concurrently: (mlb_reports, umpires, betting_games)"""
+        return await asyncio.gather(
+            self.get_mlb_data_async(http),
+            self.get_umpire_data_async(http),
+            self.get_betting_data_async(http)
+        )
+
+    # Synchronous wrappers for use outside an event loop
+    def get_mlb_data(self):
+        return run_sync(self.get_mlb_data_async)
+
+    def get_umpire_data(self):
+        return run_sync(self.get_umpire_data_async)
+
+    def get_betting_data(self):
+        return run_sync(self.get_betting_data_async)
+
+    def describe_stale_feeds(self):
+        """Staleness marker for game data, e.g. {'umpire': 'cached 2025-07-08T11:00:00+00:00'}"""
+        return {
+            name: f"cached {stale_since.isoformat()}" if stale_since else 'unavailable'
+            for name, stale_since in self.stale_feeds.items()
+        }
+
     def find_game_umpire(self, umpires, matchup):
-        """Find the umpire for a specific game matchup"""
-        for ump in umpires:
-            if ump.get('matchup', '-') == matchup:
-                return ump
-        
-        if ' @ ' in matchup:
-            away_team, home_team = matchup.split(' @ ')
-            for ump in umpires:
-                ump_matchup = ump.get('matchup', '-')
-                if away_team in ump_matchup and home_team in ump_matchup:
-                    return ump
-        
-        return None
+        """Find the UmpireAssignment for a specific game matchup"""
+        if not isinstance(umpires, UmpireIndex):
+            umpires = UmpireIndex(umpires)
+        return umpires.find(matchup)
 
-    def find_game_betting_data(self, betting_games, matchup):
-        """Find betting data for a specific game matchup with better team matching"""
+    def find_game_betting_data(self, betting_games, matchup, game_number=1):
+        """Find betting data for a specific game matchup (betting_games may be a BettingGameIndex);
+        game_number picks a doubleheader's game in start order"""
         if ' @ ' not in matchup:
             return None
             
         away_team, home_team = matchup.split(' @ ')
         
-        print(f"🔍 Looking for betting data: {away_team} @ {home_team}")
-        
-        # Enhanced team mapping for better matching
-        team_mapping = {
-            # MLB API code -> DraftKings full name patterns
-            'LAA': ['LA Angels', 'LAA Angels', 'Angels'],
-            'LAD': ['LA Dodgers', 'LAD Dodgers', 'Dodgers'],
-            'NYM': ['NY Mets', 'NYM Mets', 'Mets'],
-            'NYY': ['NY Yankees', 'NYY Yankees', 'Yankees'],
-            'CWS': ['CHI White Sox', 'CWS White Sox', 'White Sox'],
-            'CHC': ['CHI Cubs', 'CHC Cubs', 'Cubs'],
-            'TB': ['TB Rays', 'Rays'],
-            'SF': ['SF Giants', 'Giants'],
-            'SD': ['SD Padres', 'Padres'],
-            'KC': ['KC Royals', 'Royals'],
-            'WSH': ['WAS Mystics', 'WSH Nationals', 'Nationals'],  # Handle both
-            'ARI': ['ARI Diamondbacks', 'AZ Diamondbacks', 'Diamondbacks'],
-            'AZ': ['ARI Diamondbacks', 'AZ Diamondbacks', 'Diamondbacks'],
-            'MIA': ['MIA Marlins', 'Marlins'],
-            'CIN': ['CIN Reds', 'Reds'],
-            'COL': ['COL Rockies', 'Rockies'],
-            'BOS': ['BOS Red Sox', 'Red Sox'],
-            'MIL': ['MIL Brewers', 'Brewers'],
-            'PIT': ['PIT Pirates', 'Pirates'],
-            'HOU': ['HOU Astros', 'Astros'],
-            'CLE': ['CLE Guardians', 'Guardians'],
-            'TEX': ['TEX Rangers', 'Rangers'],
-            'DET': ['DET Tigers', 'Tigers'],
-            'MIN': ['MIN Twins', 'Twins'],
-            'TOR': ['TOR Blue Jays', 'Blue Jays'],
-            'ATL': ['ATL Braves', 'Braves'],
-            'BAL': ['BAL Orioles', 'Orioles'],
-            'PHI': ['PHI Phillies', 'Phillies'],
-            'SEA': ['SEA Mariners', 'Mariners'],
-            'STL': ['STL Cardinals', 'Cardinals'],
-            'ATH': ['Athletics'],
-        }
-        
-        def get_team_matches(team_code):
-            """Get all possible team name matches for a team code"""
-            if team_code in team_mapping:
-                return team_mapping[team_code]
-            return [team_code]  # Fallback to original code
-        
-        away_matches = get_team_matches(away_team)
-        home_matches = get_team_matches(home_team)
-        
-        # Find matching betting game
-        for game in betting_games:
-            betting_away = game.get('away_team', '')
-            betting_home = game.get('home_team', '')
-            
-            print(f"  🔍 Checking: {betting_away} @ {betting_home}")
-            
-            # Check if any of the away team matches work
-            away_match = any(match in betting_away for match in away_matches)
-            home_match = any(match in betting_home for match in home_matches)
-            
-            if away_match and home_match:
-                print(f"  ✅ Found match: {betting_away} @ {betting_home}")
-                return game
-        
-        print(f"  ❌ No betting data found for {away_team} @ {home_team}")
-        return None
+        if not isinstance(betting_games, BettingGameIndex):
+            betting_games = BettingGameIndex(betting_games)
+        game = betting_games.find(away_team, home_team, game_number)
+        if game:
+            print(f"  ✅ Found betting data: {game.get('away_team', '')} @ {game.get('home_team', '')}")
+        else:
+            print(f"  ❌ No betting data found for {away_team} @ {home_team}")
+        return game
+
+    def get_pitcher_arsenal(self, pitcher_data):
+        """Get the cached, pre-sorted arsenal record for a pitcher (None if no arsenal)"""
+        arsenal = pitcher_data.get('arsenal', {})
+        if not arsenal:
+            return None
+        return self.arsenal_store.load(get_pitcher_key(pitcher_data), arsenal)
 
     def format_pitcher_arsenal(self, pitcher_data):
         """Format pitcher arsenal for blog content"""
-        arsenal = pitcher_data.get('arsenal', {})
+        arsenal = self.get_pitcher_arsenal(pitcher_data)
         if not arsenal:
             return "Mixed arsenal"
-        
-        sorted_pitches = sorted(arsenal.items(), key=lambda x: x[1]['usage_rate'], reverse=True)
-        arsenal_text = []
-        
-        for pitch_type, pitch_data in sorted_pitches:
-            pitch_name = pitch_data.get('name', pitch_type)
-            usage = pitch_data['usage_rate'] * 100
-            speed = pitch_data['avg_speed']
-            arsenal_text.append(f"{pitch_name} ({usage:.0f}% usage, {speed:.1f} mph)")
-        
-        return "; ".join(arsenal_text)
+        return arsenal.text
 
     def calculate_lineup_advantage(self, key_matchups, pitcher_name):
         """Calculate comprehensive lineup stats vs specific pitcher including K% data"""
@@ -158,15 +403,7 @@ class MLBDataFetcher:
         reliable_matchups = [m for m in pitcher_matchups if m.get('reliability', '').upper() in ['MEDIUM', 'HIGH']]
         
         if not reliable_matchups:
-            return {
-                'ba_advantage': 0.0,
-                'k_advantage': 0.0,
-                'season_ba': 0.250,
-                'arsenal_ba': 0.250,
-                'season_k_pct': 22.5,
-                'arsenal_k_pct': 22.5,
-                'top_performers': []
-            }
+            return LineupEdge()
         
         season_bas = []
         season_k_pcts = []
@@ -212,16 +449,16 @@ class MLBDataFetcher:
                 else:
                     advantage = 'moderate'
                 
-                top_performers.append({
-                    'name': batter_display,
-                    'season_ba': season_ba,
-                    'arsenal_ba': arsenal_ba,
-                    'season_k': season_k,
-                    'arsenal_k': arsenal_k,
-                    'ba_diff': ba_diff,
-                    'k_diff': k_diff,
-                    'advantage': advantage
-                })
+                top_performers.append(Performer(
+                    name=batter_display,
+                    season_ba=season_ba,
+                    arsenal_ba=arsenal_ba,
+                    season_k=season_k,
+                    arsenal_k=arsenal_k,
+                    ba_diff=ba_diff,
+                    k_diff=k_diff,
+                    advantage=advantage
+                ))
         
         # Calculate team averages
         avg_season_ba = sum(season_bas) / len(season_bas) if season_bas else 0.250
@@ -229,15 +466,26 @@ class MLBDataFetcher:
         avg_arsenal_ba = sum(arsenal_bas) / len(arsenal_bas)
         avg_arsenal_k = sum(arsenal_k_pcts) / len(arsenal_k_pcts)
         
-        return {
-            'ba_advantage': avg_arsenal_ba - avg_season_ba,
-            'k_advantage': avg_arsenal_k - avg_season_k,  # Positive = more Ks (bad for lineup)
-            'season_ba': avg_season_ba,
-            'arsenal_ba': avg_arsenal_ba,
-            'season_k_pct': avg_season_k,
-            'arsenal_k_pct': avg_arsenal_k,
-            'top_performers': top_performers
-        }
+        return LineupEdge(
+            ba_advantage=avg_arsenal_ba - avg_season_ba,
+            k_advantage=avg_arsenal_k - avg_season_k,  # Positive = more Ks (bad for lineup)
+            season_ba=avg_season_ba,
+            arsenal_ba=avg_arsenal_ba,
+            season_k_pct=avg_season_k,
+            arsenal_k_pct=avg_arsenal_k,
+            top_performers=top_performers
+        )
+
+    def evaluate_betting_rules(self, blog_topics):
+        """Apply the lean criteria and umpire classification to a whole slate in one pass.
+
+        Sets prop_alerts and umpire_profile on every topic, so posts state the results
+        instead of asking the model to re-derive them.
+        """
+        for game_topic in blog_topics:
+            game_topic.prop_alerts = evaluate_prop_alerts(game_topic)
+            game_topic.umpire_profile = classify_umpire(game_topic.umpire, game_topic.umpire_k_boost, game_topic.umpire_bb_boost)
+        return blog_topics
 
     def format_betting_info(self, betting_game):
         """Format betting odds and splits into a readable sentence"""
@@ -283,43 +531,38 @@ class MLBDataFetcher:
 
     def parse_game_time_for_sorting(self, time_str):
         """Parse game time for proper chronological sorting"""
-        if not time_str or time_str == 'TBD':
-            return 9999  # Sort TBD games to the end
-        
-        try:
-            # Handle format like "7/8, 06:40PM" or just "06:40PM"
-            if ',' in time_str:
-                time_part = time_str.split(',')[1].strip()
-            else:
-                time_part = time_str.strip()
-            
-            # Convert to 24-hour format for proper sorting
-            if 'PM' in time_part:
-                hour = int(time_part.split(':')[0])
-                if hour != 12:
-                    hour += 12
-                minute = int(time_part.split(':')[1].replace('PM', ''))
-            else:  # AM
-                hour = int(time_part.split(':')[0])
-                if hour == 12:
-                    hour = 0
-                minute = int(time_part.split(':')[1].replace('AM', ''))
-            
-            return hour * 100 + minute  # Returns like 1840 for 6:40PM
-        except Exception as e:
-            print(f"⚠️ Error parsing time '{time_str}': {e}")
-            return 9999  # Sort unparseable times to end
+        return game_time_sort_key(parse_game_time(time_str, self.slate_date()))
+
+    async def get_blog_topics_from_games_async(self, http):
+        """Generate blog topics from current MLB games, fetching the feeds concurrently"""
+        mlb_reports, umpires, betting_games = await self.fetch_feeds_async(http)
+        self.record_matchups(mlb_reports)
+        return self.build_blog_topics(mlb_reports, umpires, betting_games)
 
     def get_blog_topics_from_games(self):
         """Generate blog topics from current MLB games"""
-        mlb_reports = self.get_mlb_data()
-        umpires = self.get_umpire_data()
-        betting_games = self.get_betting_data()
-        
+        return run_sync(self.get_blog_topics_from_games_async)
+
+    @stage('topic_build')
+    def build_blog_topics(self, mlb_reports, umpires, betting_games):
+        """Turn the fetched feeds into GameTopic records sorted by first pitch"""
         if not mlb_reports:
             return []
         
+        stale_data = self.describe_stale_feeds()
+        if stale_data:
+            print(f"⚠️ Degraded data for this run: {stale_data}")
+        
+        # Indexed once per slate, so each game's lookups are dict hits
+        umpire_index = UmpireIndex(umpires)
+        # Times without a date belong to the slate's day, not the day this runs (a replay
+        # or a shard worker past midnight)
+        slate_date = self.slate_date()
+        betting_index = BettingGameIndex(betting_games, slate_date)
         blog_topics = []
+        # The MLB feed has no start times, so a doubleheader's reports are paired with its
+        # betting games in order: the first report listed gets the earlier game
+        games_seen = {}
         
         for game_report in mlb_reports:
             try:
@@ -346,47 +589,13 @@ class MLBDataFetcher:
                 home_lineup_stats = self.calculate_lineup_advantage(key_matchups, away_pitcher_data['name'])
                 
                 # Find umpire
-                umpire = self.find_game_umpire(umpires, matchup)
+                umpire = umpire_index.find(matchup)
                 
                 # Find betting data
-                betting_game = self.find_game_betting_data(betting_games, matchup)
-                
-                # Create comprehensive game data with K% information
-                game_data = {
-                    'matchup': matchup,
-                    'away_team': away_team,
-                    'home_team': home_team,
-                    'game_time': betting_game.get('time', 'TBD') if betting_game else 'TBD',
-                    'betting_info': self.format_betting_info(betting_game),
-                    'away_pitcher': {
-                        'name': away_pitcher_display,
-                        'arsenal': self.format_pitcher_arsenal(away_pitcher_data)
-                    },
-                    'home_pitcher': {
-                        'name': home_pitcher_display,
-                        'arsenal': self.format_pitcher_arsenal(home_pitcher_data)
-                    },
-                    # Away lineup vs home pitcher
-                    'away_lineup_advantage': away_lineup_stats['ba_advantage'],
-                    'away_lineup_k_advantage': away_lineup_stats['k_advantage'],
-                    'away_season_ba': away_lineup_stats['season_ba'],
-                    'away_arsenal_ba': away_lineup_stats['arsenal_ba'],
-                    'away_season_k_pct': away_lineup_stats['season_k_pct'],
-                    'away_arsenal_k_pct': away_lineup_stats['arsenal_k_pct'],
-                    'away_key_performers': away_lineup_stats['top_performers'],
-                    # Home lineup vs away pitcher
-                    'home_lineup_advantage': home_lineup_stats['ba_advantage'],
-                    'home_lineup_k_advantage': home_lineup_stats['k_advantage'],
-                    'home_season_ba': home_lineup_stats['season_ba'],
-                    'home_arsenal_ba': home_lineup_stats['arsenal_ba'],
-                    'home_season_k_pct': home_lineup_stats['season_k_pct'],
-                    'home_arsenal_k_pct': home_lineup_stats['arsenal_k_pct'],
-                    'home_key_performers': home_lineup_stats['top_performers'],
-                    # Umpire data
-                    'umpire': umpire['umpire'] if umpire else 'TBA',
-                    'umpire_k_boost': umpire['k_boost'] if umpire else '1.0x',
-                    'umpire_bb_boost': umpire['bb_boost'] if umpire else '1.0x'
-                }
+                games_seen[matchup] = games_seen.get(matchup, 0) + 1
+                betting_game = self.find_game_betting_data(betting_index, matchup, games_seen[matchup])
+                raw_game_time = betting_game.get('time', 'TBD') if betting_game else 'TBD'
+                game_start = parse_game_time(raw_game_time, slate_date)
                 
                 # Generate topic using full team names from betting data if available
                 if betting_game:
@@ -410,36 +619,67 @@ class MLBDataFetcher:
                 ]
                 
                 # Add situational keywords based on significant advantages
-                if abs(away_lineup_stats['ba_advantage']) > 0.015 or abs(home_lineup_stats['ba_advantage']) > 0.015:
+                if abs(away_lineup_stats.ba_advantage) > 0.015 or abs(home_lineup_stats.ba_advantage) > 0.015:
                     keywords.extend(["pitcher advantage", "matchup edge"])
                 
-                if abs(away_lineup_stats['k_advantage']) > 3.0 or abs(home_lineup_stats['k_advantage']) > 3.0:
+                if abs(away_lineup_stats.k_advantage) > 3.0 or abs(home_lineup_stats.k_advantage) > 3.0:
                     keywords.extend(["strikeout props", "contact advantage"])
                 
-                if umpire and umpire['umpire'] != 'TBA':
-                    k_multiplier = float(umpire['k_boost'].replace('x', ''))
+                if umpire and umpire.umpire != 'TBA':
+                    k_multiplier = umpire.k_boost
                     if k_multiplier > 1.1:
                         keywords.extend(["strikeout props", "pitcher friendly umpire"])
                     elif k_multiplier < 0.9:
                         keywords.extend(["hitter friendly umpire", "contact plays"])
                 
-                blog_topics.append({
-                    'topic': topic,
-                    'keywords': keywords,
-                    'game_data': game_data
-                })
+                # Create comprehensive game record with K% information
+                blog_topics.append(GameTopic(
+                    topic=topic,
+                    keywords=keywords,
+                    matchup=matchup,
+                    away_team=away_team,
+                    home_team=home_team,
+                    game_time=format_game_time(game_start) if game_start else raw_game_time,
+                    game_start=game_start,
+                    betting_info=self.format_betting_info(betting_game),
+                    away_pitcher=PitcherSummary(
+                        id=get_pitcher_key(away_pitcher_data),
+                        name=away_pitcher_display,
+                        arsenal=self.format_pitcher_arsenal(away_pitcher_data)
+                    ),
+                    home_pitcher=PitcherSummary(
+                        id=get_pitcher_key(home_pitcher_data),
+                        name=home_pitcher_display,
+                        arsenal=self.format_pitcher_arsenal(home_pitcher_data)
+                    ),
+                    # Away lineup vs home pitcher, home lineup vs away pitcher
+                    away_lineup=away_lineup_stats,
+                    home_lineup=home_lineup_stats,
+                    umpire=umpire.umpire if umpire else 'TBA',
+                    umpire_k_boost=umpire.k_boost if umpire else 1.0,
+                    umpire_bb_boost=umpire.bb_boost if umpire else 1.0,
+                    stale_data=stale_data,
+                    game_date=slate_date
+                ))
                 
             except Exception as e:
                 print(f"❌ Error processing game {matchup}: {e}")
                 continue
         
+        self.evaluate_betting_rules(blog_topics)
+        
         # ✅ IMPROVED: Sort blog topics by game time (earliest to latest)
         print(f"🔄 Sorting {len(blog_topics)} games by time...")
-        blog_topics.sort(key=lambda x: self.parse_game_time_for_sorting(x['game_data'].get('game_time', 'TBD')))
+        blog_topics.sort(key=lambda x: game_time_sort_key(x.game_start))
+        
+        # A doubleheader's games are numbered in start order so each keeps its own post
+        game_numbers = {}
+        for topic in blog_topics:
+            game_numbers[topic.matchup] = game_numbers.get(topic.matchup, 0) + 1
+            topic.game_number = game_numbers[topic.matchup]
         
         # Debug: Print sorted order
         for i, topic in enumerate(blog_topics):
-            game_time = topic['game_data'].get('game_time', 'TBD')
-            print(f"  {i+1}. {topic['topic']} - {game_time}")
+            print(f"  {i+1}. {topic.topic} - {topic.game_time}")
         
         return blog_topics
@@ -0,0 +1,199 @@
+# mlb_records.py
+import json
+from datetime import date, datetime
+
+class Record:
+    """Base for slotted records: attribute typos raise instead of failing silently"""
+    __slots__ = ()
+
+    def to_dict(self):
+        """Plain dict view (nested records and sequences converted recursively)"""
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+class Performer(Record):
+    """A batter whose projection vs the opposing arsenal moves meaningfully"""
+    __slots__ = ('name', 'season_ba', 'arsenal_ba', 'season_k', 'arsenal_k', 'ba_diff', 'k_diff', 'advantage')
+
+    def __init__(self, name, season_ba, arsenal_ba, season_k, arsenal_k, ba_diff, k_diff, advantage):
+        self.name = name
+        self.season_ba = season_ba
+        self.arsenal_ba = arsenal_ba
+        self.season_k = season_k
+        self.arsenal_k = arsenal_k
+        self.ba_diff = ba_diff
+        self.k_diff = k_diff
+        self.advantage = advantage
+
+class LineupEdge(Record):
+    """Lineup averages vs one pitcher's arsenal (positive k_advantage = more Ks)"""
+    __slots__ = ('ba_advantage', 'k_advantage', 'season_ba', 'arsenal_ba', 'season_k_pct', 'arsenal_k_pct', 'top_performers')
+
+    def __init__(self, ba_advantage=0.0, k_advantage=0.0, season_ba=0.250, arsenal_ba=0.250,
+                 season_k_pct=22.5, arsenal_k_pct=22.5, top_performers=()):
+        self.ba_advantage = ba_advantage
+        self.k_advantage = k_advantage
+        self.season_ba = season_ba
+        self.arsenal_ba = arsenal_ba
+        self.season_k_pct = season_k_pct
+        self.arsenal_k_pct = arsenal_k_pct
+        self.top_performers = tuple(top_performers)
+
+class PitcherSummary(Record):
+    """Starting pitcher as presented in the post (arsenal is the formatted prose)"""
+    __slots__ = ('id', 'name', 'arsenal', 'chart_url')
+
+    def __init__(self, id, name, arsenal, chart_url=None):
+        self.id = id
+        self.name = name
+        self.arsenal = arsenal
+        self.chart_url = chart_url
+
+def format_average(value):
+    """Batting average as written in posts: .XXX"""
+    return f"{value:.3f}".lstrip('0')
+
+class PropAlert(Record):
+    """A lean that met the betting criteria: a batter ('batter') or a pitcher strikeout OVER ('strikeout').
+
+    For a batter, season/projected are BA vs xBA vs the arsenal; for a strikeout alert they
+    are the opposing lineup's K%, and team is that lineup.
+    """
+    __slots__ = ('kind', 'name', 'team', 'season', 'projected', 'change')
+
+    def __init__(self, kind, name, team, season, projected, change):
+        self.kind = kind
+        self.name = name
+        self.team = team
+        self.season = season
+        self.projected = projected
+        self.change = change
+
+    def describe(self):
+        """The alert line exactly as it appears in the post"""
+        if self.kind == 'strikeout':
+            return f"⚡ **K Prop Alert**: {self.name} strikeout OVER - {self.team}'s K-rate jumps to {self.projected:.1f}% vs this arsenal!"
+        return (f"📢 **Prop Alert**: {self.name} ({format_average(self.season)} → {format_average(self.projected)}, "
+                f"+{self.change * 1000:.0f} points) meets betting lean criteria!")
+
+class UmpireProfile(Record):
+    """Umpire boosts as whole percentages plus the classification the post uses"""
+    __slots__ = ('name', 'k_percent', 'bb_percent', 'label')
+
+    def __init__(self, name, k_percent=None, bb_percent=None, label='unannounced'):
+        self.name = name
+        self.k_percent = k_percent  # None when the umpire is not announced
+        self.bb_percent = bb_percent
+        self.label = label
+
+    @property
+    def announced(self):
+        return self.k_percent is not None
+
+    def prompt_data(self):
+        if not self.announced:
+            return {'label': self.label}
+        return {'k_change': f"{self.k_percent:+d}%", 'bb_change': f"{self.bb_percent:+d}%", 'label': self.label}
+
+class UmpireAssignment(Record):
+    """Umpire for one game, with the feed's '1.11x' boosts parsed to floats"""
+    __slots__ = ('matchup', 'umpire', 'k_boost', 'bb_boost')
+
+    def __init__(self, matchup, umpire, k_boost=1.0, bb_boost=1.0):
+        self.matchup = matchup
+        self.umpire = umpire
+        self.k_boost = k_boost
+        self.bb_boost = bb_boost
+
+class GameTopic(Record):
+    """Everything needed to write and publish one game preview"""
+    __slots__ = (
+        'topic', 'keywords', 'matchup', 'away_team', 'home_team', 'game_time', 'game_start', 'betting_info',
+        'away_pitcher', 'home_pitcher', 'away_lineup', 'home_lineup',
+        'umpire', 'umpire_k_boost', 'umpire_bb_boost', 'stale_data', 'pitch_mix_chart_url',
+        'prop_alerts', 'umpire_profile', 'game_number', 'game_date',
+    )
+
+    def __init__(self, topic, keywords, matchup, away_team, home_team, game_time, game_start, betting_info,
+                 away_pitcher, home_pitcher, away_lineup, home_lineup,
+                 umpire='TBA', umpire_k_boost=1.0, umpire_bb_boost=1.0, stale_data=None,
+                 pitch_mix_chart_url=None, prop_alerts=None, umpire_profile=None, game_number=1, game_date=None):
+        self.topic = topic
+        self.keywords = keywords
+        self.matchup = matchup
+        self.away_team = away_team
+        self.home_team = home_team
+        self.game_time = game_time
+        self.game_start = game_start  # Aware datetime of first pitch, None when TBD
+        self.betting_info = betting_info
+        self.away_pitcher = away_pitcher
+        self.home_pitcher = home_pitcher
+        self.away_lineup = away_lineup
+        self.home_lineup = home_lineup
+        self.umpire = umpire
+        self.umpire_k_boost = umpire_k_boost  # Multipliers: 1.11 = 11% more strikeouts than average
+        self.umpire_bb_boost = umpire_bb_boost
+        self.stale_data = stale_data or {}  # Feed name -> staleness note when live data was unavailable
+        self.pitch_mix_chart_url = pitch_mix_chart_url  # Combined sheet for both starters
+        # Set by the betting rules for the whole slate; None until evaluated
+        self.prop_alerts = prop_alerts
+        self.umpire_profile = umpire_profile
+        self.game_number = game_number  # 2 for the second game of a doubleheader
+        self.game_date = game_date  # The slate's date (Eastern), also for TBD start times
+
+    def game_data(self):
+        """Flat game_data dict using the field names the blog prompt refers to"""
+        game_data = {
+            'matchup': self.matchup,
+            'away_team': self.away_team,
+            'home_team': self.home_team,
+            'game_time': self.game_time,
+            'betting_info': self.betting_info,
+            'away_pitcher': {'name': self.away_pitcher.name, 'arsenal': self.away_pitcher.arsenal},
+            'home_pitcher': {'name': self.home_pitcher.name, 'arsenal': self.home_pitcher.arsenal},
+        }
+        for side, lineup in (('away', self.away_lineup), ('home', self.home_lineup)):
+            game_data[f'{side}_lineup_advantage'] = lineup.ba_advantage
+            game_data[f'{side}_lineup_k_advantage'] = lineup.k_advantage
+            game_data[f'{side}_season_ba'] = lineup.season_ba
+            game_data[f'{side}_arsenal_ba'] = lineup.arsenal_ba
+            game_data[f'{side}_season_k_pct'] = lineup.season_k_pct
+            game_data[f'{side}_arsenal_k_pct'] = lineup.arsenal_k_pct
+            game_data[f'{side}_key_performers'] = [p.to_dict() for p in lineup.top_performers]
+        game_data['umpire'] = self.umpire
+        game_data['umpire_k_boost'] = f"{self.umpire_k_boost}x"
+        game_data['umpire_bb_boost'] = f"{self.umpire_bb_boost}x"
+        if self.umpire_profile is not None:
+            game_data['umpire_profile'] = self.umpire_profile.prompt_data()
+        if self.prop_alerts is not None:
+            game_data['prop_alerts'] = [alert.describe() for alert in self.prop_alerts]
+        if self.stale_data:
+            game_data['stale_data'] = self.stale_data
+        if self.away_pitcher.chart_url:
+            game_data['away_pitcher_chart_url'] = self.away_pitcher.chart_url
+        if self.home_pitcher.chart_url:
+            game_data['home_pitcher_chart_url'] = self.home_pitcher.chart_url
+        if self.pitch_mix_chart_url:
+            game_data['pitch_mix_chart_url'] = self.pitch_mix_chart_url
+        return game_data
+
+    def to_json(self, indent=None):
+        """JSON game data for the prompt"""
+        return json.dumps(self.game_data(), indent=indent, ensure_ascii=False)
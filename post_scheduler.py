@@ -0,0 +1,49 @@
+# post_scheduler.py
+import heapq
+import itertools
+from datetime import datetime, timedelta, timezone
+
+class PostScheduler:
+    """Priority queue of game posts ordered by deadline (first pitch minus a lead time).
+
+    Games with no known start time (TBD) go last. A failed post is re-queued with its
+    original deadline, so it is retried before any game that starts later.
+    """
+
+    def __init__(self, lead_time=timedelta(minutes=90), max_attempts=2):
+        self.lead_time = lead_time
+        self.max_attempts = max_attempts
+        self._queue = []
+        self._sequence = itertools.count()  # Keeps input order stable for equal deadlines
+
+    def deadline_for(self, game_topic):
+        """Latest time the preview should be live, or None when the game time is TBD"""
+        if game_topic.game_start is None:
+            return None
+        return game_topic.game_start - self.lead_time
+
+    def add(self, game_topic, attempt=1):
+        deadline = self.deadline_for(game_topic)
+        sort_key = (deadline is None, deadline.timestamp() if deadline else 0.0)
+        heapq.heappush(self._queue, (sort_key, next(self._sequence), attempt, game_topic))
+
+    def pop(self):
+        """Return (game_topic, attempt) for the most urgent game"""
+        _, _, attempt, game_topic = heapq.heappop(self._queue)
+        return game_topic, attempt
+
+    def retry(self, game_topic, attempt):
+        """Re-queue a failed game ahead of later games; False once attempts are used up"""
+        if attempt >= self.max_attempts:
+            return False
+        self.add(game_topic, attempt + 1)
+        return True
+
+    def has_started(self, game_topic, now=None):
+        """True once first pitch has passed (a preview is no longer useful)"""
+        if game_topic.game_start is None:
+            return False
+        return game_topic.game_start <= (now or datetime.now(timezone.utc))
+
+    def __len__(self):
+        return len(self._queue)
@@ -0,0 +1,267 @@
+# post_validator.py
+import json
+import re
+from bisect import bisect_left
+
+PREAMBLE = 'preamble'
+
+# One pass over the post picks out every token the contract cares about. Alternatives are
+# tried in order, so ### must come before ## and # (headings swallow their own line)
+POST_TOKENS = re.compile(r"""
+    ^(?P<h3>\#\#\#[ \t]+[^\n]*)
+  | ^(?P<h2>\#\#[ \t]+[^\n]*)
+  | ^(?P<title>\#[ \t]+[^\n]*)
+  | ^(?P<updated>\*Last\ updated:)
+  | ^(?P<game_time>\*\*Game\ Time:\*\*)
+  | (?P<html></?(?:h[1-6]|p|div|span|ul|ol|li|strong|em|b|i|br|a|table)\b[^>]*>)
+  | (?P<mph>(?<![\w.])\d+(?:\.\d+)?(?=\s?mph\b))
+  | (?P<percent>(?<![\w.])\d+(?:\.\d+)?(?=\s?%))
+  | (?P<points>(?<![\w.])\d+(?:\.\d+)?(?=\s?(?:points?|pts?)\b))
+  | (?P<avg>(?<![\w.])0?\.\d{3}(?!\d))
+""", re.MULTILINE | re.VERBOSE)
+
+# Numbers inside game_data strings, e.g. the arsenal prose "Slider (18% usage, 87.0 mph)"
+DATA_NUMBERS = re.compile(r"(\d+(?:\.\d+)?)\s?(%|mph\b|x\b)?")
+HEADING_KEY = re.compile(r"[\W_]+")
+
+# The game_data fields a post quotes stats from. Betting lines, game time, chart URLs and
+# the like carry numbers too, but they are not stats and are not checked
+STAT_FIELDS = tuple(
+    f'{side}_{field}' for side in ('away', 'home') for field in (
+        'pitcher', 'lineup_advantage', 'lineup_k_advantage', 'season_ba', 'arsenal_ba',
+        'season_k_pct', 'arsenal_k_pct', 'key_performers'
+    )
+) + ('umpire_k_boost', 'umpire_bb_boost', 'umpire_profile', 'prop_alerts')
+# A percent is only a stat when it is quoted as pitch usage, a K% or an umpire's boost;
+# "58% of the handle" is not. Looked for on the same line, just around the number
+STAT_PERCENT_CONTEXT = re.compile(r"usage|\bK\b|strikeout|walk", re.IGNORECASE)
+STAT_PERCENT_WINDOW = (30, 15)
+
+# Thresholds the prompt asks the post to quote when explaining a lean
+CRITERIA_VALUES = {
+    'avg': (0.300, 0.020),
+    'percent': (25, 4, 3),
+    'points': (20, 15)
+}
+STAT_LABELS = {'avg': 'batting average', 'percent': 'percentage', 'mph': 'velocity', 'points': 'point difference'}
+
+def _heading_key(line):
+    # Markdown emphasis and emoji vary between completions; the words must not
+    return HEADING_KEY.sub('', line.lstrip('#')).lower()
+
+def _tolerance(kind, token):
+    # One and a half units in the last digit written: rounded and truncated values pass, and
+    # so do differences the post works out from values it has already rounded
+    decimals = len(token.partition('.')[2])
+    return 1.5 * 10 ** -decimals + 1e-9
+
+def _is_stat_percent(text, match):
+    line_start = text.rfind('\n', 0, match.start()) + 1
+    line_end = text.find('\n', match.end())
+    line_end = len(text) if line_end == -1 else line_end
+    before, after = STAT_PERCENT_WINDOW
+    return STAT_PERCENT_CONTEXT.search(text, max(line_start, match.start() - before), min(line_end, match.end() + after)) is not None
+
+class GameStats:
+    """Every stat value a post for one game may quote, sorted per kind for bisect lookups"""
+    __slots__ = ('values',)
+
+    def __init__(self, values):
+        self.values = {kind: sorted(set(numbers)) for kind, numbers in values.items()}
+
+    @classmethod
+    def from_game_data(cls, game_data):
+        """Collect values from the STAT_FIELDS of the game_data dict (or its JSON), plus the
+        differences the post is asked to derive"""
+        if isinstance(game_data, str):
+            game_data = json.loads(game_data)
+        values = {kind: list(numbers) for kind, numbers in CRITERIA_VALUES.items()}
+        values['mph'] = []
+
+        def add_number(number):
+            number = abs(number)
+            values['percent'].append(number)  # K% fields and K% differences
+            if number < 1:
+                values['avg'].append(number)  # BA/xBA and BA differences...
+                values['points'].append(number * 1000)  # ...which posts quote as points
+
+        def walk(value):
+            if isinstance(value, bool):
+                return
+            if isinstance(value, (int, float)):
+                add_number(value)
+            elif isinstance(value, str):
+                for number, unit in DATA_NUMBERS.findall(value):
+                    if unit == '%':
+                        values['percent'].append(float(number))
+                    elif unit == 'mph':
+                        values['mph'].append(float(number))
+                    elif unit == 'x':
+                        values['percent'].append(abs(float(number) - 1) * 100)  # 1.11x = +11%
+            elif isinstance(value, dict):
+                for item in value.values():
+                    walk(item)
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    walk(item)
+
+        for field in STAT_FIELDS:
+            walk(game_data.get(field))
+        for side in ('away', 'home'):
+            for stat in ('k_pct', 'ba'):
+                if f'{side}_arsenal_{stat}' in game_data and f'{side}_season_{stat}' in game_data:
+                    add_number(game_data[f'{side}_arsenal_{stat}'] - game_data[f'{side}_season_{stat}'])
+        return cls(values)
+
+    def allows(self, kind, value, tolerance):
+        values = self.values.get(kind, ())
+        index = bisect_left(values, value - tolerance)
+        return index < len(values) and values[index] <= value + tolerance
+
+class PostContract:
+    """What one target's post for one game must contain: headings in order, CTA link and stats"""
+    __slots__ = ('headings', 'cta_url', 'stats')
+
+    def __init__(self, headings, cta_url, stats):
+        self.headings = tuple(headings)  # ((section, '## heading'), ...) from BlogPromptBuilder
+        self.cta_url = cta_url
+        self.stats = stats
+
+    def heading(self, section):
+        return dict(self.headings).get(section)
+
+class ValidationIssue:
+    __slots__ = ('section', 'message')
+
+    def __init__(self, section, message):
+        self.section = section
+        self.message = message
+
+    def __repr__(self):
+        return f"ValidationIssue({self.section!r}, {self.message!r})"
+
+class PostValidation:
+    """Issues found in a post, and where each section sits so it can be replaced on its own"""
+    __slots__ = ('issues', 'spans')
+
+    def __init__(self, issues, spans):
+        self.issues = issues
+        self.spans = spans  # section -> (start, end) in the text; missing sections are absent
+
+    @property
+    def ok(self):
+        return not self.issues
+
+    def failing_sections(self):
+        sections = []
+        for issue in self.issues:
+            if issue.section not in sections:
+                sections.append(issue.section)
+        return sections
+
+    def issues_for(self, section):
+        return [issue.message for issue in self.issues if issue.section == section]
+
+    def summary(self):
+        return '; '.join(f"{issue.section}: {issue.message}" for issue in self.issues)
+
+def validate_post(text, contract):
+    """Check a generated post against its contract in a single scan of the text.
+
+    Structure (title, last-updated line, game time, every ## section once, two pitcher
+    subsections, CTA link, no HTML) and every stat quoted - usage %, mph, BA/xBA, K%,
+    umpire boost and point difference - which must match a value in the game data's
+    STAT_FIELDS, allowing for rounding. Other numbers are left alone. Issues are attributed
+    to the section they occur in.
+    """
+    expected = {_heading_key(heading): section for section, heading in contract.headings}
+    issues = []
+    starts = [(PREAMBLE, 0)]
+    seen = {PREAMBLE}
+    markers = set()
+    subsections = 0
+    current = PREAMBLE
+
+    for match in POST_TOKENS.finditer(text):
+        kind = match.lastgroup
+        token = match.group(kind)
+        if kind == 'h2':
+            section = expected.get(_heading_key(token))
+            if section is None:
+                issues.append(ValidationIssue(current, f"unexpected heading '{token.strip()}'"))
+            elif section in seen:
+                issues.append(ValidationIssue(current, f"'{token.strip()}' appears more than once"))
+            else:
+                seen.add(section)
+                starts.append((section, match.start()))
+                current = section
+        elif kind == 'h3':
+            if current == 'pitchers':
+                subsections += 1
+        elif kind in ('title', 'updated', 'game_time'):
+            if current == PREAMBLE:
+                markers.add(kind)
+        elif kind == 'html':
+            issues.append(ValidationIssue(current, f"HTML tag {token} instead of Markdown"))
+        elif kind != 'percent' or _is_stat_percent(text, match):
+            value = float(token)
+            if not contract.stats.allows(kind, value, _tolerance(kind, token)):
+                unit = {'percent': '%', 'mph': ' mph', 'points': ' points'}.get(kind, '')
+                issues.append(ValidationIssue(current, f"{STAT_LABELS[kind]} {token}{unit} is not in the game data"))
+
+    spans = {}
+    for (section, start), (_, end) in zip(starts, starts[1:] + [(None, len(text))]):
+        spans[section] = (start, end)
+
+    for kind, label in (('title', "'# ' title"), ('updated', "'*Last updated:*' line"), ('game_time', "'**Game Time:**' line")):
+        if kind not in markers:
+            issues.append(ValidationIssue(PREAMBLE, f"missing {label} before the first section"))
+    for section, heading in contract.headings:
+        if section not in spans:
+            issues.append(ValidationIssue(section, f"missing section '{heading}'"))
+        elif not text[spans[section][0]:spans[section][1]].partition('\n')[2].strip():
+            issues.append(ValidationIssue(section, f"section '{heading}' is empty"))
+    if 'pitchers' in spans and subsections < 2:
+        issues.append(ValidationIssue('pitchers', f"expected a ### subsection per starting pitcher, found {subsections}"))
+    if contract.cta_url not in text:
+        issues.append(ValidationIssue(contract.headings[-1][0], f"missing CTA link to {contract.cta_url}"))
+
+    return PostValidation(issues, spans)
+
+def section_repair_request(contract, validation, section):
+    """Follow-up instruction asking the model to rewrite one failing section of its post"""
+    problems = '\n'.join(f"- {message}" for message in validation.issues_for(section))
+    action = "Rewrite ONLY" if section in validation.spans else "Write ONLY the missing part of the post:"
+    if section == PREAMBLE:
+        scope = "the opening of the post: the '# ' title, the '*Last updated:*' line and the '**Game Time:**' line, and nothing after them"
+    else:
+        scope = f"the section starting with the exact heading line `{contract.heading(section)}`, and stop before the next ## heading"
+        if section == contract.headings[-1][0]:
+            scope += f". End it with the call to action linking to {contract.cta_url}"
+    return (
+        f"The post above fails these checks:\n{problems}\n\n"
+        f"{action} {scope}. Use only numbers from the game data, in Markdown with no HTML. "
+        f"Output just the rewritten text."
+    )
+
+def splice_sections(text, validation, contract, replacements):
+    """Text with each {section: new text} swapped in, or inserted where it belongs if missing"""
+    order = [PREAMBLE] + [name for name, _ in contract.headings]
+    edits = []
+    for section, replacement in replacements.items():
+        replacement = replacement.strip('\n') + '\n\n'
+        if section != PREAMBLE and not replacement.startswith('#'):
+            replacement = f"{contract.heading(section)}\n\n{replacement}"
+        if section in validation.spans:
+            start, end = validation.spans[section]
+        else:
+            # Missing: insert before the next section that is present, else at the end
+            later = [validation.spans[name][0] for name in order[order.index(section) + 1:] if name in validation.spans]
+            start = end = later[0] if later else len(text)
+            if not later:
+                replacement = '\n\n' + replacement
+        edits.append((start, end, replacement))
+    # Back to front, so earlier spans stay valid
+    for start, end, replacement in sorted(edits, reverse=True):
+        text = text[:start] + replacement + text[end:]
+    return text
@@ -0,0 +1,55 @@
+# publish_targets.py
+import json
+import os
+
+DEFAULT_SITE_URL = "https://www.thebettinginsider.com"
+DEFAULT_CUSTOM_DOMAINS = (
+    "67e2e299d35c6ac356b6d8d4",  # thebettinginsider.com
+    "67e2e299d35c6ac356b6d8ca"   # www.thebettinginsider.com
+)
+
+class PublishTarget:
+    """One Webflow site/collection that receives a copy of every post.
+
+    template names an entry in the prompt template variants and authors is the pool of
+    author names posts for this site are credited to (empty means every author).
+    """
+    __slots__ = ('name', 'site_id', 'collection_id', 'site_url', 'custom_domains', 'template', 'authors')
+
+    def __init__(self, name, site_id, collection_id, site_url=DEFAULT_SITE_URL,
+                 custom_domains=DEFAULT_CUSTOM_DOMAINS, template='standard', authors=()):
+        self.name = name
+        self.site_id = site_id
+        self.collection_id = collection_id
+        self.site_url = site_url.rstrip('/')
+        self.custom_domains = tuple(custom_domains)
+        self.template = template
+        self.authors = tuple(authors)
+
+    def __repr__(self):
+        return f"PublishTarget({self.name!r}, site={self.site_id}, collection={self.collection_id})"
+
+def load_publish_targets(environ=os.environ):
+    """Targets from WEBFLOW_TARGETS, or the single WEBFLOW_SITE_ID/WEBFLOW_COLLECTION_ID site.
+
+    WEBFLOW_TARGETS is a JSON list (or a path to a JSON file) of objects with the
+    PublishTarget fields, e.g.
+        [{"name": "insider", "site_id": "...", "collection_id": "..."},
+         {"name": "props", "site_id": "...", "collection_id": "...", "site_url": "https://...",
+          "custom_domains": [], "template": "quick-hit", "authors": ["Ryan Chen"]}]
+    The first target is the primary one: shared images are uploaded to its asset library.
+    """
+    raw = environ.get('WEBFLOW_TARGETS')
+    if not raw:
+        return [PublishTarget('default', environ.get('WEBFLOW_SITE_ID'), environ.get('WEBFLOW_COLLECTION_ID'))]
+
+    if not raw.lstrip().startswith('['):
+        with open(raw) as f:
+            raw = f.read()
+    try:
+        targets = [PublishTarget(**entry) for entry in json.loads(raw)]
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"WEBFLOW_TARGETS is not a valid list of targets: {e}")
+    if not targets:
+        raise ValueError("WEBFLOW_TARGETS must list at least one target")
+    return targets
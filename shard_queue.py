@@ -0,0 +1,205 @@
+# shard_queue.py
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timezone
+
+SHARD_QUEUE_DB = os.environ.get('SHARD_QUEUE_DB', os.path.join('.cache', 'shards.sqlite3'))
+# A worker that stops renewing its lease for this long is presumed dead and its shard is re-leased
+SHARD_LEASE_SECONDS = float(os.environ.get('SHARD_LEASE_SECONDS', '300'))
+SHARD_MAX_ATTEMPTS = int(os.environ.get('SHARD_MAX_ATTEMPTS', '2'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shard_runs (
+    run_id TEXT PRIMARY KEY,
+    game_date TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    payloads TEXT NOT NULL,
+    stale_feeds TEXT NOT NULL,
+    published_at TEXT
+);
+CREATE TABLE IF NOT EXISTS shards (
+    run_id TEXT NOT NULL,
+    shard INTEGER NOT NULL,
+    matchups TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    posts INTEGER,
+    error TEXT,
+    PRIMARY KEY (run_id, shard)
+);
+"""
+
+def shard_for(matchup, shards):
+    """Stable shard number for a matchup - the same on every process and node, and
+    a doubleheader's two games always land together"""
+    digest = hashlib.blake2b(matchup.upper().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % shards
+
+class ShardLease:
+    """One claimed shard of a run"""
+    __slots__ = ('run_id', 'shard', 'matchups', 'attempt', 'worker')
+
+    def __init__(self, run_id, shard, matchups, attempt, worker):
+        self.run_id = run_id
+        self.shard = shard
+        self.matchups = matchups
+        self.attempt = attempt
+        self.worker = worker
+
+class ShardRun:
+    """A queued slate: the feed payloads every worker builds its topics from"""
+    __slots__ = ('run_id', 'game_date', 'payloads', 'stale_feeds', 'published_at')
+
+    def __init__(self, run_id, game_date, payloads, stale_feeds, published_at=None):
+        self.run_id = run_id
+        self.game_date = game_date
+        self.payloads = payloads
+        self.stale_feeds = stale_feeds  # feed -> ISO time the cached copy was from, or None
+        self.published_at = published_at
+
+    def payload(self, game_date, feed):
+        # Same interface as SlateArchive, so slate_replay.ReplayFetcher can read it
+        return self.payloads.get(feed) if game_date == self.game_date else None
+
+class ShardQueue:
+    """Slate shards leased to worker processes through one SQLite file, with no broker.
+
+    The coordinator enqueues a run (the fetched feeds plus each shard's matchups);
+    workers on this machine or any node that shares the file claim shards one at a
+    time under a renewable lease, so a worker that dies only delays its shard. Each
+    claim is one short write transaction. SQLite's locking needs a filesystem with
+    working POSIX locks, so a network volume should be NFSv4 or similar.
+    """
+
+    def __init__(self, path=SHARD_QUEUE_DB, lease_seconds=SHARD_LEASE_SECONDS, max_attempts=SHARD_MAX_ATTEMPTS, clock=time.time):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Autocommit; writes take the lock up front with BEGIN IMMEDIATE
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _write(self, statements):
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = statements()
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+        return result
+
+    def enqueue(self, run_id, game_date, payloads, stale_feeds, matchups, shards):
+        """Queue a run split into shards by matchup hash; returns {shard: [matchups]}.
+        Shards that would be empty are not created."""
+        split = {}
+        for matchup in matchups:
+            split.setdefault(shard_for(matchup, shards), []).append(matchup)
+
+        def insert():
+            self.connection.execute(
+                "INSERT INTO shard_runs (run_id, game_date, created_at, payloads, stale_feeds) VALUES (?, ?, ?, ?, ?)",
+                (run_id, game_date.isoformat(), datetime.now(timezone.utc).isoformat(), json.dumps(payloads), json.dumps(stale_feeds))
+            )
+            self.connection.executemany(
+                "INSERT INTO shards (run_id, shard, matchups) VALUES (?, ?, ?)",
+                [(run_id, shard, json.dumps(shard_matchups)) for shard, shard_matchups in sorted(split.items())]
+            )
+        self._write(insert)
+        return split
+
+    def latest_run_id(self):
+        row = self.connection.execute("SELECT run_id FROM shard_runs ORDER BY created_at DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def run(self, run_id):
+        row = self.connection.execute(
+            "SELECT game_date, payloads, stale_feeds, published_at FROM shard_runs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"no shard run '{run_id}'")
+        return ShardRun(run_id, date.fromisoformat(row[0]), json.loads(row[1]), json.loads(row[2]), row[3])
+
+    def _expire(self, run_id, now):
+        self.connection.execute(
+            """UPDATE shards SET state = 'failed', error = 'lease expired ' || attempts || ' times'
+               WHERE run_id = ? AND state = 'leased' AND lease_expires < ? AND attempts >= ?""",
+            (run_id, now, self.max_attempts)
+        )
+
+    def claim(self, run_id, worker):
+        """Lease the next pending (or abandoned) shard of a run, or None when none is left.
+        A shard abandoned max_attempts times is marked failed instead of re-leased."""
+        now = self.clock()
+
+        def claim_next():
+            self._expire(run_id, now)
+            row = self.connection.execute(
+                """SELECT shard, matchups, attempts FROM shards
+                   WHERE run_id = ? AND (state = 'pending' OR (state = 'leased' AND lease_expires < ?))
+                   ORDER BY shard LIMIT 1""",
+                (run_id, now)
+            ).fetchone()
+            if row is None:
+                return None
+            shard, matchups, attempts = row
+            self.connection.execute(
+                "UPDATE shards SET state = 'leased', worker = ?, lease_expires = ?, attempts = ? WHERE run_id = ? AND shard = ?",
+                (worker, now + self.lease_seconds, attempts + 1, run_id, shard)
+            )
+            return ShardLease(run_id, shard, json.loads(matchups), attempts + 1, worker)
+        return self._write(claim_next)
+
+    def renew(self, lease):
+        """Extend a lease; False if it was lost (expired and taken by another worker)"""
+        cursor = self.connection.execute(
+            "UPDATE shards SET lease_expires = ? WHERE run_id = ? AND shard = ? AND state = 'leased' AND worker = ?",
+            (self.clock() + self.lease_seconds, lease.run_id, lease.shard, lease.worker)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, lease, posts):
+        self.connection.execute(
+            "UPDATE shards SET state = 'done', posts = ?, error = NULL WHERE run_id = ? AND shard = ? AND worker = ?",
+            (posts, lease.run_id, lease.shard, lease.worker)
+        )
+
+    def fail(self, lease, error):
+        """Give a shard back after an error; it is retried until max_attempts"""
+        state = 'failed' if lease.attempt >= self.max_attempts else 'pending'
+        self.connection.execute(
+            "UPDATE shards SET state = ?, error = ?, lease_expires = NULL WHERE run_id = ? AND shard = ? AND worker = ?",
+            (state, error, lease.run_id, lease.shard, lease.worker)
+        )
+
+    def progress(self, run_id):
+        """{state: shard count} for a run, plus 'posts' created so far"""
+        counts = dict(self.connection.execute(
+            "SELECT state, COUNT(*) FROM shards WHERE run_id = ? GROUP BY state", (run_id,)
+        ).fetchall())
+        counts['posts'] = self.connection.execute(
+            "SELECT COALESCE(SUM(posts), 0) FROM shards WHERE run_id = ?", (run_id,)
+        ).fetchone()[0]
+        return counts
+
+    def is_finished(self, run_id):
+        """True once every shard is done or failed. A lease that expired with attempts
+        left stays open until a worker takes it over"""
+        self._write(lambda: self._expire(run_id, self.clock()))
+        progress = self.progress(run_id)
+        return not progress.get('pending') and not progress.get('leased')
+
+    def mark_published(self, run_id):
+        self.connection.execute(
+            "UPDATE shard_runs SET published_at = ? WHERE run_id = ?", (datetime.now(timezone.utc).isoformat(), run_id)
+        )
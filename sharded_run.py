@@ -0,0 +1,191 @@
+# sharded_run.py
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime
+from async_http import AsyncHttpClient
+from generation import GenerationDispatcher
+from main import PUBLISH_TARGETS, open_openai_client, publish_slate_async, publish_webflow_site_async
+from mlb_data_fetcher import MLBDataFetcher
+from shard_queue import SHARD_LEASE_SECONDS, SHARD_QUEUE_DB, ShardQueue
+from slate_replay import ReplayFetcher
+
+# How long the coordinator waits for remote workers before publishing whatever is done
+SHARD_WAIT_SECONDS = float(os.environ.get('SHARD_WAIT_SECONDS', str(4 * 3600)))
+SHARD_POLL_SECONDS = min(5.0, SHARD_LEASE_SECONDS / 4)
+# Grace for local workers to exit before they are killed
+WORKER_EXIT_SECONDS = 30
+
+class CapturingFetcher(MLBDataFetcher):
+    """Live fetcher that keeps every feed payload it used, for the shard workers to replay"""
+
+    def __init__(self):
+        super().__init__()
+        self.payloads = {}
+
+    async def _fetch_feed(self, http, name, url):
+        payload = await super()._fetch_feed(http, name, url)
+        self.payloads[name] = payload
+        return payload
+
+    async def get_umpire_data_async(self, http):
+        assignments = await super().get_umpire_data_async(http)
+        if 'umpire' not in self.payloads and assignments:
+            # Reused from the umpire table rather than fetched: rebuild the feed's shape
+            self.payloads['umpire'] = [
+                {'matchup': a.matchup, 'umpire': a.umpire, 'k_boost': f"{a.k_boost}x", 'bb_boost': f"{a.bb_boost}x"}
+                for a in assignments
+            ]
+        return assignments
+
+def shard_fetcher(shard_run):
+    """Fetcher that rebuilds the coordinator's topics from the queued payloads"""
+    fetcher = ReplayFetcher(shard_run, shard_run.game_date)
+    fetcher.stale_feeds = {
+        name: datetime.fromisoformat(stale_since) if stale_since else None
+        for name, stale_since in shard_run.stale_feeds.items()
+    }
+    return fetcher
+
+async def enqueue_slate_async(http, queue, shards):
+    """Fetch the feeds once and queue today's games split into shards; returns the run id"""
+    fetcher = CapturingFetcher()
+    blog_topics = await fetcher.get_blog_topics_from_games_async(http)
+    # The suffix keeps coordinators started in the same second apart
+    run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    stale_feeds = {name: stale_since.isoformat() if stale_since else None for name, stale_since in fetcher.stale_feeds.items()}
+    split = queue.enqueue(
+        run_id, fetcher.slate_date(), fetcher.payloads, stale_feeds,
+        sorted({blog_topic.matchup for blog_topic in blog_topics}), shards
+    )
+    print(f"🧩 Queued run {run_id}: {len(blog_topics)} games in {len(split)} shards")
+    return run_id
+
+async def work_async(queue, run_id, worker=None, targets=PUBLISH_TARGETS):
+    """Claim and process shards of a run until every shard is done or failed; returns posts created.
+
+    Posts are created but the sites are not published - the coordinator does that once.
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    shard_run = queue.run(run_id)
+    posts = 0
+    async with AsyncHttpClient() as http, open_openai_client() as openai_client:
+        generator = GenerationDispatcher(openai_client)
+        while not queue.is_finished(run_id):
+            lease = queue.claim(run_id, worker)
+            if lease is None:
+                # Everything left is leased; wait in case a lease expires and needs taking over
+                await asyncio.sleep(SHARD_POLL_SECONDS)
+                continue
+            print(f"\n🧩 {worker} took shard {lease.shard} of {run_id} (attempt {lease.attempt}): {', '.join(lease.matchups)}")
+            processing = asyncio.ensure_future(publish_slate_async(
+                http, generator, targets, lease.matchups, mlb_fetcher=shard_fetcher(shard_run), publish=False
+            ))
+            heartbeat = asyncio.ensure_future(_keep_lease(queue, lease, processing))
+            try:
+                shard_posts = await processing
+            except asyncio.CancelledError:
+                if not heartbeat.done():
+                    raise  # The worker itself is being stopped
+                print(f"  ⚠️ Lost the lease on shard {lease.shard} - another worker has it now")
+                continue
+            except Exception as e:
+                print(f"  ❌ Shard {lease.shard} failed: {e}")
+                queue.fail(lease, str(e))
+                continue
+            finally:
+                heartbeat.cancel()
+            queue.complete(lease, shard_posts)
+            posts += shard_posts
+    return posts
+
+async def _keep_lease(queue, lease, processing):
+    # Renew well inside the lease; a lost lease means someone else is redoing the shard
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        if not queue.renew(lease):
+            processing.cancel()
+            return
+
+async def publish_run_async(queue, run_id, targets=PUBLISH_TARGETS):
+    """Publish every target once for a finished run"""
+    progress = queue.progress(run_id)
+    if not progress['posts']:
+        print(f"❌ Run {run_id} created no posts - nothing to publish")
+        return False
+    print(f"\n🌊 Publishing {progress['posts']} posts from run {run_id}...")
+    async with AsyncHttpClient() as http:
+        published = await asyncio.gather(*(publish_webflow_site_async(http, target) for target in targets))
+    if all(published):
+        queue.mark_published(run_id)
+        print(f"🎉 Successfully published {progress['posts']} blog posts to Webflow!")
+    return all(published)
+
+def coordinate(shards, workers, queue_path=SHARD_QUEUE_DB, wait_seconds=SHARD_WAIT_SECONDS):
+    """Queue today's slate, start local workers (if any), wait for every shard and publish once"""
+    queue = ShardQueue(queue_path)
+    async def enqueue():
+        async with AsyncHttpClient() as http:
+            return await enqueue_slate_async(http, queue, shards)
+    run_id = asyncio.run(enqueue())
+
+    command = [sys.executable, os.path.abspath(__file__), 'work', '--run', run_id, '--queue', queue_path]
+    processes = [subprocess.Popen(command) for _ in range(workers)]
+    if not workers:
+        print(f"⏳ Waiting for workers: python {os.path.basename(__file__)} work --run {run_id}")
+    started = time.monotonic()
+    while not queue.is_finished(run_id):
+        if processes and all(process.poll() is not None for process in processes):
+            print("⚠️ Every local worker has exited with shards left over")
+            break
+        if time.monotonic() - started > wait_seconds:
+            print(f"⚠️ Gave up waiting for workers after {wait_seconds / 3600:.1f} hours")
+            break
+        time.sleep(SHARD_POLL_SECONDS)
+    if not queue.is_finished(run_id):
+        # Past the deadline (or stuck): stop the local workers and publish what is done
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=WORKER_EXIT_SECONDS)
+        except subprocess.TimeoutExpired:
+            print(f"⚠️ Worker {process.pid} did not exit - killing it")
+            process.kill()
+            process.wait()
+
+    progress = queue.progress(run_id)
+    print(f"🧩 Run {run_id}: {progress.get('done', 0)} shards done, {progress.get('failed', 0)} failed, {progress['posts']} posts")
+    published = asyncio.run(publish_run_async(queue, run_id))
+    queue.close()
+    return published
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the daily slate split across worker processes")
+    queue_option = argparse.ArgumentParser(add_help=False)
+    queue_option.add_argument('--queue', default=SHARD_QUEUE_DB, help="SQLite queue file (on a shared volume for multiple nodes)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    coordinate_parser = commands.add_parser('coordinate', parents=[queue_option], help="queue today's slate, wait for the shards and publish")
+    coordinate_parser.add_argument('--shards', type=int, default=8)
+    coordinate_parser.add_argument('--workers', type=int, default=4, help="local worker processes to start (0 for remote workers only)")
+    work_parser = commands.add_parser('work', parents=[queue_option], help="process shards of a queued run")
+    work_parser.add_argument('--run', help="run id (default: the latest queued run)")
+    args = parser.parse_args()
+
+    if args.command == 'coordinate':
+        ok = coordinate(args.shards, args.workers, args.queue)
+    else:
+        queue = ShardQueue(args.queue)
+        run_id = args.run or queue.latest_run_id()
+        if run_id is None:
+            raise SystemExit("No queued runs")
+        posts = asyncio.run(work_async(queue, run_id))
+        print(f"✅ Worker finished: {posts} posts created")
+        ok = True
+    raise SystemExit(0 if ok else 1)
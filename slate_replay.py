@@ -0,0 +1,39 @@
+# slate_replay.py
+import asyncio
+from feed_client import FeedUnavailable
+from fixture_archive import SlateArchive
+from mlb_data_fetcher import MLBDataFetcher
+from umpire_store import UmpireStore
+
+class ReplayFetcher(MLBDataFetcher):
+    """MLBDataFetcher that reads one archived day's payloads instead of calling the feeds.
+
+    Everything after the HTTP layer runs as in a live run, except that umpire data goes
+    to an in-memory table and nothing is added to the matchup history.
+    """
+
+    def __init__(self, archive, game_date):
+        super().__init__()
+        self.archive = archive
+        self.game_date = game_date
+        self._umpire_store = UmpireStore(':memory:')
+
+    async def _fetch_feed(self, http, name, url):
+        payload = self.archive.payload(self.game_date, name)
+        if payload is None:
+            self.stale_feeds[name] = None
+            raise FeedUnavailable(f"{name} feed was not recorded for {self.game_date}")
+        return payload
+
+    def record_matchups(self, mlb_reports, game_date=None):
+        return 0
+
+    def get_blog_topics(self):
+        """The day's blog topics, with no network access"""
+        return asyncio.run(self.get_blog_topics_from_games_async(None))
+
+def replay_topics(path, dates=None):
+    """Yield (date, blog topics) for each archived day (or just the given dates), offline"""
+    with SlateArchive(path) as archive:
+        for game_date in dates or archive.dates():
+            yield game_date, ReplayFetcher(archive, game_date).get_blog_topics()
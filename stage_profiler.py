@@ -0,0 +1,296 @@
+# stage_profiler.py
+import cProfile
+import contextlib
+import functools
+import inspect
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+
+# Set to a directory to profile every run there (main.py --profile does the same)
+PROFILE_DIR = os.environ.get('PROFILE_DIR')
+# Functions and allocation sites kept per stage in the reports
+PROFILE_TOP = int(os.environ.get('PROFILE_TOP', '30'))
+# Calls per stage that get tracemalloc snapshots; each costs a walk of every live allocation
+PROFILE_SNAPSHOT_CALLS = int(os.environ.get('PROFILE_SNAPSHOT_CALLS', '3'))
+
+STAGES = ('fetch', 'topic_build', 'prompt', 'generate', 'link', 'render', 'upload', 'post', 'publish')
+
+# The RunProfiler of the run in progress; None (the default) means every hook is a pass-through
+_active = None
+_NULL_CONTEXT = contextlib.nullcontext()
+# The profiler's own bookkeeping is left out of the allocator lists
+OWN_FILES = (tracemalloc.__file__, __file__)
+
+class StageStats:
+    """Everything measured for one stage over a run"""
+    __slots__ = ('name', 'profile', 'calls', 'wall_seconds', 'allocated', 'peak', 'allocations')
+
+    def __init__(self, name):
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.calls = 0
+        self.wall_seconds = 0.0
+        self.allocated = 0  # Net bytes still allocated when the stage's code gave up control
+        self.peak = 0  # Largest rise in traced memory within one uninterrupted run of the stage
+        self.allocations = {}  # 'file:line' -> [size_diff, count_diff] over the stage's calls
+
+class _Step:
+    # One uninterrupted run of a stage's code: from resume until it returns or awaits
+    __slots__ = ('stats', 'start_memory', 'peak_memory', 'child_allocated')
+
+    def __init__(self, stats, start_memory):
+        self.stats = stats
+        self.start_memory = start_memory
+        self.peak_memory = start_memory
+        self.child_allocated = 0
+
+class RunProfiler:
+    """Per-stage cProfile and tracemalloc capture for one pipeline run.
+
+    Stages interleave on the event loop, so profiling is switched per step rather than
+    per call: a stage's profiler is only enabled while its own code is running, and a
+    stage entered from inside another is counted there and not in the outer one. CPU
+    profiles and byte counts are therefore exact. Top allocators come from tracemalloc
+    snapshots around the first few synchronous calls of a stage (render, prompt, link,
+    topic_build); an awaiting call's snapshots would include whatever ran alongside it. Wall time is
+    summed over calls, so concurrent calls can add up to more than the run took.
+    """
+
+    def __init__(self, run_dir):
+        self.run_dir = run_dir
+        self.stages = {}
+        self._steps = []
+        self._snapshotting = False
+        self.started_at = None
+        self._started = None
+
+    def stats_for(self, name):
+        if name not in self.stages:
+            self.stages[name] = StageStats(name)
+        return self.stages[name]
+
+    def start(self):
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        tracemalloc.start()
+
+    def stop(self):
+        while self._steps:
+            self._suspend()
+        tracemalloc.stop()
+
+    def _resume(self, stats):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._steps:
+            outer = self._steps[-1]
+            outer.stats.profile.disable()
+            outer.peak_memory = max(outer.peak_memory, peak)
+        tracemalloc.reset_peak()
+        self._steps.append(_Step(stats, current))
+        stats.profile.enable()
+
+    def _suspend(self):
+        step = self._steps.pop()
+        step.stats.profile.disable()
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, step.peak_memory)
+        allocated = current - step.start_memory
+        step.stats.allocated += allocated - step.child_allocated
+        step.stats.peak = max(step.stats.peak, peak - step.start_memory)
+        if self._steps:
+            outer = self._steps[-1]
+            outer.peak_memory = max(outer.peak_memory, peak)
+            outer.child_allocated += allocated
+            outer.stats.profile.enable()
+
+    @contextlib.contextmanager
+    def _paused(self):
+        # Keep the bookkeeping itself out of whichever stage is running
+        if self._steps:
+            self._steps[-1].stats.profile.disable()
+        try:
+            yield
+        finally:
+            if self._steps:
+                self._steps[-1].stats.profile.enable()
+
+    @contextlib.contextmanager
+    def call(self, name):
+        """Count one call of a stage and its wall time"""
+        stats = self.stats_for(name)
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.calls += 1
+            stats.wall_seconds += time.perf_counter() - started
+
+    @contextlib.contextmanager
+    def _allocations(self, stats):
+        # Snapshot diff around the outermost synchronous call; nested calls are part of it
+        if self._snapshotting or stats.calls >= PROFILE_SNAPSHOT_CALLS:
+            yield
+            return
+        self._snapshotting = True
+        with self._paused():
+            before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            with self._paused():
+                after = tracemalloc.take_snapshot()
+                for stat in after.compare_to(before, 'lineno')[:PROFILE_TOP]:
+                    if not stat.size_diff:
+                        break
+                    if stat.traceback[0].filename in OWN_FILES:
+                        continue
+                    where = str(stat.traceback[0])
+                    totals = stats.allocations.setdefault(where, [0, 0])
+                    totals[0] += stat.size_diff
+                    totals[1] += stat.count_diff
+                del before, after
+            self._snapshotting = False
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        """Profile a synchronous block as one call of a stage"""
+        with self.call(name) as stats, self._allocations(stats):
+            self._resume(stats)
+            try:
+                yield
+            finally:
+                self._suspend()
+
+    def profile_awaitable(self, name, awaitable):
+        return _ProfiledAwaitable(self, name, awaitable)
+
+    def write_report(self):
+        """Dump <stage>.prof and <stage>.txt per stage and summary.json to the run directory"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        summary = {
+            'started_at': self.started_at.isoformat(),
+            'seconds': round(time.perf_counter() - self._started, 3),
+            'stages': {}
+        }
+        for name in sorted(self.stages, key=lambda name: STAGES.index(name) if name in STAGES else len(STAGES)):
+            stats = self.stages[name]
+            stats.profile.create_stats()
+            if not stats.profile.stats:
+                continue
+            stats.profile.dump_stats(os.path.join(self.run_dir, f"{name}.prof"))
+            report = io.StringIO()
+            profile_stats = pstats.Stats(stats.profile, stream=report)
+            profile_stats.sort_stats('cumulative').print_stats(PROFILE_TOP)
+            allocators = sorted(stats.allocations.items(), key=lambda item: -item[1][0])[:PROFILE_TOP]
+            if allocators:
+                report.write("Top allocators (net bytes, net blocks):\n")
+            for where, (size, count) in allocators:
+                report.write(f"  {size / 1024:10.1f} KiB {count:8d}  {where}\n")
+            with open(os.path.join(self.run_dir, f"{name}.txt"), 'w') as f:
+                f.write(report.getvalue())
+            summary['stages'][name] = {
+                'calls': stats.calls,
+                'wall_seconds': round(stats.wall_seconds, 3),
+                'cpu_seconds': round(profile_stats.total_tt, 3),
+                'allocated_bytes': stats.allocated,
+                'peak_bytes': stats.peak,
+                'top_allocators': [{'where': where, 'bytes': size, 'blocks': count} for where, (size, count) in allocators[:10]]
+            }
+        with open(os.path.join(self.run_dir, 'summary.json'), 'w') as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+class _ProfiledAwaitable:
+    """Drives a coroutine one step at a time, with its stage profiled only during each step"""
+    __slots__ = ('profiler', 'name', 'awaitable')
+
+    def __init__(self, profiler, name, awaitable):
+        self.profiler = profiler
+        self.name = name
+        self.awaitable = awaitable
+
+    def __await__(self):
+        profiler = self.profiler
+        iterator = self.awaitable.__await__()
+        value, error = None, None
+        with profiler.call(self.name) as stats:
+            while True:
+                profiler._resume(stats)
+                try:
+                    yielded = iterator.throw(error) if error is not None else iterator.send(value)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    profiler._suspend()
+                try:
+                    value, error = (yield yielded), None
+                except GeneratorExit:
+                    iterator.close()
+                    raise
+                except BaseException as e:  # Cancellation included - the coroutine must see it
+                    value, error = None, e
+
+def stage(name):
+    """Decorator counting every call of a function (sync or async) towards a stage"""
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if _active is None:
+                    return func(*args, **kwargs)
+                return _active.profile_awaitable(name, func(*args, **kwargs))
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if _active is None:
+                    return func(*args, **kwargs)
+                with _active.measure(name):
+                    return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def measure(name):
+    """Context manager counting a synchronous block towards a stage"""
+    return _NULL_CONTEXT if _active is None else _active.measure(name)
+
+def profiled(name, awaitable):
+    """awaitable, counted towards a stage when profiling"""
+    return awaitable if _active is None else _active.profile_awaitable(name, awaitable)
+
+def describe(summary):
+    lines = [f"{'stage':<12} {'calls':>5} {'wall s':>8} {'cpu s':>7} {'alloc MiB':>9} {'peak MiB':>8}"]
+    for name, stage_summary in summary['stages'].items():
+        lines.append(
+            f"{name:<12} {stage_summary['calls']:>5} {stage_summary['wall_seconds']:>8.2f} {stage_summary['cpu_seconds']:>7.2f} "
+            f"{stage_summary['allocated_bytes'] / 2**20:>9.1f} {stage_summary['peak_bytes'] / 2**20:>8.1f}"
+        )
+    return '\n'.join(lines)
+
+@contextlib.contextmanager
+def profiling(profile_dir):
+    """Profile every stage run inside the block, writing the reports to a new run directory
+    under profile_dir. With profile_dir None nothing is installed and the hooks stay no-ops."""
+    global _active
+    if not profile_dir:
+        yield None
+        return
+    if _active is not None:
+        raise RuntimeError("a profiled run is already in progress")
+    profiler = RunProfiler(os.path.join(profile_dir, datetime.now().strftime('%Y%m%d-%H%M%S')))
+    _active = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        _active = None
+        profiler.stop()
+        try:
+            summary = profiler.write_report()
+            print(f"🔬 Stage profiles written to {profiler.run_dir}\n{describe(summary)}")
+        except OSError as e:
+            print(f"⚠️ Could not write stage profiles: {e}")
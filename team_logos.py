@@ -0,0 +1,155 @@
+# team_logos.py
+import asyncio
+import os
+import re
+from PIL import Image
+from async_http import HttpError
+
+LOGO_URL_TEMPLATE = "https://a.espncdn.com/i/teamlogos/mlb/500/{code}.png"
+DEFAULT_LOGO_CODE = 'mlb'
+LOGO_CACHE_DIR = os.environ.get('LOGO_CACHE_DIR', os.path.join('.cache', 'logos'))
+
+# ==================== MLB TEAM LOGOS ====================
+TEAM_LOGOS = {
+    'NYY': 'nyy', 'Yankees': 'nyy',
+    'TOR': 'tor', 'Blue Jays': 'tor',
+    'BOS': 'bos', 'Red Sox': 'bos',
+    'LAD': 'lad', 'Dodgers': 'lad',
+    'SF': 'sf', 'Giants': 'sf',
+    'HOU': 'hou', 'Astros': 'hou',
+    'ATL': 'atl', 'Braves': 'atl',
+    'NYM': 'nym', 'Mets': 'nym',
+    'PHI': 'phi', 'Phillies': 'phi',
+    'WSN': 'wsh', 'WSH': 'wsh', 'Nationals': 'wsh',
+    'MIA': 'mia', 'Marlins': 'mia',
+    'CHC': 'chc', 'Cubs': 'chc',
+    'MIL': 'mil', 'Brewers': 'mil',
+    'STL': 'stl', 'Cardinals': 'stl',
+    'CIN': 'cin', 'Reds': 'cin',
+    'PIT': 'pit', 'Pirates': 'pit',
+    'LAA': 'laa', 'Angels': 'laa',
+    'SEA': 'sea', 'Mariners': 'sea',
+    'TEX': 'tex', 'Rangers': 'tex',
+    'OAK': 'oak', 'ATH': 'oak', 'Athletics': 'oak',
+    'MIN': 'min', 'Twins': 'min',
+    'CWS': 'chw', 'White Sox': 'chw',
+    'CLE': 'cle', 'Guardians': 'cle',
+    'DET': 'det', 'Tigers': 'det',
+    'KC': 'kc', 'Royals': 'kc',
+    'TB': 'tb', 'Rays': 'tb',
+    'BAL': 'bal', 'Orioles': 'bal',
+    'COL': 'col', 'Rockies': 'col',
+    'ARI': 'ari', 'AZ': 'ari', 'Diamondbacks': 'ari',
+    'SD': 'sd', 'Padres': 'sd'
+}
+
+TEAM_FULL_NAMES = {
+    'New York Yankees': 'nyy', 'Toronto Blue Jays': 'tor', 'Toronto': 'tor',
+    'Boston Red Sox': 'bos', 'Boston': 'bos', 'Los Angeles Dodgers': 'lad',
+    'San Francisco Giants': 'sf', 'Houston Astros': 'hou', 'Atlanta Braves': 'atl',
+    'New York Mets': 'nym', 'Philadelphia Phillies': 'phi', 'Washington Nationals': 'wsh',
+    'Miami Marlins': 'mia', 'Chicago Cubs': 'chc', 'Milwaukee Brewers': 'mil',
+    'St Louis Cardinals': 'stl', 'Cincinnati Reds': 'cin', 'Pittsburgh Pirates': 'pit',
+    'Los Angeles Angels': 'laa', 'Seattle Mariners': 'sea', 'Texas Rangers': 'tex',
+    'Oakland Athletics': 'oak', 'Minnesota Twins': 'min', 'Chicago White Sox': 'chw',
+    'Cleveland Guardians': 'cle', 'Detroit Tigers': 'det', 'Kansas City Royals': 'kc',
+    'Tampa Bay Rays': 'tb', 'Baltimore Orioles': 'bal', 'Colorado Rockies': 'col',
+    'Arizona Diamondbacks': 'ari', 'San Diego Padres': 'sd'
+}
+
+_NON_ALNUM = re.compile(r'[^A-Z0-9]+')
+
+def normalize_team_name(team_name):
+    """Uppercase and collapse punctuation/whitespace: 'St. Louis  Cardinals' -> 'ST LOUIS CARDINALS'"""
+    return _NON_ALNUM.sub(' ', team_name.upper()).strip()
+
+def _build_logo_index():
+    index = {}
+    for aliases in (TEAM_LOGOS, TEAM_FULL_NAMES):
+        for alias, code in aliases.items():
+            index[normalize_team_name(alias)] = code
+    return index
+
+# Normalized alias -> ESPN logo code, built once at import
+LOGO_INDEX = _build_logo_index()
+
+def resolve_team_code(team_name):
+    """ESPN logo code for a team code, nickname or full name (None if unknown).
+
+    Besides exact aliases, trailing words are tried so feed names like 'CHI White Sox'
+    resolve via 'WHITE SOX'. A bare 'SOX' matches nothing rather than the wrong team.
+    """
+    key = normalize_team_name(team_name or '')
+    code = LOGO_INDEX.get(key)
+    if code:
+        return code
+    words = key.split()
+    for start in range(1, len(words)):
+        code = LOGO_INDEX.get(' '.join(words[start:]))
+        if code:
+            return code
+    return None
+
+def get_team_logo_url(team_name):
+    """Get official team logo URL from ESPN"""
+    code = resolve_team_code(team_name)
+    if not code:
+        print(f"⚠️  No logo match found for: {team_name}")
+        code = DEFAULT_LOGO_CODE
+    return LOGO_URL_TEMPLATE.format(code=code)
+
+def _logo_path(code):
+    return os.path.join(LOGO_CACHE_DIR, f"{code}.png")
+
+def _save_logo_file(code, content):
+    os.makedirs(LOGO_CACHE_DIR, exist_ok=True)
+    tmp_path = _logo_path(code) + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, _logo_path(code))
+
+# Logo code -> decoded RGBA image, kept for the life of the process
+_DECODED_LOGOS = {}
+
+def _load_logo_file(code):
+    # Disk only: this runs on the event loop, so downloading is left to download_logos_async
+    with Image.open(_logo_path(code)) as image:
+        return image.convert('RGBA')
+
+def get_team_logo_image(team_name):
+    """Decoded 500 px RGBA logo for a team from the local cache.
+
+    Returns None if the logo is not on disk (download_logos_async fetches missing
+    ones). Callers must copy before drawing on it.
+    """
+    code = resolve_team_code(team_name) or DEFAULT_LOGO_CODE
+    if code not in _DECODED_LOGOS:
+        try:
+            _DECODED_LOGOS[code] = _load_logo_file(code)
+        except Exception as e:
+            print(f"⚠️ Could not load logo '{code}' for {team_name}: {e}")
+            return None
+    return _DECODED_LOGOS[code]
+
+def warm_logo_cache(team_names):
+    """Pre-decode a slate's downloaded logos so compositing never waits on disk"""
+    return sum(1 for name in team_names if get_team_logo_image(name) is not None)
+
+async def download_logos_async(http, team_names):
+    """Fetch any logos missing from the disk cache concurrently; returns how many were downloaded"""
+    codes = {resolve_team_code(name) or DEFAULT_LOGO_CODE for name in team_names}
+    missing = [code for code in codes if not os.path.exists(_logo_path(code))]
+
+    async def download(code):
+        url = LOGO_URL_TEMPLATE.format(code=code)
+        try:
+            response = await http.get(url, timeout=15)
+            if response.status_code != 200:
+                raise HttpError(response.status_code, url)
+            _save_logo_file(code, response.content)
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not download logo '{code}': {e}")
+            return False
+
+    return sum(await asyncio.gather(*(download(code) for code in missing)))
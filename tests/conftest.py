@@ -0,0 +1,20 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main.py refuses to import without credentials and a target; nothing here talks to either
+for name in ('OPENAI_API_KEY', 'WEBFLOW_API_TOKEN', 'WEBFLOW_SITE_ID', 'WEBFLOW_COLLECTION_ID'):
+    os.environ.setdefault(name, f"test-{name.lower()}")
+
+# Keep every cache and store out of the working tree's .cache
+_CACHE_DIR = tempfile.mkdtemp(prefix='mlb-blog-tests-')
+for name, filename in (
+    ('FEED_CACHE_DIR', 'feeds'), ('LOGO_CACHE_DIR', 'logos'), ('COVER_UPLOAD_INDEX', 'covers.json'),
+    ('GENERATION_LOG', 'generations.jsonl'), ('MATCHUP_STORE_DIR', 'matchups'), ('UMPIRE_DB', 'umpires.sqlite3'),
+    ('SHARD_QUEUE_DB', 'shards.sqlite3'),
+):
+    os.environ[name] = os.path.join(_CACHE_DIR, filename)
+os.environ['WEBFLOW_ITEM_INDEX'] = ':memory:'
@@ -0,0 +1,30 @@
+# tests/test_blog_service.py
+import asyncio
+from aiohttp import test_utils
+from blog_service import TOKEN_HEADER, BlogService, serve
+
+def request(service, method, path, headers=None):
+    async def send():
+        async with test_utils.TestClient(test_utils.TestServer(service.app())) as client:
+            response = await client.request(method, path, headers=headers)
+            return response.status
+    return asyncio.run(send())
+
+def test_requests_without_the_token_are_refused():
+    service = BlogService(targets=[], run_at='', token='s3cret')
+    assert request(service, 'GET', '/status') == 401
+    assert request(service, 'POST', '/slate', {TOKEN_HEADER: 'wrong'}) == 401
+    assert request(service, 'POST', '/game?matchup=NYY @ BOS') == 401
+    assert service.current is None  # Nothing was started
+
+def test_requests_with_the_token_are_served():
+    service = BlogService(targets=[], run_at='', token='s3cret')
+    assert request(service, 'GET', '/status', {TOKEN_HEADER: 's3cret'}) == 200
+    assert request(service, 'POST', '/game', {TOKEN_HEADER: 's3cret'}) == 400  # No matchup given
+
+def test_service_with_no_token_configured_refuses_everything():
+    service = BlogService(targets=[], run_at='', token=None)
+    assert request(service, 'GET', '/status', {TOKEN_HEADER: ''}) == 401
+
+def test_serve_will_not_start_without_a_token():
+    assert asyncio.run(serve(token=None)) == 1
@@ -0,0 +1,37 @@
+# tests/test_post_validator.py
+from post_validator import GameStats, PostContract, validate_post
+
+HEADINGS = [('pitchers', '## Pitcher Breakdown')]
+GAME_DATA = {
+    'betting_info': 'NYY -130 (58% of handle)',
+    'away_pitcher': {'name': 'Gerrit Cole', 'arsenal': 'Four-Seam Fastball (35.4% usage, 97.14 mph)'},
+    'away_season_ba': 0.2897,
+    'away_arsenal_ba': 0.3304,
+    'away_season_k_pct': 22.04,
+    'away_arsenal_k_pct': 27.06,
+    'away_pitcher_chart_url': 'https://cdn.example.com/charts/cole-20250708-61.5.png',
+}
+
+def stat_issues(body):
+    text = (
+        "# NYY vs BOS\n*Last updated: July 08, 2025*\n\n**Game Time:** 7:05 PM ET\n\n"
+        f"## Pitcher Breakdown\n### Cole\n### Bello\n{body}\n\nhttps://site.example.com/betting/about\n"
+    )
+    contract = PostContract(HEADINGS, 'https://site.example.com/betting/about', GameStats.from_game_data(GAME_DATA))
+    return [issue.message for issue in validate_post(text, contract).issues]
+
+def test_rounded_stats_and_differences_of_rounded_stats_pass():
+    assert stat_issues(
+        "Four-Seam Fastball (35% usage, 97.1 mph). The lineup hits .290 but projects to .330 (+40 points). "
+        "Their K% rises from 22.0% to 27.1%, up 5.1%."
+    ) == []
+
+def test_numbers_that_are_not_stats_are_not_checked():
+    assert stat_issues("NYY draws 58% of the handle; a 61.5% favourite by the numbers.") == []
+
+def test_stats_missing_from_the_stat_fields_are_reported():
+    assert stat_issues("He sits at 61.5 mph with 58% usage and a .412 xBA.") == [
+        'velocity 61.5 mph is not in the game data',
+        'percentage 58% is not in the game data',
+        'batting average .412 is not in the game data',
+    ]
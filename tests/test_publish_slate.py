@@ -0,0 +1,179 @@
+# tests/test_publish_slate.py
+import asyncio
+import json
+from datetime import datetime, timedelta
+import pytest
+import main
+from generation import GenerationResult
+from mlb_data_fetcher import GAME_TIME_ZONE, MLBDataFetcher
+from webflow_items import WEBFLOW_ITEMS
+
+def arsenal(speed):
+    return {
+        'FF': {'name': 'Four-Seam Fastball', 'usage_rate': 0.52, 'avg_speed': speed},
+        'SL': {'name': 'Slider', 'usage_rate': 0.48, 'avg_speed': speed - 10},
+    }
+
+def key_matchups(away_pitcher, home_pitcher):
+    return [
+        {'batter': 'Judge, Aaron', 'vs_pitcher': home_pitcher, 'reliability': 'HIGH',
+         'baseline_stats': {'season_avg': 0.290, 'season_k_pct': 26.0}, 'weighted_est_ba': 0.330, 'weighted_k_rate': 24.0},
+        {'batter': 'Devers, Rafael', 'vs_pitcher': away_pitcher, 'reliability': 'MEDIUM',
+         'baseline_stats': {'season_avg': 0.270, 'season_k_pct': 22.0}, 'weighted_est_ba': 0.250, 'weighted_k_rate': 27.0},
+    ]
+
+def game_report(away_pitcher, home_pitcher, speed):
+    return {
+        'matchup': 'NYY @ BOS',
+        'pitchers': {
+            'away': {'name': away_pitcher, 'id': away_pitcher, 'arsenal': arsenal(speed)},
+            'home': {'name': home_pitcher, 'id': home_pitcher, 'arsenal': arsenal(speed - 2)},
+        },
+        'key_matchups': key_matchups(away_pitcher, home_pitcher),
+    }
+
+def betting_game(time):
+    return {
+        'away_team': 'NY Yankees', 'home_team': 'BOS Red Sox', 'time': time,
+        'markets': {'Moneyline': [
+            {'team': 'NY Yankees', 'odds': '-130', 'handle_pct': '58%'},
+            {'team': 'BOS Red Sox', 'odds': '+110', 'handle_pct': '42%'},
+        ]},
+    }
+
+class DoubleheaderFetcher(MLBDataFetcher):
+    """Tomorrow's NYY @ BOS doubleheader; by default the betting feed lists the night game first"""
+
+    def __init__(self, betting_times=('07:05PM', '01:05PM')):
+        super().__init__()
+        self.game_date = datetime.now(GAME_TIME_ZONE).date() + timedelta(days=1)
+        self.betting_times = betting_times
+
+    async def fetch_feeds_async(self, http):
+        reports = [game_report('Cole, Gerrit', 'Bello, Brayan', 97.0), game_report('Rodon, Carlos', 'Crochet, Garrett', 95.0)]
+        return reports, [], [betting_game(time) for time in self.betting_times]
+
+class StubGenerator:
+    """Echoes the prompt's required structure, which is enough to pass validation, with
+    a line naming the game it was given under each heading"""
+
+    async def generate(self, messages, max_tokens, temperature):
+        prompt = messages[-1]['content']
+        game_data = json.loads(prompt.split('Game Data (JSON):')[1])
+        summary = f"{game_data['away_pitcher']['name']} faces {game_data['home_pitcher']['name']} on {game_data['game_time']}."
+        lines = []
+        for line in prompt.split('CRITICAL RULES')[0].splitlines():
+            if line.startswith(('# ', '*Last updated', '**Game Time', '[')):
+                lines.append(line)
+            elif line.startswith(('## ', '### ')):
+                lines += [line, summary]
+        return GenerationResult('\n'.join(lines), 'stub', 0.0)
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.payload = payload
+        self.text = str(payload)
+
+    def json(self):
+        return self.payload
+
+class FakeWebflow:
+    """Just enough of AsyncHttpClient for listing, creating and updating CMS items"""
+
+    def __init__(self):
+        self.items = {}  # slug -> (item id, fieldData)
+        self.requests = []
+
+    async def get_json(self, url, params=None, **kwargs):
+        self.requests.append(('GET', url))
+        listed = [{'id': item_id, 'fieldData': {'slug': slug}} for slug, (item_id, _) in self.items.items()]
+        return {'items': listed[params['offset']:params['offset'] + params['limit']], 'pagination': {'total': len(listed)}}
+
+    async def post(self, url, json=None, **kwargs):
+        self.requests.append(('POST', url))
+        await asyncio.sleep(0)
+        item_id = f"item-{len(self.items) + 1}"
+        self.items[json['fieldData']['slug']] = (item_id, json['fieldData'])
+        return FakeResponse(202, {'id': item_id})
+
+    async def request(self, method, url, json=None, **kwargs):
+        self.requests.append((method, url))
+        item_id = url.rsplit('/', 1)[1]
+        slug = json['fieldData']['slug']
+        self.items[slug] = (item_id, json['fieldData'])
+        return FakeResponse(200, {'id': item_id})
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    async def no_charts(http, mlb_fetcher, blog_topic):
+        return None
+
+    async def no_cover(blog_topic, upload, index=None):
+        return None
+
+    async def no_logos(http, team_names):
+        return 0
+
+    monkeypatch.setattr(main, 'upload_pitch_mix_charts_async', no_charts)
+    monkeypatch.setattr(main, 'get_cover_image_url_async', no_cover)
+    monkeypatch.setattr(main, 'download_logos_async', no_logos)
+    monkeypatch.setattr(main, 'warm_logo_cache', lambda team_names: 0)
+    monkeypatch.setattr(main.asyncio, 'sleep', _no_delay(asyncio.sleep))
+    yield FakeWebflow()
+    WEBFLOW_ITEMS.close()  # Back to an empty in-memory index
+
+def _no_delay(sleep):
+    async def fast_sleep(delay, *args, **kwargs):
+        return await sleep(0, *args)
+    return fast_sleep
+
+def publish(webflow, generator, mlb_fetcher=None):
+    return asyncio.run(main.publish_slate_async(
+        webflow, generator, [main.PRIMARY_TARGET], mlb_fetcher=mlb_fetcher or DoubleheaderFetcher(), publish=False
+    ))
+
+def test_doubleheader_games_each_get_their_own_post(pipeline):
+    assert publish(pipeline, StubGenerator()) == 2
+
+    game_date = (datetime.now(GAME_TIME_ZONE).date() + timedelta(days=1)).isoformat()
+    first, second = f"nyy-at-bos-mlb-betting-preview-{game_date}", f"nyy-at-bos-mlb-betting-preview-{game_date}-game-2"
+    assert sorted(pipeline.items) == [first, second]
+    # Each game has its own betting game: the day game is game 1 even though it is listed second
+    assert 'Gerrit Cole faces Brayan Bello on' in pipeline.items[first][1]['post-body']
+    assert '1:05 PM ET' in pipeline.items[first][1]['post-body']
+    assert 'Carlos Rodon faces Garrett Crochet on' in pipeline.items[second][1]['post-body']
+    assert '7:05 PM ET' in pipeline.items[second][1]['post-body']
+    assert [slug for slug, _ in WEBFLOW_ITEMS.find(main.PRIMARY_TARGET.collection_id, matchup='NYY @ BOS')] == [first, second]
+
+def test_rerun_updates_both_doubleheader_posts_in_place(pipeline):
+    publish(pipeline, StubGenerator())
+    items = dict(pipeline.items)
+    pipeline.requests.clear()
+
+    assert publish(pipeline, StubGenerator()) == 2
+    assert {slug: item_id for slug, (item_id, _) in pipeline.items.items()} == {slug: item_id for slug, (item_id, _) in items.items()}
+    assert sorted(method for method, _ in pipeline.requests) == ['PATCH', 'PATCH']
+
+def test_tbd_game_is_dated_by_its_slate_not_the_run(pipeline):
+    # The betting feed only lists the first game yet, so game 2 has no start time
+    assert publish(pipeline, StubGenerator(), DoubleheaderFetcher(betting_times=('01:05PM',))) == 2
+
+    game_date = datetime.now(GAME_TIME_ZONE).date() + timedelta(days=1)
+    first, second = f"nyy-at-bos-mlb-betting-preview-{game_date}", f"nyy-at-bos-mlb-betting-preview-{game_date}-game-2"
+    assert sorted(pipeline.items) == [first, second]
+    # The title and meta description carry the game's date too, not the run's
+    for slug in (first, second):
+        fields = pipeline.items[slug][1]
+        assert fields['name'].endswith(f"({game_date:%b %d})")
+        assert f"{game_date:%B %d} MLB betting insights" in fields['meta-description']
+
+class BrokenGenerator:
+    """Never writes a post that validates, not even when asked to repair it"""
+
+    async def generate(self, messages, max_tokens, temperature):
+        return GenerationResult('<p>Cole throws 123.4 mph.</p>', 'stub', 0.0)
+
+def test_post_that_cannot_be_repaired_is_published_anyway(pipeline):
+    assert publish(pipeline, BrokenGenerator()) == 2
+    assert len(pipeline.items) == 2
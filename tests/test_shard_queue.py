@@ -0,0 +1,165 @@
+# tests/test_shard_queue.py
+import asyncio
+from datetime import date
+import pytest
+import sharded_run
+from shard_queue import ShardQueue, shard_for
+
+GAME_DATE = date(2025, 7, 8)
+MATCHUPS = ['NYY @ BOS', 'TB @ TOR', 'LAD @ SF', 'ATL @ NYM', 'CHC @ MIL']
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / 'shards.sqlite3')
+
+def open_queue(queue_path, clock, **kwargs):
+    return ShardQueue(queue_path, lease_seconds=60, max_attempts=2, clock=clock, **kwargs)
+
+def enqueue(queue, matchups=MATCHUPS, shards=1, run_id='run-1'):
+    return queue.enqueue(run_id, GAME_DATE, {'mlb': {'reports': []}}, {}, matchups, shards)
+
+def test_shard_for_is_stable_and_case_insensitive():
+    assert shard_for('NYY @ BOS', 8) == shard_for('nyy @ bos', 8)
+    assert 0 <= shard_for('NYY @ BOS', 8) < 8
+
+def test_enqueue_splits_by_matchup_and_skips_empty_shards(queue_path, clock):
+    queue = open_queue(queue_path, clock)
+    split = enqueue(queue, shards=64)
+    assert sorted(matchup for matchups in split.values() for matchup in matchups) == sorted(MATCHUPS)
+    assert queue.progress('run-1') == {'pending': len(split), 'posts': 0}
+    assert queue.run('run-1').payload(GAME_DATE, 'mlb') == {'reports': []}
+
+def test_leased_shard_is_not_handed_out_twice(queue_path, clock):
+    queue = open_queue(queue_path, clock)
+    enqueue(queue)
+    lease = queue.claim('run-1', 'w1')
+    assert lease.attempt == 1 and lease.matchups == MATCHUPS
+    assert queue.claim('run-1', 'w2') is None
+    assert not queue.is_finished('run-1')
+
+def test_expired_lease_is_taken_over_and_the_old_worker_loses_it(queue_path, clock):
+    queue = open_queue(queue_path, clock)
+    enqueue(queue)
+    first = queue.claim('run-1', 'w1')
+    clock.now += 30
+    assert queue.renew(first)  # Renewed inside the lease: good for another 60 s from now
+    clock.now += 59
+    assert queue.claim('run-1', 'w2') is None
+
+    clock.now += 2
+    second = queue.claim('run-1', 'w2')
+    assert (second.shard, second.attempt, second.worker) == (first.shard, 2, 'w2')
+    assert not queue.renew(first)
+
+    # The late first worker finishing changes nothing; the shard belongs to w2 now
+    queue.complete(first, 3)
+    assert queue.progress('run-1') == {'leased': 1, 'posts': 0}
+    queue.complete(second, 4)
+    assert queue.progress('run-1') == {'done': 1, 'posts': 4}
+    assert queue.is_finished('run-1')
+
+def test_shard_abandoned_max_attempts_times_fails(queue_path, clock):
+    queue = open_queue(queue_path, clock)
+    enqueue(queue)
+    queue.claim('run-1', 'w1')
+    clock.now += 61
+    queue.claim('run-1', 'w2')
+    clock.now += 61
+    assert queue.claim('run-1', 'w3') is None
+    assert queue.is_finished('run-1')
+    assert queue.progress('run-1') == {'failed': 1, 'posts': 0}
+
+def test_failed_shard_is_retried_until_max_attempts(queue_path, clock):
+    queue = open_queue(queue_path, clock)
+    enqueue(queue)
+    queue.fail(queue.claim('run-1', 'w1'), 'boom')
+    assert queue.progress('run-1') == {'pending': 1, 'posts': 0}
+    retry = queue.claim('run-1', 'w2')
+    assert retry.attempt == 2
+    queue.fail(retry, 'boom again')
+    assert queue.claim('run-1', 'w3') is None
+    assert queue.is_finished('run-1')
+    assert queue.progress('run-1') == {'failed': 1, 'posts': 0}
+
+def test_workers_create_every_shard_once_and_the_run_publishes_once(queue_path, clock, monkeypatch):
+    processed = []
+    published = []
+
+    async def publish_slate(http, generator, targets, matchups=None, publishers=None, mlb_fetcher=None, publish=True):
+        processed.append((tuple(matchups), publish))
+        await asyncio.sleep(0)
+        return len(matchups)
+
+    async def publish_site(http, target):
+        published.append(target)
+        return True
+
+    monkeypatch.setattr(sharded_run, 'publish_slate_async', publish_slate)
+    monkeypatch.setattr(sharded_run, 'publish_webflow_site_async', publish_site)
+    monkeypatch.setattr(sharded_run, 'SHARD_POLL_SECONDS', 0.01)
+    split = enqueue(open_queue(queue_path, clock), shards=4)
+
+    async def run_workers():
+        # One queue connection per worker, as separate processes would have
+        return await asyncio.gather(*(
+            sharded_run.work_async(open_queue(queue_path, clock), 'run-1', worker, targets=['insider', 'props'])
+            for worker in ('w1', 'w2')
+        ))
+    posts = asyncio.run(run_workers())
+
+    assert sum(posts) == len(MATCHUPS)
+    assert sorted(processed) == sorted((tuple(matchups), False) for matchups in split.values())
+    assert published == []  # Workers never publish the sites themselves
+
+    queue = open_queue(queue_path, clock)
+    assert asyncio.run(sharded_run.publish_run_async(queue, 'run-1', targets=['insider', 'props']))
+    assert published == ['insider', 'props']
+    assert queue.run('run-1').published_at is not None
+
+def test_run_with_no_posts_is_not_published(queue_path, clock, monkeypatch):
+    published = []
+
+    async def publish_site(http, target):
+        published.append(target)
+        return True
+
+    monkeypatch.setattr(sharded_run, 'publish_webflow_site_async', publish_site)
+    queue = open_queue(queue_path, clock)
+    enqueue(queue)
+    queue.fail(queue.claim('run-1', 'w1'), 'boom')
+    queue.fail(queue.claim('run-1', 'w1'), 'boom')
+    assert not asyncio.run(sharded_run.publish_run_async(queue, 'run-1', targets=['insider']))
+    assert published == []
+    assert queue.run('run-1').published_at is None
+
+def test_coordinator_stops_hung_local_workers_at_the_deadline(queue_path, monkeypatch):
+    started = []
+    popen = sharded_run.subprocess.Popen
+
+    async def enqueue_slate(http, queue, shards):
+        enqueue(queue, shards=shards)
+        return 'run-1'
+
+    def hung_worker(command):
+        # Stands in for a worker whose heartbeat keeps its lease alive while generation hangs
+        started.append(popen([sharded_run.sys.executable, '-c', 'import time; time.sleep(600)']))
+        return started[-1]
+
+    monkeypatch.setattr(sharded_run, 'enqueue_slate_async', enqueue_slate)
+    monkeypatch.setattr(sharded_run.subprocess, 'Popen', hung_worker)
+    monkeypatch.setattr(sharded_run, 'SHARD_POLL_SECONDS', 0.05)
+
+    assert not sharded_run.coordinate(2, 2, queue_path, wait_seconds=0.2)
+    assert len(started) == 2
+    assert all(process.poll() is not None for process in started)
@@ -0,0 +1,143 @@
+# umpire_store.py
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from mlb_records import UmpireAssignment
+
+UMPIRE_DB = os.environ.get('UMPIRE_DB', os.path.join('.cache', 'umpires.sqlite3'))
+# A slate's assignments fetched this recently are reused instead of hitting the feed again
+UMPIRE_REFRESH_MINUTES = float(os.environ.get('UMPIRE_REFRESH_MINUTES', '30'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS umpire_assignments (
+    game_date TEXT NOT NULL,
+    matchup TEXT NOT NULL,
+    umpire TEXT NOT NULL,
+    k_boost REAL NOT NULL,
+    bb_boost REAL NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (game_date, matchup)
+);
+CREATE INDEX IF NOT EXISTS umpire_assignments_by_umpire ON umpire_assignments (umpire, game_date);
+CREATE TABLE IF NOT EXISTS umpire_refreshes (
+    game_date TEXT PRIMARY KEY,
+    refreshed_at TEXT NOT NULL
+);
+"""
+
+def parse_boost(boost, default=1.0):
+    """Umpire multiplier such as '1.11x' as a float"""
+    try:
+        return float(str(boost).rstrip('x'))
+    except ValueError:
+        return default
+
+def parse_umpire_feed(umpires):
+    """UmpireAssignment records from the umpire feed, with the boosts parsed once"""
+    return [
+        UmpireAssignment(ump.get('matchup', '-'), ump.get('umpire', 'TBA'), parse_boost(ump.get('k_boost')), parse_boost(ump.get('bb_boost')))
+        for ump in umpires
+    ]
+
+class UmpireIndex:
+    """One slate's assignments keyed by matchup, with the feed's loose matchup fallback"""
+
+    def __init__(self, assignments):
+        self.assignments = list(assignments)
+        self._by_matchup = {}
+        for assignment in self.assignments:
+            self._by_matchup.setdefault(assignment.matchup, assignment)
+
+    def find(self, matchup):
+        assignment = self._by_matchup.get(matchup)
+        if assignment is not None or ' @ ' not in matchup:
+            return assignment
+        # Feed matchups sometimes carry extra text around the team codes
+        away_team, home_team = matchup.split(' @ ')
+        for assignment in self.assignments:
+            if away_team in assignment.matchup and home_team in assignment.matchup:
+                return assignment
+        return None
+
+class UmpireStore:
+    """Umpire assignments by game date and matchup, kept in SQLite across runs.
+
+    Each refresh writes only the rows that changed, so the table doubles as a history
+    of every umpire's games for trend queries without any network calls.
+    """
+
+    def __init__(self, path=UMPIRE_DB):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def refresh(self, game_date, assignments, now=None):
+        """Make the stored slate match the feed's assignments: rows are upserted, and a matchup
+        the feed no longer lists (a postponed game, a changed key) is removed. Returns how many
+        rows were new, changed or removed"""
+        now = (now or datetime.now(timezone.utc)).isoformat()
+        day = game_date.isoformat()
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                """INSERT INTO umpire_assignments (game_date, matchup, umpire, k_boost, bb_boost, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (game_date, matchup) DO UPDATE SET
+                       umpire = excluded.umpire, k_boost = excluded.k_boost,
+                       bb_boost = excluded.bb_boost, updated_at = excluded.updated_at
+                   WHERE umpire != excluded.umpire OR k_boost != excluded.k_boost OR bb_boost != excluded.bb_boost""",
+                [(day, a.matchup, a.umpire, a.k_boost, a.bb_boost, now) for a in assignments]
+            )
+            current = {a.matchup for a in assignments}
+            dropped = [
+                (day, matchup) for (matchup,) in self.connection.execute(
+                    "SELECT matchup FROM umpire_assignments WHERE game_date = ?", (day,)
+                ) if matchup not in current
+            ]
+            self.connection.executemany("DELETE FROM umpire_assignments WHERE game_date = ? AND matchup = ?", dropped)
+            changed = self.connection.total_changes - before
+            self.connection.execute(
+                "INSERT OR REPLACE INTO umpire_refreshes (game_date, refreshed_at) VALUES (?, ?)", (day, now)
+            )
+        return changed
+
+    def last_refresh(self, game_date):
+        row = self.connection.execute(
+            "SELECT refreshed_at FROM umpire_refreshes WHERE game_date = ?", (game_date.isoformat(),)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def is_fresh(self, game_date, max_age_minutes=UMPIRE_REFRESH_MINUTES, now=None):
+        refreshed_at = self.last_refresh(game_date)
+        if refreshed_at is None:
+            return False
+        return (now or datetime.now(timezone.utc)) - refreshed_at < timedelta(minutes=max_age_minutes)
+
+    def assignments(self, game_date):
+        rows = self.connection.execute(
+            "SELECT matchup, umpire, k_boost, bb_boost FROM umpire_assignments WHERE game_date = ? ORDER BY matchup",
+            (game_date.isoformat(),)
+        )
+        return [UmpireAssignment(*row) for row in rows]
+
+    def history(self, umpire, since=None, until=None):
+        """[(game_date, UmpireAssignment)] for one umpire, oldest first"""
+        rows = self.connection.execute(
+            """SELECT game_date, matchup, umpire, k_boost, bb_boost FROM umpire_assignments
+               WHERE umpire = ? AND game_date >= ? AND game_date <= ? ORDER BY game_date""",
+            (umpire, since.isoformat() if since else '', until.isoformat() if until else '9999')
+        )
+        return [(datetime.strptime(row[0], '%Y-%m-%d').date(), UmpireAssignment(*row[1:])) for row in rows]
+
+    def season_trend(self, umpire, season):
+        """[(month 'YYYY-MM', games, average k_boost, average bb_boost)] for one umpire's season"""
+        return self.connection.execute(
+            """SELECT substr(game_date, 1, 7), COUNT(*), AVG(k_boost), AVG(bb_boost) FROM umpire_assignments
+               WHERE umpire = ? AND game_date LIKE ? GROUP BY 1 ORDER BY 1""",
+            (umpire, f"{season}-%")
+        ).fetchall()
@@ -0,0 +1,175 @@
+# webflow_items.py
+import asyncio
+import os
+import re
+import sqlite3
+from datetime import date, datetime, timezone
+from mlb_data_fetcher import GAME_TIME_ZONE
+
+WEBFLOW_ITEM_INDEX = os.environ.get('WEBFLOW_ITEM_INDEX', os.path.join('.cache', 'webflow_items.sqlite3'))
+# Items per page when listing a collection (the API maximum)
+LIST_PAGE_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS webflow_items (
+    collection_id TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    matchup TEXT,
+    game_date TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (collection_id, slug)
+);
+CREATE INDEX IF NOT EXISTS webflow_items_by_game ON webflow_items (collection_id, game_date, matchup);
+CREATE TABLE IF NOT EXISTS webflow_collections (
+    collection_id TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+"""
+
+SLUG_UNSAFE = re.compile(r"[^a-z0-9]+")
+# Slugs post_slug() produces, so game details can be recovered from listed items
+POST_SLUG = re.compile(r"^(?P<away>[a-z0-9]+)-at-(?P<home>[a-z0-9]+)-mlb-betting-preview-(?P<date>\d{4}-\d{2}-\d{2})(?:-game-\d+)?$")
+
+def game_date_for(game_topic):
+    """The game's date in Eastern time: its slate's date, so a TBD start time, a rerun after
+    midnight or a replay all give the same answer"""
+    if game_topic.game_date is not None:
+        return game_topic.game_date
+    if game_topic.game_start is not None:
+        return game_topic.game_start.astimezone(GAME_TIME_ZONE).date()
+    return datetime.now(GAME_TIME_ZONE).date()
+
+def post_slug(game_topic):
+    """Stable slug for a game's post, e.g. 'nyy-at-bos-mlb-betting-preview-2025-07-08'.
+
+    The same game always maps to the same slug, so a rerun finds and updates its
+    earlier post; the second game of a doubleheader gets a '-game-2' suffix.
+    """
+    slug = SLUG_UNSAFE.sub('-', f"{game_topic.away_team} at {game_topic.home_team} mlb betting preview".lower()).strip('-')
+    slug = f"{slug}-{game_date_for(game_topic).isoformat()}"
+    if game_topic.game_number > 1:
+        slug += f"-game-{game_topic.game_number}"
+    return slug
+
+class WebflowItemIndex:
+    """Our CMS items by collection and slug, so publishing is an upsert with no lookup calls.
+
+    A collection is listed page by page the first time it is used (or after a slug
+    conflict shows the index is behind); from then on every create or update is
+    recorded as it happens. The SQLite file is shared by every process and node that
+    publishes. The connection is opened on first use.
+    """
+
+    def __init__(self, path=WEBFLOW_ITEM_INDEX):
+        self.path = path
+        self._connection = None
+        self._sync_locks = {}
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def item_id(self, collection_id, slug):
+        row = self.connection.execute(
+            "SELECT item_id FROM webflow_items WHERE collection_id = ? AND slug = ?", (collection_id, slug)
+        ).fetchone()
+        return row[0] if row else None
+
+    def find(self, collection_id, matchup=None, game_date=None):
+        """[(slug, item_id)] for a matchup ('AWY @ HOM') and/or date, in slug order"""
+        query = "SELECT slug, item_id FROM webflow_items WHERE collection_id = ?"
+        params = [collection_id]
+        if matchup is not None:
+            query += " AND matchup = ?"
+            params.append(matchup.upper())
+        if game_date is not None:
+            query += " AND game_date = ?"
+            params.append(game_date.isoformat())
+        return self.connection.execute(query + " ORDER BY slug", params).fetchall()
+
+    def record(self, collection_id, slug, item_id, matchup=None, game_date=None):
+        """Remember (or move) the item behind a slug"""
+        if matchup is None and game_date is None:
+            matchup, game_date = _game_from_slug(slug)
+        with self.connection:
+            self.connection.execute(
+                """INSERT INTO webflow_items (collection_id, slug, item_id, matchup, game_date, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (collection_id, slug) DO UPDATE SET
+                       item_id = excluded.item_id, matchup = excluded.matchup,
+                       game_date = excluded.game_date, updated_at = excluded.updated_at""",
+                (collection_id, slug, item_id, matchup.upper() if matchup else None,
+                 game_date.isoformat() if game_date else None, datetime.now(timezone.utc).isoformat())
+            )
+
+    def forget(self, collection_id, slug):
+        """Drop an entry whose item was deleted in Webflow"""
+        with self.connection:
+            self.connection.execute("DELETE FROM webflow_items WHERE collection_id = ? AND slug = ?", (collection_id, slug))
+
+    def is_synced(self, collection_id):
+        return self.connection.execute(
+            "SELECT 1 FROM webflow_collections WHERE collection_id = ?", (collection_id,)
+        ).fetchone() is not None
+
+    async def sync(self, http, collection_id, headers, force=False):
+        """List the whole collection into the index (once, unless forced); returns the item count"""
+        # Concurrent posts to a new collection wait for one listing instead of each paging it
+        key = (id(asyncio.get_running_loop()), collection_id)
+        lock = self._sync_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if self.is_synced(collection_id) and not force:
+                return None
+            items = []
+            offset = 0
+            while True:
+                page = await http.get_json(
+                    f'https://api.webflow.com/v2/collections/{collection_id}/items',
+                    headers=headers,
+                    params={'limit': LIST_PAGE_SIZE, 'offset': offset},
+                    timeout=30
+                )
+                for item in page.get('items', []):
+                    slug = (item.get('fieldData') or {}).get('slug')
+                    if slug and item.get('id'):
+                        items.append((slug, item['id']))
+                offset += LIST_PAGE_SIZE
+                if offset >= page.get('pagination', {}).get('total', 0) or not page.get('items'):
+                    break
+            now = datetime.now(timezone.utc).isoformat()
+            with self.connection:
+                self.connection.execute("DELETE FROM webflow_items WHERE collection_id = ?", (collection_id,))
+                self.connection.executemany(
+                    """INSERT OR REPLACE INTO webflow_items (collection_id, slug, item_id, matchup, game_date, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    [(collection_id, slug, item_id, *_game_columns(slug), now) for slug, item_id in items]
+                )
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO webflow_collections (collection_id, synced_at) VALUES (?, ?)", (collection_id, now)
+                )
+            print(f"  🗂️ Indexed {len(items)} existing items in collection {collection_id}")
+            return len(items)
+
+def _game_from_slug(slug):
+    match = POST_SLUG.match(slug)
+    if match is None:
+        return None, None
+    return f"{match['away'].upper()} @ {match['home'].upper()}", date.fromisoformat(match['date'])
+
+def _game_columns(slug):
+    matchup, game_date = _game_from_slug(slug)
+    return matchup, game_date.isoformat() if game_date else None
+
+# Shared for the life of the process, like the publish coordinators' rate windows
+WEBFLOW_ITEMS = WebflowItemIndex()